@@ -0,0 +1,56 @@
+"""
+So sánh normalize_dataset (sao chép DataFrame ở mỗi bước) với
+normalize_dataset_planned (một lượt, một lần cấp phát kết quả):
+thời gian chạy và bộ nhớ đỉnh (tracemalloc).
+
+Chạy từ thư mục student_depression_fn:
+    python -m benchmarks.bench_normalize 100000 1000000
+"""
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from data_cleaning.data_cleaner import run_full_cleaning
+from data_normalization.data_normalizer import normalize_dataset
+from data_normalization.normalization_plan import normalize_dataset_planned
+
+DATA_PATH = "data/student_depression_dataset.csv"
+
+
+def make_cleaned_frame(n_rows, seed=0):
+    """Nhân bản dữ liệu mẫu đã làm sạch lên n_rows dòng"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        cleaned = run_full_cleaning(DATA_PATH)
+    return cleaned.sample(n=n_rows, replace=True, random_state=seed).reset_index(drop=True)
+
+
+def measure(func, df):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(df)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def run(sizes):
+    for n_rows in sizes:
+        df = make_cleaned_frame(n_rows)
+        base_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+        t_old, peak_old, expected = measure(normalize_dataset, df)
+        t_new, peak_new, result = measure(normalize_dataset_planned, df)
+        pd.testing.assert_frame_equal(result, expected)
+        print(f"{n_rows:>10,} dòng ({base_mb:7.1f} MB) | "
+              f"normalize_dataset: {t_old:6.2f}s, đỉnh {peak_old / 1024 ** 2:8.1f} MB | "
+              f"planned: {t_new:6.2f}s, đỉnh {peak_new / 1024 ** 2:8.1f} MB")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    run(sizes)
@@ -0,0 +1,46 @@
+"""
+So sánh tốc độ làm sạch Sleep Duration: Series.apply(extract_hours) và
+extract_hours_vectorized (parse từng giá trị phân biệt một lần).
+
+Chạy từ thư mục student_depression_fn:
+    python -m benchmarks.bench_sleep_duration 1000000 10000000
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning.data_cleaner import extract_hours, extract_hours_vectorized
+
+SLEEP_VALUES = ["'5-6 hours'", "'Less than 5 hours'", "'7-8 hours'",
+                "'More than 8 hours'", "Others", np.nan]
+
+
+def make_sleep_series(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    values = np.array(SLEEP_VALUES, dtype=object)
+    return pd.Series(values[rng.integers(0, len(values), n_rows)], name='Sleep Duration')
+
+
+def _time(func, series):
+    start = time.perf_counter()
+    result = func(series)
+    return time.perf_counter() - start, result
+
+
+def run(sizes):
+    for n_rows in sizes:
+        series = make_sleep_series(n_rows)
+        t_apply, expected = _time(lambda s: s.apply(extract_hours), series)
+        t_vec, result = _time(extract_hours_vectorized, series)
+        t_cat, result_cat = _time(extract_hours_vectorized, series.astype('category'))
+        pd.testing.assert_series_equal(result, expected)
+        pd.testing.assert_series_equal(result_cat, expected)
+        print(f"{n_rows:>12,} dòng | apply: {t_apply:8.3f}s | vectorized: {t_vec:8.3f}s "
+              f"(x{t_apply / t_vec:.0f}) | category: {t_cat:8.3f}s (x{t_apply / t_cat:.0f})")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000_000, 10_000_000]
+    run(sizes)
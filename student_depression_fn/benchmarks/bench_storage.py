@@ -0,0 +1,49 @@
+"""
+So sánh định dạng lưu của save_data: CSV, CSV nén gzip, Parquet và Feather.
+Đo kích thước file, thời gian ghi, thời gian đọc lại toàn bộ và đọc lại
+một vài cột (column projection).
+
+Chạy từ thư mục student_depression_fn:
+    python -m benchmarks.bench_storage 1000000
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_normalize import make_cleaned_frame
+from data_normalization.normalization_plan import normalize_dataset_planned
+from storage.save_data import save_data, load_data
+
+PROJECTED_COLUMNS = ['Gender', 'CGPA', 'Depression']
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def run(sizes):
+    for n_rows in sizes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = normalize_dataset_planned(make_cleaned_frame(n_rows))
+        print(f"{n_rows:,} dòng")
+        with tempfile.TemporaryDirectory() as tmp:
+            for ext in ('csv', 'csv.gz', 'parquet', 'feather'):
+                path = os.path.join(tmp, f"data.{ext}")
+                t_write, _ = _timed(save_data, df, path)
+                t_read, reloaded = _timed(load_data, path)
+                t_proj, _ = _timed(load_data, path, columns=PROJECTED_COLUMNS)
+                n_cat = sum(str(t) == 'category' for t in reloaded.dtypes)
+                print(f"  {ext:>8}: {os.path.getsize(path) / 1024 ** 2:8.1f} MB | ghi {t_write:6.2f}s | "
+                      f"đọc {t_read:6.2f}s | đọc {len(PROJECTED_COLUMNS)} cột {t_proj:6.2f}s | "
+                      f"{n_cat} cột category")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000_000]
+    run(sizes)
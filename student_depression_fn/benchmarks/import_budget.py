@@ -0,0 +1,93 @@
+"""
+Kiểm tra ngân sách thời gian import bằng `python -X importtime`.
+
+Với mỗi module, đo thời gian import tích lũy (trung vị của vài lần chạy,
+mỗi lần một tiến trình mới) và kiểm tra các thư viện nặng không bị nạp
+sớm. Trả về mã lỗi 1 nếu vượt ngân sách.
+
+Chạy từ thư mục student_depression_fn:
+    python -m benchmarks.import_budget
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+# Thư mục student_depression_fn: các tiến trình đo chạy từ đây để import được module
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Thư viện chỉ được nạp khi thực sự dùng tới (vẽ biểu đồ, backend lazy, ...).
+# pandas tự nạp pyarrow nếu có cài nên pyarrow chỉ bị cấm ở module không cần pandas
+LIGHT_FORBIDDEN = ["pandas", "numpy", "pyarrow", "polars", "seaborn", "matplotlib"]
+PANDAS_FORBIDDEN = ["polars", "seaborn", "matplotlib"]
+
+# module: (ngân sách ms, các module không được import)
+IMPORT_BUDGETS = {
+    "cli": (50, LIGHT_FORBIDDEN),
+    "main": (50, LIGHT_FORBIDDEN),
+    "storage.save_data": (50, LIGHT_FORBIDDEN),
+    "data_cleaning.data_cleaner": (1000, PANDAS_FORBIDDEN),
+    "data_normalization.data_normalizer": (1000, PANDAS_FORBIDDEN),
+    "data_visualization.visualization": (1000, PANDAS_FORBIDDEN),
+}
+DEFAULT_RUNS = 3
+
+
+#Hàm liệt kê các module bị nạp khi import một module (tiến trình mới)
+def loaded_modules(module):
+    completed = subprocess.run([sys.executable, "-c", f"import sys, {module}; print(*sys.modules, sep='\\n')"],
+                               capture_output=True, text=True, check=True, cwd=PROJECT_DIR)
+    return set(completed.stdout.split())
+
+
+#Hàm tìm các thư viện nặng bị nạp sớm (không phụ thuộc thời gian chạy)
+def heavy_imports(module, forbidden):
+    modules = loaded_modules(module)
+    return sorted(name for name in forbidden if name in modules)
+
+
+#Hàm đo thời gian import một module trong tiến trình mới
+def measure_import(module):
+    """
+    Returns:
+    --------
+    (thời gian import tích lũy của module tính bằng ms, tập các module đã được import)
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, check=True, cwd=PROJECT_DIR)
+    imported = set()
+    cumulative_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if not cumulative.strip().isdigit():
+            continue
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, imported
+
+
+def check_budgets(budgets=IMPORT_BUDGETS, runs=DEFAULT_RUNS, margin=1.0):
+    """margin: hệ số nới ngân sách thời gian (ví dụ trên máy CI dùng chung)"""
+    failures = []
+    print(f"{'module':<38}{'ms':>9}{'budget':>9}  heavy imports")
+    for module, (budget_ms, forbidden) in budgets.items():
+        samples = [measure_import(module) for _ in range(runs)]
+        elapsed = statistics.median(ms for ms, _ in samples)
+        loaded = sorted(name for name in forbidden if name in samples[0][1])
+        ok = elapsed <= budget_ms * margin and not loaded
+        print(f"{module:<38}{elapsed:>9.1f}{budget_ms:>9}  {', '.join(loaded) or '-'} {'✅' if ok else '❌'}")
+        if not ok:
+            failures.append(module)
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_budgets()
+    if failures:
+        print(f"\n❌ Vượt ngân sách import: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Mọi module nằm trong ngân sách import")
@@ -0,0 +1,219 @@
+"""
+Đo thời gian từng giai đoạn của pipeline trên dữ liệu giả lập và lưu kết
+quả để so sánh giữa các commit.
+
+Các giai đoạn:
+- run_full_cleaning: data_cleaning.data_cleaner.run_full_cleaning
+- cleaner_class: StudentDepressionDataCleaner.run_full_cleaning (report/src)
+- normalize_dataset
+- run_all_analysis (biểu đồ được ghi vào thư mục tạm)
+- save_data (CSV)
+
+Trên IN_MEMORY_MAX_ROWS dòng, run_full_cleaning chạy theo chunk và ghi
+thẳng ra file; các giai đoạn cần toàn bộ dữ liệu trong bộ nhớ được bỏ qua
+và ghi là null trong kết quả.
+
+Kết quả được ghi vào benchmarks/results/<commit>.json. Với --baseline,
+so sánh với một file kết quả cũ và trả về mã lỗi 1 nếu có giai đoạn chậm
+hơn ngưỡng --threshold.
+
+Chạy từ thư mục student_depression_fn:
+    python -m benchmarks.run_benchmarks 10000 100000 1000000
+    python -m benchmarks.run_benchmarks 100000 --baseline benchmarks/results/1019c22.json
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import generate_synthetic_csv
+from data_cleaning.data_cleaner import run_full_cleaning
+from data_normalization.data_normalizer import normalize_dataset
+from storage.save_data import save_data
+
+RESULTS_DIR = "benchmarks/results"
+# File giả lập được giữ lại giữa các lần chạy (sinh 10^8 dòng mất nhiều thời gian)
+SYNTHETIC_DIR = "benchmarks/data"
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+# Trên ngưỡng này dữ liệu không còn được giữ toàn bộ trong bộ nhớ
+IN_MEMORY_MAX_ROWS = 5_000_000
+# Giới hạn bộ nhớ mỗi chunk khi làm sạch dữ liệu lớn
+CHUNKED_MEMORY_LIMIT_MB = 512
+# Chậm hơn baseline quá tỷ lệ này được coi là hồi quy
+DEFAULT_REGRESSION_THRESHOLD = 1.2
+STAGES = ['run_full_cleaning', 'cleaner_class', 'normalize_dataset', 'run_all_analysis', 'save_data']
+CLEANER_CLASS_PATH = os.path.join("report", "src", "data_cleaning", "StudentDepressionDataCleaner.py")
+
+
+#Hàm nạp StudentDepressionDataCleaner từ report/src (không phải một package)
+def load_cleaner_class():
+    spec = importlib.util.spec_from_file_location("StudentDepressionDataCleaner", CLEANER_CLASS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.StudentDepressionDataCleaner
+
+
+def _git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, bool(dirty)
+
+
+def _environment():
+    import matplotlib
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def _timed(func, *args, repeat=1, **kwargs):
+    """Thời gian nhỏ nhất qua repeat lần chạy, kèm kết quả của lần chạy cuối"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+#Hàm lấy (hoặc sinh) file giả lập n_rows dòng
+def synthetic_path(n_rows, seed=0, data_dir=SYNTHETIC_DIR):
+    path = os.path.join(data_dir, f"synthetic_{n_rows}_{seed}.csv")
+    if not os.path.exists(path):
+        print(f"   - Sinh dữ liệu giả lập {n_rows:,} dòng → {path}")
+        generate_synthetic_csv(path, n_rows, seed=seed)
+    return path
+
+
+#Hàm đo các giai đoạn trên một kích thước dữ liệu
+def benchmark_size(n_rows, seed=0, repeat=1, data_dir=SYNTHETIC_DIR):
+    path = synthetic_path(n_rows, seed=seed, data_dir=data_dir)
+    timings = dict.fromkeys(STAGES)
+    with tempfile.TemporaryDirectory() as tmp:
+        if n_rows > IN_MEMORY_MAX_ROWS:
+            timings['run_full_cleaning'], _ = _timed(
+                run_full_cleaning, path, memory_limit_mb=CHUNKED_MEMORY_LIMIT_MB,
+                output_path=os.path.join(tmp, "cleaned.csv"), repeat=repeat)
+            return timings
+
+        timings['run_full_cleaning'], cleaned = _timed(run_full_cleaning, path, repeat=repeat)
+
+        cleaner_class = load_cleaner_class()
+        # Đọc như DepressionDataProcessor.load_data
+        raw = pd.read_csv(path)
+        timings['cleaner_class'], _ = _timed(lambda: cleaner_class(raw).run_full_cleaning(),
+                                             repeat=repeat)
+        del raw
+
+        timings['normalize_dataset'], normalized = _timed(normalize_dataset, cleaned, repeat=repeat)
+
+        # run_all_analysis ghi biểu đồ vào thư mục "chart" tương đối
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            timings['run_all_analysis'], _ = _timed(_run_all_analysis, normalized, repeat=repeat)
+        finally:
+            os.chdir(cwd)
+
+        timings['save_data'], _ = _timed(save_data, normalized, os.path.join(tmp, "out.csv"),
+                                         repeat=repeat)
+    return timings
+
+
+def _run_all_analysis(df):
+    from data_visualization.visualization import run_all_analysis
+    return run_all_analysis(df)
+
+
+#Hàm so sánh kết quả với baseline
+def compare_results(current, baseline, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    In bảng so sánh theo từng kích thước/giai đoạn và trả về danh sách
+    (kích thước, giai đoạn, tỷ lệ) của các giai đoạn chậm hơn threshold lần
+    """
+    regressions = []
+    print(f"\n===== SO SÁNH VỚI {baseline['commit']} =====")
+    print(f"{'rows':>12} {'stage':<20}{'baseline_s':>12}{'current_s':>12}{'ratio':>8}")
+    for size, timings in current['results'].items():
+        base_timings = baseline['results'].get(size, {})
+        for stage, seconds in timings.items():
+            base = base_timings.get(stage)
+            if seconds is None or base is None:
+                continue
+            ratio = seconds / base if base > 0 else float('inf')
+            flag = " ❌" if ratio > threshold else ""
+            print(f"{int(size):>12,} {stage:<20}{base:>12.3f}{seconds:>12.3f}{ratio:>8.2f}{flag}")
+            if ratio > threshold:
+                regressions.append((int(size), stage, ratio))
+    return regressions
+
+
+def run(sizes, seed=0, repeat=1, output_dir=RESULTS_DIR, data_dir=SYNTHETIC_DIR):
+    commit, dirty = _git_commit()
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'seed': seed,
+        'repeat': repeat,
+        'environment': _environment(),
+        'results': {},
+    }
+    print(f"{'rows':>12} " + "".join(f"{stage:>20}" for stage in STAGES))
+    for n_rows in sizes:
+        timings = benchmark_size(n_rows, seed=seed, repeat=repeat, data_dir=data_dir)
+        report['results'][str(n_rows)] = timings
+        print(f"{n_rows:>12,} " + "".join(
+            f"{'-' if timings[stage] is None else f'{timings[stage]:.3f}s':>20}" for stage in STAGES))
+
+    os.makedirs(output_dir, exist_ok=True)
+    name = f"{commit}-dirty" if dirty else commit
+    output_path = os.path.join(output_dir, f"{name}.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Đã lưu kết quả: {output_path}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark các giai đoạn của pipeline")
+    parser.add_argument('sizes', nargs='*', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--baseline', help="File kết quả cũ trong benchmarks/results để so sánh")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    report = run(args.sizes, seed=args.seed, repeat=args.repeat)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, threshold=args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} giai đoạn chậm hơn {args.threshold}x so với baseline")
+            sys.exit(1)
+        print("\n✅ Không có hồi quy")
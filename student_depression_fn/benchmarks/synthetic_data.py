@@ -0,0 +1,88 @@
+"""
+Sinh dữ liệu student-depression giả lập cùng schema với file mẫu, từ 10^4
+đến 10^8 dòng.
+
+Mỗi cột được lấy mẫu độc lập theo phân phối thực nghiệm của file mẫu nên
+giữ nguyên các giá trị "bẩn" của dữ liệu gốc ('5-6 hours' có dấu nháy,
+Financial Stress = '?', ...). Thêm vào đó một tỷ lệ giá trị thiếu (NaN) ở
+các cột có thể thiếu. File được ghi theo từng khối nên bộ nhớ không phụ
+thuộc số dòng.
+
+Chạy từ thư mục student_depression_fn:
+    python -m benchmarks.synthetic_data 1000000 data/synthetic_1m.csv
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_PATH = "data/student_depression_dataset.csv"
+# Số dòng sinh ra và ghi ra file mỗi lần
+GENERATE_CHUNK_ROWS = 1_000_000
+# Tỷ lệ giá trị thiếu mặc định ở các cột MISSING_COLUMNS
+DEFAULT_MISSING_RATE = 0.01
+# Các cột được chèn NaN (id, Age và Depression luôn có giá trị)
+MISSING_COLUMNS = ['Academic Pressure', 'Work Pressure', 'CGPA', 'Study Satisfaction',
+                   'Job Satisfaction', 'Sleep Duration', 'Dietary Habits',
+                   'Work/Study Hours', 'Financial Stress']
+
+
+#Hàm lấy phân phối thực nghiệm của từng cột trong file mẫu
+def load_value_distributions(sample_path=SAMPLE_PATH):
+    """Trả về {cột: (mảng giá trị, mảng xác suất)} theo thứ tự cột của file mẫu"""
+    # Đọc mọi cột dạng chuỗi để giữ nguyên cách ghi gốc ('5.0', "'5-6 hours'")
+    sample = pd.read_csv(sample_path, dtype=str, keep_default_na=False)
+    distributions = {}
+    for col in sample.columns:
+        if col == 'id':
+            continue
+        freq = sample[col].value_counts(normalize=True)
+        distributions[col] = (freq.index.to_numpy(dtype=object), freq.to_numpy())
+    return list(sample.columns), distributions
+
+
+#Hàm sinh một khối dữ liệu giả lập
+def make_synthetic_chunk(n_rows, columns, distributions, rng, start_id=0,
+                         missing_rate=DEFAULT_MISSING_RATE):
+    data = {}
+    for col in columns:
+        if col == 'id':
+            data[col] = np.arange(start_id, start_id + n_rows, dtype='int64')
+            continue
+        values, probs = distributions[col]
+        column = values[rng.choice(len(values), size=n_rows, p=probs)]
+        if missing_rate and col in MISSING_COLUMNS:
+            column[rng.random(n_rows) < missing_rate] = np.nan
+        data[col] = column
+    return pd.DataFrame(data, columns=columns)
+
+
+#Hàm sinh file CSV giả lập
+def generate_synthetic_csv(output_path, n_rows, seed=0, missing_rate=DEFAULT_MISSING_RATE,
+                           sample_path=SAMPLE_PATH, chunk_rows=GENERATE_CHUNK_ROWS):
+    """
+    Ghi n_rows dòng giả lập ra output_path theo từng khối chunk_rows dòng.
+    Cùng seed và n_rows luôn cho cùng một file.
+    """
+    columns, distributions = load_value_distributions(sample_path)
+    rng = np.random.default_rng(seed)
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        for start in range(0, n_rows, chunk_rows):
+            chunk = make_synthetic_chunk(min(chunk_rows, n_rows - start), columns, distributions,
+                                         rng, start_id=start, missing_rate=missing_rate)
+            chunk.to_csv(f, index=False, header=(start == 0))
+    return output_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Cách dùng: python -m benchmarks.synthetic_data <số dòng> <file đầu ra> [seed]")
+        sys.exit(1)
+    n_rows = int(sys.argv[1])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    path = generate_synthetic_csv(sys.argv[2], n_rows, seed=seed)
+    print(f"✅ Đã sinh {n_rows:,} dòng → {path}")
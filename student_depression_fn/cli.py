@@ -0,0 +1,108 @@
+"""
+Dòng lệnh cho từng giai đoạn của pipeline. Mỗi lệnh con chỉ import module
+của giai đoạn nó chạy: `clean` không nạp seaborn/matplotlib, `save` không
+nạp các bước làm sạch.
+
+Chạy từ thư mục student_depression_fn:
+    python cli.py clean data/student_depression_dataset.csv -o data/cleaned.parquet
+    python cli.py normalize data/cleaned.parquet -o data/normalized.parquet
+    python cli.py analyze data/normalized.parquet --jobs 4 --cache
+    python cli.py save data/normalized.parquet -o data/normalized.csv
+    python cli.py save data/normalized.parquet -o data/normalized.csv.gz
+    python cli.py run --profile profile/run.json
+    python cli.py --log-level WARNING clean -o data/cleaned.parquet
+"""
+import argparse
+import sys
+
+DEFAULT_INPUT = "data/student_depression_dataset.csv"
+
+
+#Lệnh clean: làm sạch file gốc và lưu kết quả
+def cmd_clean(args):
+    from data_cleaning.data_cleaner import run_full_cleaning
+    if args.memory_limit_mb is not None and args.output.lower().endswith(".csv"):
+        # Chế độ chunk ghi thẳng từng chunk ra file, không gộp trong bộ nhớ
+        run_full_cleaning(args.input, memory_limit_mb=args.memory_limit_mb, output_path=args.output)
+        return
+    from storage.save_data import save_data
+    cleaned = run_full_cleaning(args.input, memory_limit_mb=args.memory_limit_mb)
+    save_data(cleaned, args.output)
+
+
+#Lệnh normalize: chuẩn hóa dữ liệu đã làm sạch
+def cmd_normalize(args):
+    from data_normalization.data_normalizer import normalize_dataset
+    from storage.save_data import load_data, save_data
+    save_data(normalize_dataset(load_data(args.input)), args.output)
+
+
+#Lệnh analyze: in báo cáo thống kê và vẽ biểu đồ
+def cmd_analyze(args):
+    from data_visualization.visualization import run_all_analysis
+    from storage.save_data import load_data
+    run_all_analysis(load_data(args.input), n_jobs=args.jobs, use_cache=args.cache)
+
+
+#Lệnh save: đọc và ghi lại dữ liệu sang định dạng khác (theo đuôi file)
+def cmd_save(args):
+    from storage.save_data import load_data, save_data
+    save_data(load_data(args.input), args.output)
+
+
+#Lệnh run: toàn bộ pipeline như main.py
+def cmd_run(args):
+    from main import main
+    main(incremental=args.incremental, profile_path=args.profile, lazy=args.lazy,
+         log_level=args.log_level, overwrite=args.overwrite)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Pipeline dữ liệu trầm cảm sinh viên")
+    parser.add_argument("--log-level", default="INFO",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="DEBUG in thêm các bảng chẩn đoán, WARNING bỏ qua log tiến trình")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    clean = commands.add_parser("clean", help="Làm sạch file CSV gốc")
+    clean.add_argument("input", nargs="?", default=DEFAULT_INPUT)
+    clean.add_argument("-o", "--output", required=True, help="File kết quả (.csv, .parquet, .feather)")
+    clean.add_argument("--memory-limit-mb", type=int, default=None,
+                       help="Làm sạch theo chunk với giới hạn bộ nhớ này")
+    clean.set_defaults(func=cmd_clean)
+
+    normalize = commands.add_parser("normalize", help="Chuẩn hóa dữ liệu đã làm sạch")
+    normalize.add_argument("input")
+    normalize.add_argument("-o", "--output", required=True)
+    normalize.set_defaults(func=cmd_normalize)
+
+    analyze = commands.add_parser("analyze", help="Thống kê và vẽ biểu đồ")
+    analyze.add_argument("input")
+    analyze.add_argument("--jobs", type=int, default=1, help="Số tiến trình vẽ biểu đồ")
+    analyze.add_argument("--cache", action="store_true", help="Bỏ qua biểu đồ có dữ liệu không đổi")
+    analyze.set_defaults(func=cmd_analyze)
+
+    save = commands.add_parser("save", help="Chuyển đổi định dạng lưu trữ")
+    save.add_argument("input")
+    save.add_argument("-o", "--output", required=True)
+    save.set_defaults(func=cmd_save)
+
+    run = commands.add_parser("run", help="Chạy toàn bộ pipeline (như main.py)")
+    run.add_argument("--incremental", action="store_true")
+    run.add_argument("--overwrite", action="store_true",
+                     help="Ghi đè file đầu ra của --incremental khi chưa có trạng thái")
+    run.add_argument("--lazy", action="store_true", help="Dùng backend lazy (polars)")
+    run.add_argument("--profile", default=None, help="Ghi profile từng bước ra file JSON")
+    run.set_defaults(func=cmd_run)
+    return parser
+
+
+def cli(argv=None):
+    args = build_parser().parse_args(argv)
+    from profiling.logger import configure_logging
+    configure_logging(args.log_level)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    cli(sys.argv[1:])
@@ -0,0 +1,248 @@
+import pandas as pd
+import numpy as np
+
+from data_loading.data_loader import DataLoader
+from profiling.logger import get_logger
+from data_cleaning.data_cleaner import (
+    filter_age_18_25,
+    clean_apostrophe,
+    convert_depression_to_int,
+    convert_to_categorical,
+    clean_sleep_duration,
+    clean_financial_stress,
+    impute_missing_values,
+)
+
+# Giới hạn bộ nhớ mặc định cho mỗi chunk (MB)
+DEFAULT_MEMORY_LIMIT_MB = 256
+# Mỗi chunk bị sao chép vài lần trong quá trình làm sạch (lọc, astype, ...)
+MEMORY_SAFETY_FACTOR = 4
+MIN_CHUNKSIZE = 1000
+
+logger = get_logger(__name__)
+
+
+#Hàm ước lượng số dòng mỗi chunk từ giới hạn bộ nhớ
+def estimate_chunksize(file_path, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, sample_rows=1000):
+    """
+    Đọc thử vài dòng đầu để ước lượng số byte/dòng sau khi parse,
+    từ đó suy ra số dòng tối đa của một chunk
+    """
+    with DataLoader().load_csv(file_path, chunksize=sample_rows) as reader:
+        sample = next(iter(reader), pd.DataFrame())
+    if len(sample) == 0:
+        return MIN_CHUNKSIZE
+    bytes_per_row = sample.memory_usage(deep=True).sum() / len(sample)
+    budget = memory_limit_mb * 1024 * 1024 / MEMORY_SAFETY_FACTOR
+    return max(MIN_CHUNKSIZE, int(budget / bytes_per_row))
+
+
+#Bộ tích lũy median theo chunk
+class StreamingMedian:
+    """
+    Tích lũy tần suất từng giá trị qua các chunk để tính median toàn cục.
+
+    Chính xác tuyệt đối khi số giá trị phân biệt <= max_bins (trường hợp của
+    Sleep Duration). Khi vượt quá, các giá trị kề nhau được gộp lại thành một
+    bin (giá trị trung bình có trọng số) nên median trở thành xấp xỉ.
+    """
+
+    def __init__(self, max_bins=10000):
+        self.max_bins = max_bins
+        self.counts = pd.Series(dtype='float64')
+
+    def update(self, values):
+        values = pd.Series(values).dropna()
+        if len(values) == 0:
+            return self
+        return self.update_counts(values.value_counts())
+
+    def update_counts(self, counts):
+        """Cộng thêm một bảng tần suất {giá trị: số lần} (ví dụ của StreamingMedian khác)"""
+        self.counts = self.counts.add(counts, fill_value=0)
+        while len(self.counts) > self.max_bins:
+            self._compress()
+        return self
+
+    def _compress(self):
+        counts = self.counts.sort_index()
+        values = counts.index.to_numpy(dtype='float64')
+        weights = counts.to_numpy()
+        groups = np.arange(len(values)) // 2
+        merged_weights = np.bincount(groups, weights=weights)
+        merged_values = np.bincount(groups, weights=values * weights) / merged_weights
+        self.counts = pd.Series(merged_weights, index=merged_values)
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def median(self):
+        n = self.count
+        if n == 0:
+            return np.nan
+        counts = self.counts.sort_index()
+        cumulative = counts.cumsum().to_numpy()
+        values = counts.index.to_numpy(dtype='float64')
+        lower = values[np.searchsorted(cumulative, (n - 1) // 2 + 1)]
+        upper = values[np.searchsorted(cumulative, n // 2 + 1)]
+        return (lower + upper) / 2
+
+    def quantile(self, q):
+        """Phân vị q (nội suy tuyến tính như Series.quantile)"""
+        n = self.count
+        if n == 0:
+            return np.nan
+        counts = self.counts.sort_index()
+        cumulative = counts.cumsum().to_numpy()
+        values = counts.index.to_numpy(dtype='float64')
+        position = (n - 1) * q
+        lower_rank = int(np.floor(position))
+        upper_rank = int(np.ceil(position))
+        lower = values[np.searchsorted(cumulative, lower_rank + 1)]
+        upper = values[np.searchsorted(cumulative, upper_rank + 1)]
+        return lower + (upper - lower) * (position - lower_rank)
+
+
+#Hàm gộp (số lượng, mean, M2) của hai nhóm giá trị (công thức song song của Chan)
+def merge_moments(a, b):
+    """
+    M2 là tổng bình phương độ lệch so với mean của nhóm; gộp theo cách này
+    tránh phép trừ sum(x²)/n - mean² vốn mất độ chính xác và có thể âm.
+    Các thành phần có thể là số hoặc mảng numpy (gộp theo từng phần tử);
+    nhóm rỗng (n = 0) không làm thay đổi nhóm còn lại.
+    """
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    # n = 0 chỉ khi cả hai nhóm rỗng: khi đó n_b = 0 nên chia cho 1 không đổi kết quả
+    n_safe = np.maximum(n, 1)
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n_safe
+    m2 = m2_a + m2_b + delta * delta * n_a * n_b / n_safe
+    return n, mean, m2
+
+
+#Hàm đọc file CSV theo từng chunk
+def iter_csv_chunks(file_path, chunksize, usecols=None):
+    """
+    Đọc file CSV theo từng khối chunksize dòng.
+    Kiểu dữ liệu được DataLoader khai báo trước nên mọi chunk có cùng kiểu
+    (nếu để pandas tự suy luận, một chunk không có giá trị '?' sẽ đọc
+    Financial Stress thành float)
+    """
+    return DataLoader().load_csv(file_path, chunksize=chunksize, usecols=usecols)
+
+
+#Lượt 1: tính các thống kê toàn cục cần cho bước thay thế giá trị thiếu
+def compute_global_medians(file_path, chunksize, age_column='Age'):
+    """Tính median của Sleep Duration trên toàn bộ dữ liệu đã lọc tuổi"""
+    accumulator = StreamingMedian()
+    missing = 0
+    for chunk in iter_csv_chunks(file_path, chunksize, usecols=[age_column, 'Sleep Duration']):
+        chunk = filter_age_18_25(chunk, age_column=age_column, verbose=False)
+        chunk = clean_sleep_duration(chunk)
+        missing += int(chunk['Sleep Duration'].isnull().sum())
+        accumulator.update(chunk['Sleep Duration'])
+    return {'Sleep Duration': accumulator.median()}, {'Sleep Duration': missing}
+
+
+#Hàm làm sạch một chunk với thống kê toàn cục đã biết
+def clean_chunk(chunk, medians, age_column='Age', keep_empty=False):
+    """
+    Các bước của run_full_cleaning trên một chunk, bỏ qua các bước chỉ để
+    hiển thị (check_unique_values, check_missing_values, verify_cleaning).
+    Trả về None nếu không còn dòng nào sau khi lọc tuổi (keep_empty=True:
+    trả về DataFrame rỗng có đủ cột và kiểu dữ liệu sau làm sạch).
+    """
+    chunk = filter_age_18_25(chunk, age_column=age_column, verbose=False)
+    if len(chunk) == 0 and not keep_empty:
+        return None
+    chunk = clean_apostrophe(chunk)
+    chunk = convert_depression_to_int(chunk)
+    chunk = convert_to_categorical(chunk)
+    chunk = clean_sleep_duration(chunk)
+    chunk = clean_financial_stress(chunk)
+    chunk = impute_missing_values(chunk, medians=medians)
+    return chunk
+
+
+#Hàm tạo kết quả làm sạch rỗng (cùng cột, cùng kiểu) khi không có dòng nào
+def empty_cleaned_frame(file_path, medians, age_column='Age'):
+    """Chỉ đọc dòng tiêu đề và một chunk nhỏ đầu file"""
+    with DataLoader().load_csv(file_path, chunksize=MIN_CHUNKSIZE) as reader:
+        sample = next(iter(reader))
+    return clean_chunk(sample.iloc[:0], medians, age_column=age_column, keep_empty=True)
+
+
+#Lượt 2: làm sạch từng chunk
+def iter_cleaned_chunks(file_path, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, medians=None,
+                        age_column='Age', chunksize=None):
+    """
+    Sinh ra lần lượt các chunk đã làm sạch (xem clean_chunk).
+    medians, chunksize: truyền vào khi đã tính sẵn để không phải đọc lại file
+    """
+    if chunksize is None:
+        chunksize = estimate_chunksize(file_path, memory_limit_mb)
+    if medians is None:
+        medians, _ = compute_global_medians(file_path, chunksize, age_column=age_column)
+    for chunk in iter_csv_chunks(file_path, chunksize):
+        chunk = clean_chunk(chunk, medians, age_column=age_column)
+        if chunk is not None:
+            yield chunk
+
+
+#Hàm chạy toàn bộ quy trình làm sạch theo chunk
+def run_chunked_cleaning(file_path, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, output_path=None,
+                         age_column='Age'):
+    """
+    Làm sạch file CSV lớn hơn bộ nhớ.
+
+    Parameters:
+    -----------
+    file_path : str
+        Đường dẫn file CSV gốc
+    memory_limit_mb : int
+        Giới hạn bộ nhớ (MB) cho mỗi chunk
+    output_path : str, optional
+        Nếu có, ghi từng chunk ra file CSV và trả về số dòng đã ghi.
+        Nếu không, gộp các chunk thành một DataFrame (chỉ nên dùng khi
+        kết quả sau lọc vừa với bộ nhớ)
+    """
+    logger.info("Bắt đầu quy trình làm sạch dữ liệu theo chunk (giới hạn %s MB)...", memory_limit_mb)
+    chunksize = estimate_chunksize(file_path, memory_limit_mb)
+    logger.info("   - Số dòng mỗi chunk: %d", chunksize)
+
+    medians, missing = compute_global_medians(file_path, chunksize, age_column=age_column)
+    logger.info("   - Median toàn cục Sleep Duration: %s", medians['Sleep Duration'])
+    logger.info("   - Giá trị thiếu Sleep Duration: %d", missing['Sleep Duration'])
+
+    chunks = iter_cleaned_chunks(file_path, medians=medians, age_column=age_column,
+                                 chunksize=chunksize)
+
+    if output_path is None:
+        chunks = list(chunks)
+        if not chunks:
+            # Không có dòng nào (file rỗng hoặc không ai trong độ tuổi 18-25)
+            chunks = [empty_cleaned_frame(file_path, medians, age_column=age_column)]
+        df = pd.concat(chunks, ignore_index=False)
+        # Các chunk có tập category khác nhau nên concat trả về cột chuỗi,
+        # chuyển lại về category trên toàn bộ dữ liệu
+        if chunks:
+            cat_cols = chunks[0].select_dtypes(include=['category']).columns
+            df[cat_cols] = df[cat_cols].astype('category')
+        logger.info("\n✅ Hoàn thành quy trình làm sạch! (%d bản ghi)", len(df))
+        return df
+
+    total_rows = 0
+    n_chunks = 0
+    with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=(n_chunks == 0))
+            total_rows += len(chunk)
+            n_chunks += 1
+        if n_chunks == 0:
+            # Vẫn ghi dòng tiêu đề để file đầu ra đọc lại được
+            empty_cleaned_frame(file_path, medians, age_column=age_column).to_csv(f, index=False)
+    logger.info("\n✅ Hoàn thành quy trình làm sạch! (%d bản ghi → %s)", total_rows, output_path)
+    return total_rows
@@ -0,0 +1,239 @@
+"""
+Pipeline làm sạch khai báo: danh sách StepSpec được biên dịch thành một
+kế hoạch thực thi (CompiledPipeline).
+
+Khi biên dịch:
+- Các bước chẩn đoán (chỉ để hiển thị) bị bỏ, trừ khi logger bật DEBUG
+- Các bước theo cột liên tiếp được gom theo từng cột: mỗi cột chạy cả chuỗi
+  biến đổi của nó một lần, không dựng lại DataFrame sau mỗi bước
+- Các bước lọc dòng và bước trên cả bảng là ranh giới giữa các giai đoạn
+- Bước theo cột chọn cột bằng hàm trên dtypes luôn mở một giai đoạn mới và
+  được chọn cột khi chạy, trên kiểu dữ liệu sau mọi bước phía trước (một
+  bước trước đó có thể đã astype), nên kết quả giống chạy lần lượt từng bước
+
+Khi chạy, chuỗi biến đổi của các cột trong một giai đoạn được chạy song song
+trên thread pool và DataFrame kết quả chỉ được tạo một lần mỗi giai đoạn.
+
+Ví dụ tùy biến:
+    steps = DEFAULT_CLEANING_STEPS + [
+        StepSpec('clip_cgpa', 'column', lambda s: s.clip(0, 10), columns=['CGPA']),
+    ]
+    pipeline = compile_pipeline(steps, df.dtypes)
+    print(pipeline.explain())
+    cleaned = pipeline.run(df, n_jobs=4)
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from data_cleaning.data_cleaner import (
+    CATEGORICAL_COLUMNS,
+    IMPUTE_COLUMNS,
+    age_18_25_mask,
+    check_missing_values,
+    check_unique_values,
+    depression_to_int,
+    extract_hours_vectorized,
+    fill_median,
+    strip_apostrophe_categorical,
+    text_columns,
+    to_categorical,
+    verify_cleaning,
+)
+from profiling.logger import get_logger
+from profiling.stage_profiler import profile_stage
+
+STEP_KINDS = ('rows', 'column', 'frame', 'diagnostic')
+
+logger = get_logger(__name__)
+
+
+class StepSpec:
+    """
+    Khai báo một bước làm sạch.
+
+    kind:
+    - 'rows': func(df) trả về mảng bool các dòng được giữ lại
+    - 'column': func(Series) trả về Series mới, áp dụng cho từng cột trong columns
+    - 'frame': func(df) trả về DataFrame mới (dùng cho bước cần nhiều cột)
+    - 'diagnostic': func(df) chỉ để hiển thị, kết quả bị bỏ qua
+    columns: danh sách tên cột, hoặc hàm nhận dtypes của bảng (tại thời điểm
+    bước được chạy) và trả về danh sách tên cột (chỉ dùng với kind='column')
+    """
+
+    def __init__(self, name, kind, func, columns=None):
+        if kind not in STEP_KINDS:
+            raise ValueError(f"❌ kind không hợp lệ: {kind} (chọn một trong {STEP_KINDS})")
+        if kind == 'column' and columns is None:
+            raise ValueError(f"❌ Bước theo cột '{name}' cần khai báo columns")
+        self.name = name
+        self.kind = kind
+        self.func = func
+        self.columns = columns
+
+    @property
+    def selects_by_dtype(self):
+        return callable(self.columns)
+
+    def resolve_columns(self, dtypes):
+        columns = self.columns(dtypes) if callable(self.columns) else list(self.columns)
+        missing = [col for col in columns if col not in dtypes.index]
+        if missing:
+            raise KeyError(f"❌ Bước '{self.name}' dùng cột không tồn tại: {missing}")
+        return columns
+
+    def __repr__(self):
+        return f"StepSpec({self.name!r}, kind={self.kind!r})"
+
+
+# Các bước tương đương run_full_cleaning, theo đúng thứ tự; dùng chung các
+# hàm theo dòng/cột với các bước trong data_cleaner
+DEFAULT_CLEANING_STEPS = [
+    StepSpec('filter_age_18_25', 'rows', age_18_25_mask),
+    StepSpec('clean_apostrophe', 'column', strip_apostrophe_categorical, columns=text_columns),
+    StepSpec('convert_depression_to_int', 'column', depression_to_int, columns=['Depression']),
+    StepSpec('convert_to_categorical', 'column', to_categorical, columns=CATEGORICAL_COLUMNS),
+    StepSpec('check_unique_values', 'diagnostic', check_unique_values),
+    StepSpec('clean_sleep_duration', 'column', extract_hours_vectorized, columns=['Sleep Duration']),
+    StepSpec('clean_financial_stress', 'column', to_categorical, columns=['Financial Stress']),
+    StepSpec('check_missing_values', 'diagnostic', check_missing_values),
+    StepSpec('impute_missing_values', 'column', fill_median, columns=IMPUTE_COLUMNS),
+    StepSpec('verify_cleaning', 'diagnostic', verify_cleaning),
+]
+
+
+class ColumnStage:
+    """
+    Một giai đoạn gồm chuỗi biến đổi đã gộp cho từng cột: {cột: [(tên bước, hàm), ...]}
+
+    selector: bước đầu giai đoạn chọn cột theo dtypes, được chọn cột khi
+    chạy (trên df đầu vào của giai đoạn) và chạy trước các bước đã gộp
+    """
+
+    def __init__(self, selector=None):
+        self.selector = selector
+        self.chains = {}
+
+    def add(self, step, columns):
+        for col in columns:
+            self.chains.setdefault(col, []).append((step.name, step.func))
+
+    def _resolve_chains(self, dtypes):
+        if self.selector is None:
+            return self.chains
+        chains = {col: [(self.selector.name, self.selector.func)]
+                  for col in self.selector.resolve_columns(dtypes)}
+        for col, chain in self.chains.items():
+            chains[col] = chains.get(col, []) + chain
+        return chains
+
+    @staticmethod
+    def _run_chain(chain, col, s):
+        for _, func in chain:
+            s = func(s)
+        return col, s
+
+    def run(self, df, n_jobs=1):
+        chains = self._resolve_chains(df.dtypes)
+        columns = {col: df[col] for col in df.columns}
+        if n_jobs > 1 and len(chains) > 1:
+            with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                results = list(pool.map(lambda col: self._run_chain(chains[col], col, columns[col]), chains))
+        else:
+            results = [self._run_chain(chain, col, columns[col]) for col, chain in chains.items()]
+        columns.update(results)
+        # Cột không đổi được dùng chung với df (Copy-on-Write)
+        return pd.DataFrame(columns, index=df.index, copy=False)
+
+    def describe(self):
+        lines = []
+        if self.selector is not None:
+            lines.append(f"  (chọn cột theo kiểu dữ liệu khi chạy): {self.selector.name}")
+        lines += [f"  {col}: {' → '.join(name for name, _ in chain)}" for col, chain in self.chains.items()]
+        return lines
+
+
+class CompiledPipeline:
+    """Kế hoạch đã biên dịch: danh sách giai đoạn ('rows'/'frame'/'diagnostic' StepSpec hoặc ColumnStage)"""
+
+    def __init__(self, stages, dropped):
+        self.stages = stages
+        self.dropped = dropped
+
+    @profile_stage("cleaning")
+    def run(self, df, n_jobs=1):
+        """n_jobs: số luồng chạy chuỗi biến đổi của các cột trong mỗi giai đoạn"""
+        for stage in self.stages:
+            if isinstance(stage, ColumnStage):
+                df = stage.run(df, n_jobs=n_jobs)
+            elif stage.kind == 'rows':
+                df = df[stage.func(df)]
+            elif stage.kind == 'frame':
+                df = stage.func(df)
+            else:
+                stage.func(df)
+        return df
+
+    def explain(self):
+        """Mô tả kế hoạch dạng chữ, ví dụ để kiểm tra các bước đã được gộp"""
+        lines = []
+        for i, stage in enumerate(self.stages, 1):
+            if isinstance(stage, ColumnStage):
+                n_columns = f"{len(stage.chains)} cột" + (" + cột chọn khi chạy" if stage.selector else "")
+                lines.append(f"{i}. column ({n_columns})")
+                lines += stage.describe()
+            else:
+                lines.append(f"{i}. {stage.kind}: {stage.name}")
+        if self.dropped:
+            lines.append(f"Bỏ qua (chẩn đoán): {', '.join(self.dropped)}")
+        return "\n".join(lines)
+
+
+#Hàm biên dịch danh sách StepSpec thành kế hoạch thực thi
+def compile_pipeline(steps, dtypes, keep_diagnostics=None):
+    """
+    dtypes : Series kiểu dữ liệu của bảng đầu vào (df.dtypes), dùng để kiểm
+        tra tên cột của các bước khai báo danh sách cột
+    keep_diagnostics : bool, optional
+        Giữ các bước 'diagnostic' (mặc định: chỉ khi logger bật DEBUG)
+    """
+    if keep_diagnostics is None:
+        keep_diagnostics = logger.isEnabledFor(logging.DEBUG)
+    stages = []
+    dropped = []
+    current = None
+    for step in steps:
+        if step.kind == 'column':
+            if step.selects_by_dtype:
+                # Kiểu dữ liệu có thể đã bị các bước trước đổi: chọn cột khi chạy
+                current = ColumnStage(selector=step)
+                stages.append(current)
+                continue
+            if current is None:
+                current = ColumnStage()
+                stages.append(current)
+            current.add(step, step.resolve_columns(dtypes))
+            continue
+        if step.kind == 'diagnostic' and not keep_diagnostics:
+            dropped.append(step.name)
+            continue
+        # Ranh giới giai đoạn: các bước theo cột phía sau không gộp với phía trước
+        stages.append(step)
+        current = None
+    return CompiledPipeline(stages, dropped)
+
+
+#Hàm làm sạch file CSV bằng pipeline khai báo
+def run_cleaning_pipeline(file_path, steps=None, n_jobs=1):
+    """Như run_full_cleaning, với danh sách bước tùy biến (mặc định DEFAULT_CLEANING_STEPS)"""
+    from data_loading.data_loader import DataLoader
+
+    logger.info("Bắt đầu quy trình làm sạch dữ liệu (pipeline biên dịch)...")
+    df = DataLoader().load_csv(file_path)
+    pipeline = compile_pipeline(DEFAULT_CLEANING_STEPS if steps is None else steps, df.dtypes)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s", pipeline.explain())
+    df = pipeline.run(df, n_jobs=n_jobs)
+    logger.info("\n✅ Hoàn thành quy trình làm sạch! (%d bản ghi)", len(df))
+    return df
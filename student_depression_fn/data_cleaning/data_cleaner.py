@@ -1,117 +1,250 @@
-import pandas as pd
-import re
-import numpy as np
-
-#Hàm lọc độ tuổi từ 18-25 sinh viên:
-def filter_age_18_25(df, age_column='Age'):
-    original_count = len(df)
-    df = df[(df[age_column] >= 18) & (df[age_column] <= 25)].copy()
-    filtered_count = len(df)
-    removed_count = original_count - filtered_count
-    print(f"✅ Đã lọc độ tuổi (18-25):")
-    print(f"   - Số bản ghi gốc: {original_count}")
-    print(f"   - Số bản ghi sau lọc: {filtered_count}")
-    print(f"   - Đã loại bỏ: {removed_count} bản ghi")
-    print(f"   - Tỷ lệ giữ lại: {(filtered_count/original_count)*100:.1f}%")
-    return df
-
-#Hàm xóa các ô dữ liệu chứa dấu ' '
-def clean_apostrophe(df):
-    """
-    Xử lý các ô dữ liệu chứa dấu nháy đơn (')
-    - Thay thế bằng ký tự an toàn hoặc xóa
-    - Đặc biệt quan trọng với cột 'Degree' và các cột text khác
-    Parameters:
-    -----------
-    data : pandas DataFrame
-        DataFrame cần làm sạch
-    
-    Returns:
-    --------
-    DataFrame đã được xử lý dấu '
-    """
-    for col in df.select_dtypes(include=['object']).columns:
-        if df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.replace("'", "", regex=False)
-    return df
-
-#Hàm chuyển đổi Depression sang integer
-def convert_depression_to_int(df):
-    """Chuyển cột Depression sang kiểu integer"""
-    df['Depression'] = df['Depression'].astype(int)
-    return df
-
-#Hàm chuyển các cột sang categorical
-def convert_to_categorical(df):
-    """Chuyển các cột phân loại sang category"""
-    cat_cols = ['Gender', 'City', 'Profession', 'Degree',
-                'Have you ever had suicidal thoughts ?', 
-                'Family History of Mental Illness']
-    for col in cat_cols:
-        df[col] = df[col].astype('category')
-    return df
-
-#Hàm kiểm tra giá trị duy nhất
-def check_unique_values(df):
-    """Hiển thị giá trị duy nhất trong các cột quan trọng"""
-    print("Unique values in 'Sleep Duration':", df['Sleep Duration'].unique())
-    print("Unique values in 'Financial Stress':", df['Financial Stress'].unique())
-    return df
-
-#Hàm trích xuất giờ từ Sleep Duration
-def extract_hours(s):
-    """Trích xuất số giờ từ chuỗi"""
-    match = re.search(r"(\d+(\.\d+)?)", str(s))
-    return float(match.group(1)) if match else np.nan
-
-def clean_sleep_duration(df):
-    """Làm sạch cột Sleep Duration"""
-    df['Sleep Duration'] = df['Sleep Duration'].apply(extract_hours)
-    return df
-
-#Hàm làm sạch Financial Stress
-def clean_financial_stress(df):
-    """Chuyển Financial Stress sang category"""
-    df['Financial Stress'] = df['Financial Stress'].astype('category')
-    return df
-
-#Hàm kiểm tra giá trị thiếu
-def check_missing_values(df):
-    """Hiển thị số lượng giá trị thiếu"""
-    missing = df.isnull().sum()
-    print("Missing values:\n", missing[missing > 0])
-    return df
-
-#Hàm thay thế giá trị thiếu
-def impute_missing_values(df):
-    """Thay thế giá trị thiếu bằng median"""
-    for col in ['Sleep Duration']:
-        if df[col].isnull().sum() > 0:
-            df[col] = df[col].fillna(df[col].median())
-    return df
-
-#Hàm kiểm tra kết quả
-def verify_cleaning(df):
-    """Kiểm tra kết quả sau khi làm sạch"""
-    print(df[['Sleep Duration', 'Financial Stress']].head())
-    return df
-
-#Hàm chạy toàn bộ quy trình làm sạch
-def run_full_cleaning(file_path):
-    """Chạy tất cả các bước làm sạch"""
-    print("Bắt đầu quy trình làm sạch dữ liệu...")
-    df = pd.read_csv(file_path) 
-    df = filter_age_18_25(df, age_column='Age')
-    df = clean_apostrophe(df)
-    df = convert_depression_to_int(df)
-    df = convert_to_categorical(df)
-    df = check_unique_values(df)
-    df = clean_sleep_duration(df)
-    df = clean_financial_stress(df)
-    df = check_missing_values(df)
-    df = impute_missing_values(df)
-    df = verify_cleaning(df)
-    
-    print("\n✅ Hoàn thành quy trình làm sạch!")
-    return df
-
+import logging
+import pandas as pd
+import re
+import numpy as np
+from functools import lru_cache
+from data_loading.data_loader import DataLoader
+from profiling.logger import get_logger
+from profiling.stage_profiler import profile_stage
+
+logger = get_logger(__name__)
+
+CATEGORICAL_COLUMNS = ['Gender', 'City', 'Profession', 'Degree',
+                       'Have you ever had suicidal thoughts ?',
+                       'Family History of Mental Illness']
+# Các cột được điền giá trị thiếu bằng median
+IMPUTE_COLUMNS = ['Sleep Duration']
+
+# Các hàm theo dòng/cột dưới đây là phần xử lý dùng chung của các bước làm
+# sạch trên cả bảng và của DEFAULT_CLEANING_STEPS (cleaning_pipeline)
+
+#Hàm tạo mặt nạ các dòng có tuổi từ 18-25
+def age_18_25_mask(df, age_column='Age'):
+    return ((df[age_column] >= 18) & (df[age_column] <= 25)).to_numpy()
+
+#Hàm chuyển một cột Depression sang int8 (chỉ có 0/1)
+def depression_to_int(series):
+    return series.astype('int8')
+
+#Hàm chuyển một cột sang category
+def to_categorical(series):
+    return series.astype('category')
+
+#Hàm điền giá trị thiếu của một cột bằng median
+def fill_median(series, median=None):
+    """median: median đã tính trước (None: median của chính cột)"""
+    if series.isnull().sum() > 0:
+        return series.fillna(series.median() if median is None else median)
+    return series
+
+#Hàm lọc độ tuổi từ 18-25 sinh viên:
+@profile_stage("cleaning")
+def filter_age_18_25(df, age_column='Age', verbose=True):
+    original_count = len(df)
+    df = df[age_18_25_mask(df, age_column)].copy()
+    filtered_count = len(df)
+    if not verbose or not logger.isEnabledFor(logging.INFO):
+        return df
+    removed_count = original_count - filtered_count
+    logger.info("✅ Đã lọc độ tuổi (18-25):")
+    logger.info("   - Số bản ghi gốc: %d", original_count)
+    logger.info("   - Số bản ghi sau lọc: %d", filtered_count)
+    logger.info("   - Đã loại bỏ: %d bản ghi", removed_count)
+    logger.info("   - Tỷ lệ giữ lại: %.1f%%", (filtered_count/original_count)*100)
+    return df
+
+#Hàm xóa dấu ' trên từng giá trị phân biệt của một cột
+def strip_apostrophe_categorical(series):
+    """
+    Xóa dấu ' trên các giá trị phân biệt (categories hoặc kết quả factorize)
+    rồi ánh xạ lại theo mã, chi phí O(số giá trị phân biệt) thay vì O(số dòng).
+    Các giá trị sau khi xóa bị trùng (ví dụ "'BSc'" và "BSc") được gộp lại.
+    Giá trị thiếu được giữ nguyên là NaN.
+
+    Returns:
+    --------
+    Series kiểu category
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+        # Bỏ các category không còn dòng nào (ví dụ các dòng đã bị lọc theo tuổi)
+        used = np.bincount(codes[codes >= 0], minlength=len(uniques)) > 0
+    else:
+        codes, uniques = pd.factorize(series)
+        used = np.ones(len(uniques), dtype=bool)
+    cleaned = pd.Index(uniques[used].astype(str)).str.replace("'", "", regex=False)
+    # sort=True: categories được sắp xếp như khi dùng astype('category')
+    merged_codes, categories = pd.factorize(cleaned, sort=True)
+    # Bảng tra mã cũ → mã mới, phần tử cuối cho mã -1 (giá trị thiếu)
+    lookup = np.full(len(uniques) + 1, -1, dtype=merged_codes.dtype)
+    lookup[:-1][used] = merged_codes
+    result = pd.Categorical.from_codes(lookup[codes], categories=categories)
+    return pd.Series(result, index=series.index, name=series.name)
+
+def _is_text_column(dtype):
+    return (isinstance(dtype, pd.CategoricalDtype) or dtype == 'object'
+            or pd.api.types.is_string_dtype(dtype))
+
+#Hàm chọn các cột dạng chuỗi/category theo dtypes
+def text_columns(dtypes):
+    return [col for col, dtype in dtypes.items() if _is_text_column(dtype)]
+
+#Hàm xóa các ô dữ liệu chứa dấu ' '
+@profile_stage("cleaning")
+def clean_apostrophe(df):
+    """
+    Xử lý các ô dữ liệu chứa dấu nháy đơn (')
+    - Thay thế bằng ký tự an toàn hoặc xóa
+    - Đặc biệt quan trọng với cột 'Degree' và các cột text khác
+    - Xử lý theo giá trị phân biệt, kết quả là cột category,
+      giá trị thiếu vẫn là NaN (không bị đổi thành chuỗi "nan")
+    Parameters:
+    -----------
+    data : pandas DataFrame
+        DataFrame cần làm sạch
+    
+    Returns:
+    --------
+    DataFrame đã được xử lý dấu '
+    """
+    for col in text_columns(df.dtypes):
+        df[col] = strip_apostrophe_categorical(df[col])
+    return df
+
+#Hàm chuyển đổi Depression sang integer
+@profile_stage("cleaning")
+def convert_depression_to_int(df):
+    """Chuyển cột Depression sang kiểu integer (int8: chỉ có 0/1)"""
+    df['Depression'] = depression_to_int(df['Depression'])
+    return df
+
+#Hàm chuyển các cột sang categorical
+@profile_stage("cleaning")
+def convert_to_categorical(df):
+    """Chuyển các cột phân loại sang category"""
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = to_categorical(df[col])
+    return df
+
+#Hàm kiểm tra giá trị duy nhất
+@profile_stage("cleaning")
+def check_unique_values(df):
+    """Hiển thị giá trị duy nhất trong các cột quan trọng (chỉ tính ở mức DEBUG)"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Unique values in 'Sleep Duration': %s", df['Sleep Duration'].unique())
+        logger.debug("Unique values in 'Financial Stress': %s", df['Financial Stress'].unique())
+    return df
+
+#Hàm trích xuất giờ từ Sleep Duration
+def extract_hours(s):
+    """Trích xuất số giờ từ chuỗi"""
+    match = re.search(r"(\d+(\.\d+)?)", str(s))
+    return float(match.group(1)) if match else np.nan
+
+@lru_cache(maxsize=4096)
+def _extract_hours_cached(s):
+    return extract_hours(s)
+
+#Hàm trích xuất giờ dạng vector hóa
+def extract_hours_vectorized(series):
+    """
+    Trích xuất số giờ cho cả cột: mỗi giá trị phân biệt chỉ chạy regex một
+    lần (có cache), kết quả được ánh xạ lại cho từng dòng theo mã category.
+    Kết quả giống hệt series.apply(extract_hours).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    # Mã -1 (giá trị thiếu) trỏ vào phần tử cuối cùng: extract_hours(NaN) = NaN
+    parsed = np.empty(len(uniques) + 1, dtype='float64')
+    for i, value in enumerate(uniques):
+        parsed[i] = _extract_hours_cached(value)
+    parsed[-1] = np.nan
+    return pd.Series(parsed[codes], index=series.index, name=series.name)
+
+@profile_stage("cleaning")
+def clean_sleep_duration(df):
+    """Làm sạch cột Sleep Duration"""
+    df['Sleep Duration'] = extract_hours_vectorized(df['Sleep Duration'])
+    return df
+
+#Hàm làm sạch Financial Stress
+@profile_stage("cleaning")
+def clean_financial_stress(df):
+    """Chuyển Financial Stress sang category"""
+    df['Financial Stress'] = to_categorical(df['Financial Stress'])
+    return df
+
+#Hàm kiểm tra giá trị thiếu
+@profile_stage("cleaning")
+def check_missing_values(df):
+    """Hiển thị số lượng giá trị thiếu (chỉ tính ở mức DEBUG)"""
+    if logger.isEnabledFor(logging.DEBUG):
+        missing = df.isnull().sum()
+        logger.debug("Missing values:\n %s", missing[missing > 0])
+    return df
+
+#Hàm thay thế giá trị thiếu
+@profile_stage("cleaning")
+def impute_missing_values(df, medians=None):
+    """Thay thế giá trị thiếu bằng median
+
+    medians : dict, optional
+        Median đã tính trước cho từng cột (dùng khi làm sạch theo chunk,
+        median phải lấy trên toàn bộ dữ liệu chứ không phải từng chunk)
+    """
+    for col in IMPUTE_COLUMNS:
+        df[col] = fill_median(df[col], (medians or {}).get(col))
+    return df
+
+#Hàm kiểm tra kết quả
+@profile_stage("cleaning")
+def verify_cleaning(df):
+    """Kiểm tra kết quả sau khi làm sạch (chỉ tính ở mức DEBUG)"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s", df[['Sleep Duration', 'Financial Stress']].head())
+    return df
+
+#Hàm chạy toàn bộ quy trình làm sạch
+def run_full_cleaning(file_path, memory_limit_mb=None, output_path=None, steps=None, n_jobs=1):
+    """Chạy tất cả các bước làm sạch
+
+    memory_limit_mb : int, optional
+        Nếu được truyền, đọc và làm sạch file theo từng chunk với giới hạn
+        bộ nhớ này (xem data_cleaning.chunked_cleaner)
+    output_path : str, optional
+        Chỉ dùng với chế độ chunk: ghi từng chunk đã làm sạch ra file CSV
+        thay vì gộp lại trong bộ nhớ
+    steps : list StepSpec, optional
+        Chạy bằng pipeline biên dịch với các bước này thay cho chuỗi bước cố
+        định (xem data_cleaning.cleaning_pipeline, DEFAULT_CLEANING_STEPS)
+    n_jobs : int
+        Số luồng chạy các bước theo cột của pipeline biên dịch
+    """
+    if steps is not None:
+        from data_cleaning.cleaning_pipeline import run_cleaning_pipeline
+        return run_cleaning_pipeline(file_path, steps=steps, n_jobs=n_jobs)
+    if memory_limit_mb is not None:
+        from data_cleaning.chunked_cleaner import run_chunked_cleaning
+        return run_chunked_cleaning(file_path, memory_limit_mb=memory_limit_mb,
+                                    output_path=output_path)
+
+    logger.info("Bắt đầu quy trình làm sạch dữ liệu...")
+    df = DataLoader().load_csv(file_path)
+    df = filter_age_18_25(df, age_column='Age')
+    df = clean_apostrophe(df)
+    df = convert_depression_to_int(df)
+    df = convert_to_categorical(df)
+    df = check_unique_values(df)
+    df = clean_sleep_duration(df)
+    df = clean_financial_stress(df)
+    df = check_missing_values(df)
+    df = impute_missing_values(df)
+    df = verify_cleaning(df)
+    
+    logger.info("\n✅ Hoàn thành quy trình làm sạch!")
+    return df
+
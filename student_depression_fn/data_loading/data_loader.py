@@ -0,0 +1,163 @@
+import pandas as pd
+import numpy as np
+import json
+import csv
+import codecs
+from pathlib import Path
+
+from data_loading.schema import STUDENT_DEPRESSION_SCHEMA
+from profiling.logger import get_logger
+from profiling.stage_profiler import profile_stage
+
+# Kiểu dữ liệu khai báo trước cho bộ dữ liệu trầm cảm sinh viên, để pandas
+# không phải suy luận (và không đọc nhầm cột số thành object)
+STUDENT_DEPRESSION_DTYPES = STUDENT_DEPRESSION_SCHEMA
+REQUIRED_COLUMNS = ['Age', 'Sleep Duration', 'Financial Stress', 'Depression']
+
+logger = get_logger(__name__)
+
+# Số byte đầu file dùng để đoán encoding
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class DataLoader:
+    """
+    Lớp đọc dữ liệu dùng chung cho toàn bộ dự án
+
+    - CSV dùng engine pyarrow (đa luồng) nếu có, ngược lại dùng engine C
+    - Chỉ đọc các cột cần thiết (usecols) và khai báo trước kiểu dữ liệu
+    - Encoding được đoán từ một đoạn đầu file, không đọc toàn bộ file
+    """
+
+    def __init__(self, dtype=None, usecols=None):
+        self.data = None
+        self.dtype = STUDENT_DEPRESSION_DTYPES if dtype is None else dtype
+        self.usecols = usecols
+
+    def _read_header(self, filepath, encoding):
+        with open(filepath, newline='', encoding=encoding) as f:
+            return next(csv.reader(f), [])
+
+    def _resolve_dtype(self, columns, dtype):
+        dtype = self.dtype if dtype is None else dtype
+        return {col: t for col, t in dtype.items() if col in columns}
+
+    @profile_stage("loading")
+    def load_csv(self, filepath, encoding=None, usecols=None, dtype=None, chunksize=None):
+        """
+        Đọc file CSV với nhiều tùy chọn encoding
+
+        Parameters:
+        -----------
+        filepath : str
+            Đường dẫn file CSV
+        encoding : str, optional
+            Nếu không truyền, encoding được đoán bằng detect_encoding
+        usecols : list, optional
+            Chỉ đọc các cột này
+        dtype : dict, optional
+            Kiểu dữ liệu theo cột (mặc định STUDENT_DEPRESSION_DTYPES)
+        chunksize : int, optional
+            Trả về iterator các chunk thay vì một DataFrame
+
+        Returns:
+        --------
+        DataFrame (hoặc iterator các DataFrame nếu có chunksize)
+        """
+        if encoding is None:
+            encoding = self.detect_encoding(filepath)
+        usecols = self.usecols if usecols is None else usecols
+        columns = usecols if usecols is not None else self._read_header(filepath, encoding)
+        kwargs = {
+            'encoding': encoding,
+            'usecols': usecols,
+            'dtype': self._resolve_dtype(columns, dtype),
+        }
+
+        if chunksize is not None:
+            # engine pyarrow không hỗ trợ đọc theo chunk
+            return pd.read_csv(filepath, chunksize=chunksize, **kwargs)
+
+        engine = 'pyarrow' if _has_pyarrow() else 'c'
+        self.data = pd.read_csv(filepath, engine=engine, **kwargs)
+        return self.data
+
+    def load_excel(self, filepath, sheet_name=None, usecols=None, dtype=None):
+        """Đọc file Excel (mặc định sheet đầu tiên)"""
+        sheet_name = 0 if sheet_name is None else sheet_name
+        usecols = self.usecols if usecols is None else usecols
+        header = pd.read_excel(filepath, sheet_name=sheet_name, nrows=0).columns
+        columns = usecols if usecols is not None else header
+        self.data = pd.read_excel(filepath, sheet_name=sheet_name, usecols=usecols,
+                                  dtype=self._resolve_dtype(columns, dtype))
+        return self.data
+
+    def load_json(self, filepath, usecols=None, dtype=None):
+        """Đọc file JSON (records) hoặc JSON Lines (.jsonl)"""
+        lines = Path(filepath).suffix.lower() in ('.jsonl', '.ndjson')
+        df = pd.read_json(filepath, lines=lines, encoding=self.detect_encoding(filepath))
+        usecols = self.usecols if usecols is None else usecols
+        if usecols is not None:
+            df = df[usecols]
+        self.data = df.astype(self._resolve_dtype(df.columns, dtype))
+        return self.data
+
+    def detect_encoding(self, filepath, sample_bytes=ENCODING_SAMPLE_BYTES):
+        """
+        Phát hiện encoding tự động từ sample_bytes byte đầu file:
+        BOM → UTF-8 → chardet (nếu được cài) → latin-1
+        """
+        with open(filepath, 'rb') as f:
+            sample = f.read(sample_bytes)
+
+        for bom, encoding in _BOMS:
+            if sample.startswith(bom):
+                return encoding
+
+        try:
+            # final=False: bỏ qua ký tự nhiều byte bị cắt ở cuối đoạn mẫu
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+
+        try:
+            import chardet
+            guess = chardet.detect(sample)
+            if guess.get('encoding'):
+                return guess['encoding']
+        except ImportError:
+            pass
+        return 'latin-1'
+
+    def validate_data_structure(self, df, required_columns=REQUIRED_COLUMNS):
+        """Kiểm tra cấu trúc dữ liệu"""
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        report = {
+            'valid': len(df) > 0 and not missing_columns,
+            'n_rows': len(df),
+            'n_columns': df.shape[1],
+            'missing_columns': missing_columns,
+            'duplicate_ids': int(df['id'].duplicated().sum()) if 'id' in df.columns else 0,
+        }
+        if report['valid']:
+            logger.info("✅ Dữ liệu hợp lệ: %d dòng, %d cột", report['n_rows'], report['n_columns'])
+        else:
+            logger.warning("❌ Dữ liệu không hợp lệ: %d dòng, thiếu cột %s", len(df), missing_columns)
+        return report
@@ -0,0 +1,82 @@
+import pandas as pd
+
+from profiling.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Schema của bộ dữ liệu trầm cảm sinh viên: mỗi cột dùng kiểu hẹp nhất.
+# - Điểm số / giờ: float32 (dữ liệu gốc ghi dạng "5.0" và có thể thiếu)
+# - Chuỗi ít giá trị phân biệt: category
+# - Depression: bool
+STUDENT_DEPRESSION_SCHEMA = {
+    'id': 'int32',
+    'Gender': 'category',
+    'Age': 'float32',
+    'City': 'category',
+    'Profession': 'category',
+    'Academic Pressure': 'float32',
+    'Work Pressure': 'float32',
+    'CGPA': 'float32',
+    'Study Satisfaction': 'float32',
+    'Job Satisfaction': 'float32',
+    'Sleep Duration': 'category',
+    'Dietary Habits': 'category',
+    'Degree': 'category',
+    'Have you ever had suicidal thoughts ?': 'category',
+    'Work/Study Hours': 'float32',
+    'Financial Stress': 'category',
+    'Family History of Mental Illness': 'category',
+    'Depression': 'bool',
+}
+
+
+#Hàm ép DataFrame theo schema
+def enforce_schema(df, schema=STUDENT_DEPRESSION_SCHEMA):
+    """Ép kiểu các cột có trong schema, bỏ qua cột đã đúng kiểu"""
+    casts = {col: dtype for col, dtype in schema.items()
+             if col in df.columns and str(df[col].dtype) != dtype}
+    if not casts:
+        return df
+    return df.astype(casts)
+
+
+#Hàm tính số byte mỗi dòng theo từng cột
+def bytes_per_row(df):
+    if len(df) == 0:
+        return pd.Series(0.0, index=df.columns)
+    return df.memory_usage(deep=True, index=False) / len(df)
+
+
+#Hàm báo cáo bộ nhớ trước/sau khi áp dụng schema
+def memory_report(before, after):
+    """
+    So sánh số byte mỗi dòng giữa hai DataFrame (ví dụ đọc không có schema
+    và đọc có schema)
+
+    Returns:
+    --------
+    DataFrame gồm các cột before, after (byte/dòng) và kiểu dữ liệu
+    """
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'before': bytes_per_row(before),
+        'dtype_after': after.dtypes.astype(str),
+        'after': bytes_per_row(after),
+    })
+    total_before = report['before'].sum()
+    total_after = report['after'].sum()
+    logger.info("%s", report.round(2).to_string())
+    logger.info("\nTổng: %.1f → %.1f byte/dòng (giảm %.1f%%)",
+                total_before, total_after, (1 - total_after / total_before) * 100)
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    from data_loading.data_loader import DataLoader
+    from profiling.logger import configure_logging
+
+    configure_logging()
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/student_depression_dataset.csv"
+    memory_report(DataLoader(dtype={}).load_csv(path), DataLoader().load_csv(path))
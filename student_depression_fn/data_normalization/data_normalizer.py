@@ -1,5 +1,48 @@
+import logging
+
 import pandas as pd
 
+from data_normalization.encoders import (  # noqa: F401 (các bảng mã được dùng lại từ module này)
+    DIET_MAP,
+    PRESSURE_MAP,
+    SLEEP_MAP,
+    STRESS_MAP,
+    YESNO_MAP,
+    collect_unseen,
+    get_encoder,
+    report_unseen,
+)
+from profiling.logger import get_logger
+from profiling.stage_profiler import profile_stage
+
+logger = get_logger(__name__)
+
+# Các hàm mã hóa theo cột: nhận một Series, trả về Series mới.
+# Dùng chung cho các hàm encode_* bên dưới và cho normalization_plan.
+# Mỗi hàm dùng một bộ mã hóa dạng bảng tra trong encoders; trong khối
+# collect_unseen(), giá trị không có trong bảng mã được đếm cho riêng khối đó.
+
+def map_pressure_level(s):
+    """Mã hóa Academic Pressure Low/Medium/High, giá trị không hợp lệ = 2 (Medium)"""
+    return get_encoder('pressure_level').encode(s)
+
+def map_financial_stress(s):
+    """Mã hóa Financial Stress Yes/No, giá trị không hợp lệ = 0"""
+    return get_encoder('financial_stress').encode(s)
+
+def map_yesno(s):
+    """Mã hóa Yes/No (không phân biệt hoa thường), thiếu hoặc không hợp lệ = 0"""
+    return get_encoder('yesno').encode(s)
+
+def map_sleep_hours(s, fill_value=None):
+    """Trả về (cột Sleep Duration đã strip, cột sleep_hours)"""
+    return get_encoder('sleep_hours').encode(s, fill_value=fill_value, return_keys=True)
+
+def map_diet_score(s):
+    """Mã hóa Dietary Habits thành điểm 1-3"""
+    return get_encoder('diet_score').encode(s)
+
+@profile_stage("normalization", label_arg="col")
 def normalize_minmax(df, col):
     """Chuẩn hóa cột về [0, 1]"""
     df = df.copy()
@@ -9,6 +52,7 @@ def normalize_minmax(df, col):
         df[f'{col}_norm'] = (df[col] - min_val) / (max_val - min_val)
     return df
 
+@profile_stage("normalization", label_arg="col")
 def standardize_zscore(df, col):
     """Chuẩn hóa cột về mean=0, std=1"""
     df = df.copy()
@@ -18,104 +62,91 @@ def standardize_zscore(df, col):
         df[f'{col}_std'] = (df[col] - mean_val) / std_val
     return df
 
+@profile_stage("normalization", label_arg="col")
 def encode_yesno_to_binary(df, col):
     """Chuyển Yes/No thành 1/0"""
     df = df.copy()
-    df[col] = df[col].map({'Yes': 1, 'No': 0})
+    df[col] = df[col].map(YESNO_MAP)
     return df
 
+@profile_stage("normalization", label_arg="col")
 def encode_sleep_hours(df, col='Sleep Duration'):
     """Chuyển giờ ngủ thành số"""
     df = df.copy()
     
-    df[col] = df[col].astype(str).str.strip()
-    
-    sleep_map = {
-        'Less than 5 hours': 4,
-        '5-6 hours': 5.5,
-        '7-8 hours': 7.5,
-        'More than 8 hours': 9,
-        'Nan': 7.5,  # Giá trị mặc định
-        'None': 7.5
-    }
-    
-    # Áp dụng mapping
-    df['sleep_hours'] = df[col].map(sleep_map)
-    
-    # Điền các giá trị thiếu bằng trung bình
-    if df['sleep_hours'].isnull().any():
-        avg_sleep = df['sleep_hours'].mean()
-        df['sleep_hours'] = df['sleep_hours'].fillna(avg_sleep)
-        print(f"     Đã điền {df['sleep_hours'].isnull().sum()} giá trị bằng trung bình: {avg_sleep:.2f}")
+    # Các giá trị thiếu được điền bằng trung bình
+    df[col], df['sleep_hours'] = map_sleep_hours(df[col])
         
     return df
 
+@profile_stage("normalization", label_arg="col")
 def encode_diet_score(df, col='Dietary Habits'):
     """Chuyển thói quen ăn uống thành điểm"""
     df = df.copy()
-    diet_map = {'Unhealthy': 1, 'Moderate': 2, 'Healthy': 3}
-    df['diet_score'] = df[col].map(diet_map)
+    df['diet_score'] = map_diet_score(df[col])
     return df
 
+@profile_stage("normalization", label_arg="col")
 def encode_pressure_level(df, col='Academic Pressure'):
     """Chuyển mức áp lực thành số"""
     df = df.copy()
-    pressure_map = {'Low': 1, 'Medium': 2, 'High': 3}
-    df[col] = df[col].astype(str).str.strip().map(pressure_map)
-    
-    # Điền các giá trị không hợp lệ bằng trung bình
-    if df[col].isnull().any():
-        df[col] = df[col].fillna(2)  # Mặc định Medium = 2
-    
+    # Các giá trị không hợp lệ được điền Medium = 2
+    df[col] = map_pressure_level(df[col])
     return df
 
+@profile_stage("normalization", label_arg="col")
 def encode_financial_stress(df, col='Financial Stress'):
     """Chuyển áp lực tài chính Yes/No thành 0/1"""
     df = df.copy()
-    stress_map = {'No': 0, 'Yes': 1}
-    df[col] = df[col].astype(str).str.strip().map(stress_map)
-    
-    # Điền các giá trị không hợp lệ bằng 0
-    if df[col].isnull().any():
-        df[col] = df[col].fillna(0)
-    
+    # Các giá trị không hợp lệ được điền 0
+    df[col] = map_financial_stress(df[col])
     return df
 
 def normalize_dataset(df):
     """Chuẩn hóa toàn bộ dataset với các bước cần thiết"""
+    # Chỉ đếm giá trị không có trong bảng mã của riêng lần chuẩn hóa này
+    with collect_unseen() as unseen:
+        df = _normalize_dataset(df)
+    # Cảnh báo các giá trị không có trong bảng mã (đã được điền mặc định)
+    report_unseen(unseen)
+    return df
+
+def _normalize_dataset(df):
     df = df.copy()
     
-    print(f"Bắt đầu chuẩn hóa dữ liệu...")
-    print(f"   Shape ban đầu: {df.shape}")
+    logger.info("Bắt đầu chuẩn hóa dữ liệu...")
+    logger.info("   Shape ban đầu: %s", df.shape)
     
-    # Kiểm tra missing values
-    missing_counts = df.isnull().sum()
-    if missing_counts.sum() > 0:
-        print(f"⚠️  Có missing values:")
-        for col, count in missing_counts[missing_counts > 0].items():
-            print(f"   - {col}: {count} missing")
+    # Kiểm tra missing values (quét toàn bộ bảng nên chỉ chạy ở mức DEBUG)
+    if logger.isEnabledFor(logging.DEBUG):
+        missing_counts = df.isnull().sum()
+        if missing_counts.sum() > 0:
+            logger.debug("⚠️  Có missing values:")
+            for col, count in missing_counts[missing_counts > 0].items():
+                logger.debug("   - %s: %d missing", col, count)
     
     # 0. Mã hóa cột Academic Pressure từ text thành số
     if 'Academic Pressure' in df.columns:
-        print(f"   Mã hóa cột: Academic Pressure")
+        logger.info("   Mã hóa cột: Academic Pressure")
         df = encode_pressure_level(df, 'Academic Pressure')
     
     # 0. Mã hóa cột Financial Stress từ Yes/No thành số
     if 'Financial Stress' in df.columns:
-        print(f"   Mã hóa cột: Financial Stress")
+        logger.info("   Mã hóa cột: Financial Stress")
         df = encode_financial_stress(df, 'Financial Stress')
     
     # 1. Chuẩn hóa cột số
     numeric_cols = ['CGPA', 'Academic Pressure', 'Work/Study Hours', 'Financial Stress']
     for col in numeric_cols:
         if col in df.columns:
-            print(f"   Chuẩn hóa cột: {col}")
+            logger.info("   Chuẩn hóa cột: %s", col)
             
             # Xử lý missing values trước khi chuẩn hóa
             if df[col].isnull().any():
                 median_val = df[col].median()
                 df[col] = df[col].fillna(median_val)
-                print(f"     Đã điền {df[col].isnull().sum()} missing values bằng median: {median_val:.2f}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("     Đã điền %d missing values bằng median: %.2f", df[col].isnull().sum(), median_val)
             
             df = standardize_zscore(df, col)
     
@@ -123,37 +154,27 @@ def normalize_dataset(df):
     yesno_cols = ['Have you ever had suicidal thoughts ?', 'Family History of Mental Illness']
     for col in yesno_cols:
         if col in df.columns:
-            print(f"   Mã hóa cột: {col}")
-            
-            # Chuyển về string, strip whitespace, xử lý missing
-            df[col] = df[col].astype(str).str.strip().str.title()
-            df[col] = df[col].replace({'Nan': 'No', 'None': 'No'})
+            logger.info("   Mã hóa cột: %s", col)
             
-            # Map giá trị
-            mapping = {'Yes': 1, 'No': 0}
-            df[col] = df[col].map(mapping)
-            
-            # Điền các giá trị không phải Yes/No bằng 0
-            if df[col].isnull().any():
-                df[col] = df[col].fillna(0)
-                print(f"     Đã điền {df[col].isnull().sum()} giá trị không hợp lệ bằng 0")
+            # Thiếu hoặc không phải Yes/No được điền 0
+            df[col] = map_yesno(df[col])
     
     # 3. Mã hóa cột phân loại đặc biệt
     if 'Sleep Duration' in df.columns:
-        print(f"   Mã hóa cột: Sleep Duration")
+        logger.info("   Mã hóa cột: Sleep Duration")
         df = encode_sleep_hours(df)
     
     if 'Dietary Habits' in df.columns:
-        print(f"   Mã hóa cột: Dietary Habits")
+        logger.info("   Mã hóa cột: Dietary Habits")
         df = encode_diet_score(df)
     
-    print(f"✅ Chuẩn hóa dữ liệu hoàn tất")
-    print(f"   Shape cuối cùng: {df.shape}")
+    logger.info("✅ Chuẩn hóa dữ liệu hoàn tất")
+    logger.info("   Shape cuối cùng: %s", df.shape)
     
     # Hiển thị các cột mới được tạo
     new_cols = [col for col in df.columns if '_std' in col or '_norm' in col 
                 or col in ['sleep_hours', 'diet_score']]
     if new_cols:
-        print(f"   Các cột mới tạo: {new_cols}")
+        logger.info("   Các cột mới tạo: %s", new_cols)
     
     return df
\ No newline at end of file
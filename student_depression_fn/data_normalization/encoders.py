@@ -0,0 +1,219 @@
+"""
+Bộ mã hóa cột phân loại dạng bảng tra.
+
+Mỗi bộ mã hóa gồm một bước chuẩn bị khóa (strip, title, ...), một bảng mã
+{khóa: giá trị} và cách điền giá trị không có trong bảng mã. Khi mã hóa một
+cột, các bước này chỉ chạy trên một dòng đại diện cho mỗi giá trị phân biệt
+(mã category hoặc kết quả factorize) để dựng mảng tra numpy theo mã; kết quả
+của cả cột là một phép np.take trên mảng tra đó, thay vì astype(str)
+.str.strip().map() trên từng dòng.
+
+Các giá trị không có trong bảng mã vẫn được điền như trước. Trong khối
+collect_unseen(), chúng được đếm theo từng khóa cho riêng khối đó và báo
+cáo qua report_unseen(); ngoài khối with không có gì được cộng dồn.
+
+Ví dụ:
+    with collect_unseen() as unseen:
+        encoded = get_encoder('pressure_level').encode(df['Academic Pressure'])
+    report_unseen(unseen)   # ⚠️  pressure_level: 13957 dòng không có trong bảng mã ...
+"""
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from profiling.logger import get_logger
+
+logger = get_logger(__name__)
+
+SLEEP_MAP = {
+    'Less than 5 hours': 4,
+    '5-6 hours': 5.5,
+    '7-8 hours': 7.5,
+    'More than 8 hours': 9,
+    'Nan': 7.5,  # Giá trị mặc định
+    'None': 7.5
+}
+DIET_MAP = {'Unhealthy': 1, 'Moderate': 2, 'Healthy': 3}
+PRESSURE_MAP = {'Low': 1, 'Medium': 2, 'High': 3}
+STRESS_MAP = {'No': 0, 'Yes': 1}
+YESNO_MAP = {'Yes': 1, 'No': 0}
+
+# Bộ đếm của khối collect_unseen() đang hoạt động; None nghĩa là không đếm
+_active_unseen = None
+
+
+#Hàm lấy mã và một dòng đại diện cho mỗi giá trị phân biệt
+def _codes_and_representatives(s):
+    """
+    Returns:
+    --------
+    (codes, representatives): codes[i] là mã của dòng i (-1 là giá trị thiếu),
+    representatives là Series cùng kiểu với s, phần tử j là một dòng có mã j,
+    phần tử cuối là một dòng thiếu (nên take(-1) trỏ vào nó)
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes = s.cat.codes.to_numpy()
+        n_codes = len(s.cat.categories)
+    else:
+        codes, uniques = pd.factorize(s)
+        n_codes = len(uniques)
+    if len(codes) == 0:
+        return codes, s.reset_index(drop=True)
+    # Vị trí xuất hiện đầu tiên của mỗi mã: gán theo thứ tự ngược để lần gán
+    # cuối cùng (dòng đầu tiên) được giữ lại
+    first = np.zeros(n_codes + 1, dtype=np.intp)
+    positions = np.arange(len(codes), dtype=np.intp)
+    first[codes[::-1]] = positions[::-1]
+    # Mã không có dòng nào (category không dùng, không có giá trị thiếu) trỏ
+    # vào dòng 0: phần tử đó không bao giờ được take tới
+    return codes, s.iloc[first].reset_index(drop=True)
+
+
+class Encoder:
+    """
+    prepare : hàm nhận Series và trả về Series khóa (None: dùng nguyên giá trị)
+    mapping : dict {khóa: giá trị}
+    fill_value : giá trị điền cho khóa không có trong mapping (None: giữ NaN)
+    fill_mean : điền bằng trung bình của cột sau khi mã hóa (như encode_sleep_hours)
+    """
+
+    def __init__(self, name, mapping, prepare=None, fill_value=None, fill_mean=False):
+        self.name = name
+        self.mapping = mapping
+        self.prepare = prepare
+        self.fill_value = fill_value
+        self.fill_mean = fill_mean
+
+    def keys(self, s):
+        return s if self.prepare is None else self.prepare(s)
+
+    def _lookup(self, keys):
+        """
+        Mảng tra theo mã (ndarray) và mặt nạ các khóa không có trong mapping.
+        Kiểu int64 khi mọi khóa đều map được giá trị nguyên (như Series.map),
+        ngược lại float64 với NaN cho khóa không có trong mapping
+        """
+        mapped = keys.map(self.mapping)
+        # Series.map trên cột category trả về category khi mọi giá trị đều map được
+        if isinstance(mapped.dtype, pd.CategoricalDtype):
+            mapped = mapped.astype(mapped.cat.categories.dtype)
+        missing = mapped.isna().to_numpy()
+        if mapped.dtype.kind in 'iu':
+            return mapped.to_numpy(), missing
+        # copy=True: mảng tra được điền fill_value tại chỗ
+        return mapped.to_numpy(dtype='float64', na_value=np.nan, copy=True), missing
+
+    def encode(self, s, fill_value=None, return_keys=False):
+        """
+        Mã hóa cả cột bằng một phép np.take trên mảng tra theo mã.
+
+        fill_value : ghi đè giá trị điền (ví dụ trung bình đã fit), chỉ dùng với fill_mean
+        return_keys : trả về thêm cột khóa (ví dụ Sleep Duration đã strip)
+        """
+        codes, representatives = _codes_and_representatives(s)
+        keys = self.keys(representatives)
+        lookup, missing = self._lookup(keys)
+
+        if missing.any():
+            if _active_unseen is not None:
+                self._count_unseen(codes, keys, missing, _active_unseen)
+            if self.fill_value is not None:
+                lookup[missing] = self.fill_value
+
+        # Mã -1 (giá trị thiếu) lấy phần tử cuối của mảng tra
+        encoded = pd.Series(np.take(lookup, codes), index=s.index, name=s.name)
+        if self.fill_mean and encoded.isnull().any():
+            encoded = encoded.fillna(encoded.mean() if fill_value is None else fill_value)
+        if not return_keys:
+            return encoded
+        keys = keys.take(codes)
+        keys.index = s.index
+        return keys, encoded
+
+    def _count_unseen(self, codes, keys, missing, unseen):
+        counts = np.bincount(codes + 1, minlength=len(keys))
+        # counts[0] là số dòng thiếu (mã -1), ứng với phần tử cuối của lookup
+        counts = np.roll(counts, -1)
+        found = counts[missing] > 0
+        if not found.any():
+            return
+        counts = pd.Series(counts[missing][found], index=keys[missing][found].astype(object).to_numpy())
+        counts = counts.groupby(level=0, dropna=False).sum()
+        if self.name in unseen:
+            counts = unseen[self.name].add(counts, fill_value=0).astype('int64')
+        unseen[self.name] = counts
+
+
+def _strip(s):
+    return s.astype(str).str.strip()
+
+
+def _yesno_key(s):
+    s = s.astype(str).str.strip().str.title()
+    return s.replace({'Nan': 'No', 'None': 'No'})
+
+
+ENCODERS = {}
+
+
+#Hàm đăng ký bộ mã hóa (ghi đè nếu trùng tên)
+def register_encoder(encoder):
+    ENCODERS[encoder.name] = encoder
+    return encoder
+
+
+def get_encoder(name):
+    try:
+        return ENCODERS[name]
+    except KeyError:
+        raise KeyError(f"❌ Chưa đăng ký bộ mã hóa: {name} (có: {sorted(ENCODERS)})") from None
+
+
+#Hàm đếm giá trị không có trong bảng mã của mọi lần mã hóa trong khối with
+@contextmanager
+def collect_unseen():
+    """
+    Trả về dict {tên bộ mã hóa: Series số dòng theo khóa}, được điền trong
+    khối with. Khối lồng nhau chỉ đếm vào bộ đếm trong cùng.
+    """
+    global _active_unseen
+    previous = _active_unseen
+    unseen = {}
+    _active_unseen = unseen
+    try:
+        yield unseen
+    finally:
+        _active_unseen = previous
+
+
+#Hàm báo cáo các giá trị không có trong bảng mã
+def report_unseen(unseen):
+    """
+    Ghi log WARNING cho mỗi bộ mã hóa trong unseen (kết quả của collect_unseen)
+
+    Returns:
+    --------
+    dict {tên bộ mã hóa: Series số dòng theo khóa, giảm dần}
+    """
+    report = {}
+    for name, counts in unseen.items():
+        encoder = get_encoder(name)
+        counts = counts.sort_values(ascending=False)
+        report[name] = counts
+        if encoder.fill_mean:
+            fill = "đã điền trung bình cột"
+        elif encoder.fill_value is None:
+            fill = "giữ NaN"
+        else:
+            fill = f"đã điền {encoder.fill_value}"
+        logger.warning("⚠️  %s: %d dòng không có trong bảng mã, %s: %s",
+                       name, counts.sum(), fill, counts.head(10).to_dict())
+    return report
+
+
+register_encoder(Encoder('pressure_level', PRESSURE_MAP, prepare=_strip, fill_value=2))
+register_encoder(Encoder('financial_stress', STRESS_MAP, prepare=_strip, fill_value=0))
+register_encoder(Encoder('yesno', YESNO_MAP, prepare=_yesno_key, fill_value=0))
+register_encoder(Encoder('sleep_hours', SLEEP_MAP, prepare=_strip, fill_mean=True))
+register_encoder(Encoder('diet_score', DIET_MAP))
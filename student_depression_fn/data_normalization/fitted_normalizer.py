@@ -0,0 +1,226 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning.chunked_cleaner import StreamingMedian, merge_moments
+
+from data_normalization.data_normalizer import (
+    map_pressure_level,
+    map_financial_stress,
+    map_sleep_hours,
+)
+from data_normalization.encoders import collect_unseen, report_unseen
+from profiling.logger import get_logger
+from data_normalization.normalization_plan import (
+    NUMERIC_COLS,
+    build_normalization_plan,
+    execute_plan,
+)
+
+STATS_VERSION = 1
+
+logger = get_logger(__name__)
+
+
+class FittedNormalizer:
+    """
+    Bộ chuẩn hóa có thể fit một lần trên dữ liệu tham chiếu rồi áp dụng lại
+    cho các batch sinh viên mới mà không cần tải lại dữ liệu tham chiếu.
+
+    Ví dụ:
+        normalizer = FittedNormalizer().fit(cleaned_df)
+        normalizer.save("data/normalizer_stats.json")
+        ...
+        normalizer = FittedNormalizer.load("data/normalizer_stats.json")
+        for batch in batches:
+            scored = normalizer.transform(batch)
+    """
+
+    def __init__(self, minmax_cols=()):
+        self.minmax_cols = list(minmax_cols)
+        self.stats = None
+        # Giá trị không có trong bảng mã của lần transform gần nhất
+        self.last_unseen = {}
+
+    def fit(self, df):
+        """
+        Tính toàn bộ thống kê (median, mean, std, min, max của các cột số và
+        giá trị điền mặc định của sleep_hours) trên các cột đã mã hóa
+        """
+        encoded = {}
+        for col in NUMERIC_COLS:
+            if col not in df.columns:
+                continue
+            if col == 'Academic Pressure':
+                encoded[col] = map_pressure_level(df[col])
+            elif col == 'Financial Stress':
+                encoded[col] = map_financial_stress(df[col])
+            else:
+                encoded[col] = df[col]
+        encoded = pd.DataFrame(encoded)
+
+        # median trước, sau đó mean/std/min/max trên dữ liệu đã điền median
+        # (đúng thứ tự như normalize_dataset)
+        medians = encoded.median()
+        summary = encoded.fillna(medians).agg(['mean', 'std', 'min', 'max'])
+
+        columns = {}
+        for col in encoded.columns:
+            columns[col] = {
+                'median': float(medians[col]),
+                'mean': float(summary.at['mean', col]),
+                'std': float(summary.at['std', col]),
+                'min': float(summary.at['min', col]),
+                'max': float(summary.at['max', col]),
+            }
+
+        sleep_hours_mean = None
+        if 'Sleep Duration' in df.columns:
+            _, hours = map_sleep_hours(df['Sleep Duration'], fill_value=float('nan'))
+            sleep_hours_mean = float(hours.mean())
+
+        self.stats = {
+            'version': STATS_VERSION,
+            'n_rows': int(len(df)),
+            'columns': columns,
+            'sleep_hours_mean': sleep_hours_mean,
+            'minmax_cols': self.minmax_cols,
+        }
+        return self
+
+    def fit_batches(self, batches):
+        """
+        Fit trong một lượt qua các batch (ví dụ iter_cleaned_chunks) mà không
+        gộp chúng trong bộ nhớ.
+
+        Median lấy từ StreamingMedian; mean/std/min/max sau khi điền median
+        được suy ra từ (số lượng, mean, M2) của từng batch gộp lại bằng
+        merge_moments, cộng thêm nhóm các giá trị thiếu (điền bằng median,
+        M2 = 0), nên cho cùng kết quả với fit trên dữ liệu đã gộp (sai khác ở
+        mức làm tròn số thực).
+        """
+        medians = {}
+        moments = {}
+        n_rows = 0
+        sleep_total = 0.0
+        sleep_count = 0
+        has_sleep = False
+        for df in batches:
+            n_rows += len(df)
+            for col in NUMERIC_COLS:
+                if col not in df.columns:
+                    continue
+                if col == 'Academic Pressure':
+                    s = map_pressure_level(df[col])
+                elif col == 'Financial Stress':
+                    s = map_financial_stress(df[col])
+                else:
+                    s = df[col]
+                values = s.dropna().to_numpy(dtype='float64')
+                medians.setdefault(col, StreamingMedian()).update(values)
+                moment, lo, hi = moments.get(col, ((0, 0.0, 0.0), np.inf, -np.inf))
+                if len(values):
+                    lo, hi = min(lo, values.min()), max(hi, values.max())
+                    batch_mean = values.mean()
+                    batch = (len(values), batch_mean, float(((values - batch_mean) ** 2).sum()))
+                    moment = merge_moments(moment, batch)
+                moments[col] = (moment, lo, hi)
+            if 'Sleep Duration' in df.columns:
+                has_sleep = True
+                _, hours = map_sleep_hours(df['Sleep Duration'], fill_value=float('nan'))
+                sleep_total += float(hours.sum())
+                sleep_count += int(hours.notna().sum())
+
+        columns = {}
+        for col, (moment, lo, hi) in moments.items():
+            median = medians[col].median()
+            # Các giá trị thiếu được điền bằng median trước khi tính mean/std
+            n_missing = n_rows - moment[0]
+            if n_missing and not np.isnan(median):
+                moment = merge_moments(moment, (n_missing, float(median), 0.0))
+                lo, hi = min(lo, median), max(hi, median)
+            count, mean, m2 = moment
+            if not count:
+                mean = np.nan
+            std = np.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+            columns[col] = {
+                'median': float(median),
+                'mean': float(mean),
+                'std': float(std),
+                'min': float(lo) if count else np.nan,
+                'max': float(hi) if count else np.nan,
+            }
+
+        sleep_hours_mean = None
+        if has_sleep:
+            sleep_hours_mean = sleep_total / sleep_count if sleep_count else float('nan')
+
+        self.stats = {
+            'version': STATS_VERSION,
+            'n_rows': int(n_rows),
+            'columns': columns,
+            'sleep_hours_mean': sleep_hours_mean,
+            'minmax_cols': self.minmax_cols,
+        }
+        return self
+
+    def _check_fitted(self):
+        if self.stats is None:
+            raise ValueError("❌ FittedNormalizer chưa được fit hoặc load")
+
+    def _check_columns(self, df):
+        """Batch không được có cột cần thống kê mà lúc fit không có"""
+        missing = [col for col in NUMERIC_COLS
+                   if col in df.columns and col not in self.stats['columns']]
+        if 'Sleep Duration' in df.columns and self.stats.get('sleep_hours_mean') is None:
+            missing.append('Sleep Duration')
+        if missing:
+            raise ValueError(f"❌ Batch có các cột không có thống kê lúc fit: {missing}; "
+                             f"hãy fit lại trên dữ liệu có các cột này")
+
+    def transform(self, df):
+        """
+        Chuẩn hóa một batch bằng thống kê đã fit, chi phí O(batch). Giá trị
+        không có trong bảng mã của batch được ghi log WARNING và lưu ở
+        last_unseen.
+        """
+        self._check_fitted()
+        self._check_columns(df)
+        plan = build_normalization_plan(df, stats=self.stats, minmax_cols=self.minmax_cols)
+        with collect_unseen() as unseen:
+            result = execute_plan(df, plan)
+        self.last_unseen = report_unseen(unseen)
+        return result
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def transform_batches(self, batches):
+        """Chuẩn hóa lần lượt từng batch (ví dụ các chunk của iter_cleaned_chunks)"""
+        self._check_fitted()
+        for batch in batches:
+            yield self.transform(batch)
+
+    def save(self, path):
+        """Lưu thống kê ra file JSON nhỏ"""
+        self._check_fitted()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.stats, f, ensure_ascii=False, indent=2)
+        logger.info("✅ Đã lưu thống kê chuẩn hóa tại: %s", path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Đọc thống kê đã lưu bằng save()"""
+        with open(path, encoding='utf-8') as f:
+            stats = json.load(f)
+        if stats.get('version') != STATS_VERSION:
+            raise ValueError(f"❌ Phiên bản thống kê không hỗ trợ: {stats.get('version')}")
+        normalizer = cls(minmax_cols=stats.get('minmax_cols', ()))
+        normalizer.stats = stats
+        return normalizer
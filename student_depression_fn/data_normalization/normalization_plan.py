@@ -0,0 +1,177 @@
+import warnings
+
+import pandas as pd
+
+from data_normalization.data_normalizer import (
+    map_pressure_level,
+    map_financial_stress,
+    map_yesno,
+    map_sleep_hours,
+    map_diet_score,
+)
+from data_normalization.encoders import collect_unseen, report_unseen
+from profiling.logger import get_logger
+
+NUMERIC_COLS = ['CGPA', 'Academic Pressure', 'Work/Study Hours', 'Financial Stress']
+YESNO_COLS = ['Have you ever had suicidal thoughts ?', 'Family History of Mental Illness']
+
+logger = get_logger(__name__)
+
+
+class PlanStep:
+    """
+    Một bước trong kế hoạch chuẩn hóa.
+
+    func nhận Series nguồn (giá trị hiện tại của cột source trong kế hoạch)
+    và trả về dict {tên cột đích: Series}. Trả về dict rỗng nghĩa là bỏ qua
+    (ví dụ std = 0 thì không tạo cột _std).
+    """
+
+    def __init__(self, name, source, func):
+        self.name = name
+        self.source = source
+        self.func = func
+
+    def __repr__(self):
+        return f"PlanStep({self.name!r}, source={self.source!r})"
+
+
+def _column_stat(stats, col, name):
+    """Lấy thống kê đã fit (nếu có), None nghĩa là tính trên dữ liệu hiện tại"""
+    if stats is None:
+        return None
+    return stats['columns'][col][name]
+
+
+def _fill_median(col, stats=None):
+    def step(s):
+        if s.isnull().any():
+            median_val = _column_stat(stats, col, 'median')
+            return {col: s.fillna(s.median() if median_val is None else median_val)}
+        return {}
+    return step
+
+
+def _zscore(col, stats=None):
+    def step(s):
+        mean_val = _column_stat(stats, col, 'mean')
+        std_val = _column_stat(stats, col, 'std')
+        if mean_val is None:
+            mean_val = s.mean()
+            std_val = s.std()
+        if std_val > 0:
+            return {f'{col}_std': (s - mean_val) / std_val}
+        return {}
+    return step
+
+
+def _minmax(col, stats=None):
+    def step(s):
+        min_val = _column_stat(stats, col, 'min')
+        max_val = _column_stat(stats, col, 'max')
+        if min_val is None:
+            min_val = s.min()
+            max_val = s.max()
+        if max_val > min_val:
+            return {f'{col}_norm': (s - min_val) / (max_val - min_val)}
+        return {}
+    return step
+
+
+def _sleep_hours(col, stats=None):
+    def step(s):
+        fill_value = None if stats is None else stats['sleep_hours_mean']
+        stripped, hours = map_sleep_hours(s, fill_value=fill_value)
+        return {col: stripped, 'sleep_hours': hours}
+    return step
+
+
+def _copy_on_write_enabled():
+    """pandas >= 3 luôn bật Copy-on-Write; pandas 2.x bật qua mode.copy_on_write"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return pd.get_option('mode.copy_on_write') is True
+
+
+def _replace(col, func):
+    return lambda s: {col: func(s)}
+
+
+#Hàm lập kế hoạch chuẩn hóa
+def build_normalization_plan(df, stats=None, minmax_cols=()):
+    """
+    Thu thập toàn bộ phép biến đổi của normalize_dataset thành một danh sách
+    PlanStep theo đúng thứ tự, không đụng tới dữ liệu.
+
+    stats : dict, optional
+        Thống kê đã fit (xem FittedNormalizer). Nếu không có, median/mean/std
+        được tính trên chính df như normalize_dataset.
+    minmax_cols : list, optional
+        Các cột số cần thêm cột {col}_norm (normalize_minmax)
+    """
+    columns = set(df.columns)
+    plan = []
+
+    # 0. Mã hóa Academic Pressure, Financial Stress
+    if 'Academic Pressure' in columns:
+        plan.append(PlanStep('encode_pressure_level', 'Academic Pressure',
+                             _replace('Academic Pressure', map_pressure_level)))
+    if 'Financial Stress' in columns:
+        plan.append(PlanStep('encode_financial_stress', 'Financial Stress',
+                             _replace('Financial Stress', map_financial_stress)))
+
+    # 1. Điền median và chuẩn hóa z-score các cột số
+    for col in NUMERIC_COLS:
+        if col in columns:
+            plan.append(PlanStep('fill_median', col, _fill_median(col, stats)))
+            plan.append(PlanStep('standardize_zscore', col, _zscore(col, stats)))
+            if col in minmax_cols:
+                plan.append(PlanStep('normalize_minmax', col, _minmax(col, stats)))
+
+    # 2. Mã hóa Yes/No
+    for col in YESNO_COLS:
+        if col in columns:
+            plan.append(PlanStep('encode_yesno', col, _replace(col, map_yesno)))
+
+    # 3. Mã hóa cột phân loại đặc biệt
+    if 'Sleep Duration' in columns:
+        plan.append(PlanStep('encode_sleep_hours', 'Sleep Duration', _sleep_hours('Sleep Duration', stats)))
+    if 'Dietary Habits' in columns:
+        plan.append(PlanStep('encode_diet_score', 'Dietary Habits',
+                             _replace('diet_score', map_diet_score)))
+
+    return plan
+
+
+#Hàm thực thi kế hoạch chuẩn hóa
+def execute_plan(df, plan):
+    """
+    Chạy kế hoạch trong một lượt.
+
+    Các cột được giữ dưới dạng tham chiếu tới Series của df (không sao chép);
+    mỗi bước chỉ cấp phát đúng các cột nó tạo ra. DataFrame kết quả được tạo
+    một lần duy nhất ở cuối: khi Copy-on-Write được bật, các cột không đổi
+    được dùng chung với df, ngược lại chúng được sao chép đúng một lần.
+    """
+    columns = {col: df[col] for col in df.columns}
+    for step in plan:
+        columns.update(step.func(columns[step.source]))
+    return pd.DataFrame(columns, index=df.index, copy=not _copy_on_write_enabled())
+
+
+#Hàm chuẩn hóa dataset bằng kế hoạch
+def normalize_dataset_planned(df, stats=None):
+    """
+    Cho kết quả giống normalize_dataset nhưng không sao chép toàn bộ
+    DataFrame ở mỗi bước
+    """
+    plan = build_normalization_plan(df, stats=stats)
+    logger.info("Bắt đầu chuẩn hóa dữ liệu theo kế hoạch (%d bước)...", len(plan))
+    with collect_unseen() as unseen:
+        result = execute_plan(df, plan)
+    logger.info("✅ Chuẩn hóa dữ liệu hoàn tất")
+    logger.info("   Shape cuối cùng: %s", result.shape)
+    report_unseen(unseen)
+    return result
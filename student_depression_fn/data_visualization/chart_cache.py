@@ -0,0 +1,99 @@
+import hashlib
+import inspect
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+MANIFEST_NAME = ".chart_cache.json"
+
+# Tên file ảnh và các cột mà mỗi hàm plot_* đọc.
+# None nghĩa là cột được xác định lúc chạy (ma trận tương quan dùng mọi cột số).
+CHART_INPUTS = {
+    "plot_depression_by_gender": ("depression_by_gender", ["Depression", "Gender"]),
+    "plot_gender_distribution": ("gender_distribution", ["Gender"]),
+    "plot_top_age_distribution": ("top_age_distribution", ["Age"]),
+    "plot_cgpa_distribution": ("cgpa_distribution", ["CGPA"]),
+    "plot_sleep_duration_distribution": ("sleep_duration_distribution", ["Sleep Duration"]),
+    "plot_correlation_matrix": ("correlation_matrix", None),
+    "plot_cgpa_vs_depression": ("cgpa_vs_depression", ["CGPA", "Depression"]),
+    "plot_depression_assessment_scatter": ("depression_assessment_scatter",
+                                           ["CGPA_std", "Work/Study Hours_std", "Depression"]),
+    "plot_sleep_work_depression": ("sleep_work_depression",
+                                   ["Sleep Duration", "Work/Study Hours", "Depression"]),
+}
+CORRELATION_EXCLUDE = ['Work Pressure', 'Job Satisfaction']
+
+
+def chart_columns(plot_name, df):
+    _, columns = CHART_INPUTS[plot_name]
+    if columns is None:
+        numeric = df.select_dtypes(include=np.number).columns
+        columns = [c for c in numeric if c not in CORRELATION_EXCLUDE]
+    return [c for c in columns if c in df.columns]
+
+
+def _plot_params(func):
+    # Tham số mặc định của hàm vẽ (ví dụ bins=20)
+    params = {}
+    for name, p in inspect.signature(func).parameters.items():
+        if p.default is not inspect.Parameter.empty:
+            params[name] = p.default
+    return params
+
+
+# Khóa cache của một biểu đồ: băm nội dung các cột được đọc, tham số và
+# mã nguồn hàm vẽ (sửa hàm vẽ thì biểu đồ được vẽ lại)
+def chart_cache_key(func, df):
+    h = hashlib.sha256()
+    h.update(f"v{CACHE_VERSION}:{func.__name__}".encode())
+    h.update(json.dumps(_plot_params(func), sort_keys=True, default=str).encode())
+    try:
+        h.update(inspect.getsource(func).encode())
+    except (OSError, TypeError):
+        pass
+    for col in chart_columns(func.__name__, df):
+        s = df[col]
+        h.update(f"{col}|{s.dtype}|{len(s)}".encode())
+        h.update(pd.util.hash_pandas_object(s, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class ChartCache:
+    """Manifest lưu khóa của các biểu đồ đã vẽ trong thư mục chart"""
+
+    def __init__(self, chart_dir="chart"):
+        self.chart_dir = chart_dir
+        self.path = os.path.join(chart_dir, MANIFEST_NAME)
+        self.entries = {}
+        self.hits = []
+        self.misses = []
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+
+    def is_fresh(self, plot_name, key):
+        chart_name, _ = CHART_INPUTS[plot_name]
+        png = os.path.join(self.chart_dir, f"{chart_name}.png")
+        return self.entries.get(plot_name) == key and os.path.exists(png)
+
+    def record(self, plot_name, key, hit):
+        self.entries[plot_name] = key
+        (self.hits if hit else self.misses).append(plot_name)
+
+    def save(self):
+        os.makedirs(self.chart_dir, exist_ok=True)
+        manifest = {
+            "version": CACHE_VERSION,
+            "entries": self.entries,
+            "last_run": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "hits": self.hits,
+                "misses": self.misses,
+            },
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
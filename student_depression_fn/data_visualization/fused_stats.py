@@ -0,0 +1,310 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning.chunked_cleaner import StreamingMedian, merge_moments
+
+# Thứ tự các dòng của describe(include='all')
+DESCRIBE_ROWS = ['count', 'unique', 'top', 'freq', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+DESCRIBE_PERCENTILES = [0.25, 0.5, 0.75]
+# Các bảng mà run_all_analysis in ra
+DEFAULT_CROSSTABS = [('Depression', 'Academic Pressure')]
+DEFAULT_GROUPS = [('Gender', 'Depression'), ('Profession', 'Depression')]
+
+
+def _is_numeric(dtype):
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _add_counts(total, counts):
+    return counts if total is None else total.add(counts, fill_value=0)
+
+
+class FusedStatsAccumulator:
+    """
+    Tính trong một lượt đọc dữ liệu (có thể theo từng chunk) mọi thống kê mà
+    run_all_analysis cần:
+    - số dòng, số giá trị thiếu của từng cột
+    - describe(include='all'): count/mean/std/min/max của cột số,
+      count/unique/top/freq của cột phân loại
+    - bảng chéo (crosstab) và trung bình/số lượng theo nhóm (groupby)
+    - ma trận hiệp phương sai / tương quan của các cột số (bỏ NaN theo từng cặp
+      như DataFrame.corr)
+
+    Mỗi chunk chỉ được đưa vào một lần nên dữ liệu nguồn không phải đọc lại,
+    nhưng bên trong một chunk các thống kê vẫn là các phép tính pandas/numpy
+    riêng: isnull cho cả chunk, value_counts (cột phân loại) hoặc min/max và
+    StreamingMedian (cột số) cho từng cột, một groupby cho mỗi bảng chéo và
+    mỗi nhóm, và hai phép nhân ma trận cho các mômen. Mỗi cột của chunk vì
+    vậy vẫn được quét vài lần trong bộ nhớ.
+
+    Mean/std/hiệp phương sai được giữ dạng (số lượng, mean, M2, mômen chéo)
+    cho từng cặp cột, tính trên chunk đã trừ mean của chunk rồi gộp bằng
+    công thức của Chan (merge_moments), không dùng tổng bình phương. Mean
+    được lưu so với mean của chunk đầu tiên (shift) để độ lệch giữa các
+    chunk không bị làm tròn theo độ lớn của dữ liệu.
+
+    Phân vị (25%/50%/75%) không tính được chính xác trong một lượt nói chung:
+    chúng được suy ra từ bảng tần suất của StreamingMedian, chính xác khi số
+    giá trị phân biệt của cột <= max_bins và xấp xỉ khi vượt quá.
+
+    Ví dụ:
+        stats = FusedStatsAccumulator()
+        for chunk in chunks:
+            stats.update(chunk)
+        print(stats.describe())
+        corr = stats.corr(['CGPA', 'Depression'])
+    """
+
+    def __init__(self, crosstabs=DEFAULT_CROSSTABS, groups=DEFAULT_GROUPS, max_bins=100_000):
+        self.crosstabs = list(crosstabs)
+        self.groups = list(groups)
+        self.max_bins = max_bins
+        self.n_rows = 0
+        self.columns = None
+        self.dtypes = None
+        self.numeric_cols = []
+        self.missing = None
+        self._value_counts = {}
+        self._quantiles = {}
+        self._min = {}
+        self._max = {}
+        self._pair_counts = {}
+        self._group_sums = {}
+        self._categories = {}
+        # Mômen theo cặp cột số, trên các dòng cả x_i và x_j có giá trị:
+        # n[i, j] số dòng, mean[i, j] mean của x_i, m2[i, j] tổng bình phương
+        # độ lệch của x_i, c[i, j] tổng (x_i - mean[i, j]) * (x_j - mean[j, i]).
+        # mean tính so với shift (mean từng cột của chunk đầu tiên)
+        self._shift = None
+        self._n = None
+        self._mean = None
+        self._m2 = None
+        self._c = None
+
+    def _init_columns(self, chunk):
+        self.columns = list(chunk.columns)
+        self.dtypes = chunk.dtypes
+        self.numeric_cols = [col for col in self.columns if _is_numeric(chunk[col].dtype)]
+        k = len(self.numeric_cols)
+        self._n = np.zeros((k, k))
+        self._mean = np.zeros((k, k))
+        self._m2 = np.zeros((k, k))
+        self._c = np.zeros((k, k))
+        for col in self.numeric_cols:
+            self._quantiles[col] = StreamingMedian(max_bins=self.max_bins)
+
+    def update(self, chunk):
+        """Cộng dồn thống kê của một chunk (DataFrame có cùng cột với các chunk trước)"""
+        if self.columns is None:
+            self._init_columns(chunk)
+        self.n_rows += len(chunk)
+        self.missing = _add_counts(self.missing, chunk.isnull().sum())
+
+        for col in self.columns:
+            s = chunk[col]
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                self._categories.setdefault(col, [])
+                known = set(self._categories[col])
+                self._categories[col] += [c for c in s.cat.categories if c not in known]
+            if col in self._quantiles:
+                self._quantiles[col].update(s)
+                if s.notna().any():
+                    self._min[col] = min(self._min.get(col, np.inf), s.min())
+                    self._max[col] = max(self._max.get(col, -np.inf), s.max())
+            else:
+                self._value_counts[col] = _add_counts(self._value_counts.get(col),
+                                                      s.value_counts(sort=False))
+
+        for a, b in self.crosstabs:
+            pairs = chunk.groupby([a, b], observed=True).size()
+            self._pair_counts[(a, b)] = _add_counts(self._pair_counts.get((a, b)), pairs)
+
+        for key, value in self.groups:
+            sums = chunk.groupby(key, observed=True)[value].agg(['sum', 'count'])
+            self._group_sums[(key, value)] = _add_counts(self._group_sums.get((key, value)), sums)
+
+        self._update_moments(chunk)
+        return self
+
+    def _update_moments(self, chunk):
+        if not self.numeric_cols:
+            return
+        x = chunk[self.numeric_cols].to_numpy(dtype='float64', na_value=np.nan)
+        present = ~np.isnan(x)
+        n_present = present.sum(axis=0)
+        if self._shift is None:
+            totals = np.where(present, x, 0.0).sum(axis=0)
+            self._shift = np.divide(totals, n_present, out=np.zeros(len(totals)), where=n_present > 0)
+        x = x - self._shift
+        # Trừ thêm mean của từng cột trong chunk: các tổng dưới đây quanh 0
+        # nên phép trừ sy² / n không mất chính xác
+        totals = np.where(present, x, 0.0).sum(axis=0)
+        center = np.divide(totals, n_present, out=np.zeros(len(totals)), where=n_present > 0)
+        y = np.where(present, x - center, 0.0)
+        mask = present.astype('float64')
+        n = mask.T @ mask
+        sy = y.T @ mask
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_y = np.where(n > 0, sy / n, 0.0)
+        m2 = (y * y).T @ mask - sy * mean_y
+        c = y.T @ y - sy * mean_y.T
+        self._merge_pairwise((n, center[:, None] + mean_y, m2, c))
+
+    def _merge_pairwise(self, other):
+        """Gộp mômen theo cặp (n, mean, m2, c) của một nhóm dòng khác"""
+        n_b, mean_b, m2_b, c_b = other
+        n_a, mean_a = self._n, self._mean
+        n = np.maximum(n_a + n_b, 1)
+        # Mômen chéo gộp như M2, với độ lệch mean của x_i và của x_j
+        delta = mean_b - mean_a
+        self._c = self._c + c_b + delta * delta.T * n_a * n_b / n
+        self._n, self._mean, self._m2 = merge_moments((n_a, mean_a, self._m2), (n_b, mean_b, m2_b))
+
+    def merge(self, other):
+        """
+        Gộp thống kê của một accumulator khác (ví dụ của một file khác trong
+        xử lý theo lô) vào accumulator này. Hai bên phải có cùng các cột.
+        """
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+        if other.columns != self.columns:
+            raise ValueError("❌ Không thể gộp thống kê của các bảng có cột khác nhau")
+        self.n_rows += other.n_rows
+        self.missing = _add_counts(self.missing, other.missing)
+        for col, counts in other._value_counts.items():
+            self._value_counts[col] = _add_counts(self._value_counts.get(col), counts)
+        for col, accumulator in other._quantiles.items():
+            self._quantiles[col].update_counts(accumulator.counts)
+        for col, value in other._min.items():
+            self._min[col] = min(self._min.get(col, np.inf), value)
+        for col, value in other._max.items():
+            self._max[col] = max(self._max.get(col, -np.inf), value)
+        for col, categories in other._categories.items():
+            known = set(self._categories.setdefault(col, []))
+            self._categories[col] += [c for c in categories if c not in known]
+        for key, counts in other._pair_counts.items():
+            self._pair_counts[key] = _add_counts(self._pair_counts.get(key), counts)
+        for key, sums in other._group_sums.items():
+            self._group_sums[key] = _add_counts(self._group_sums.get(key), sums)
+        if other._shift is not None:
+            if self._shift is None:
+                self._shift = other._shift.copy()
+            # mean của other tính so với other._shift: đổi sang self._shift
+            mean = other._mean + (other._shift - self._shift)[:, None]
+            self._merge_pairwise((other._n, mean, other._m2, other._c))
+        return self
+
+
+    #Các kết quả
+    def missing_values(self):
+        """Giống df.isnull().sum()"""
+        return self.missing.astype('int64')
+
+    def _column_describe(self, col):
+        if col in self._quantiles:
+            i = self.numeric_cols.index(col)
+            n = self._n[i, i]
+            stats = {'count': float(n)}
+            if n == 0:
+                return stats
+            stats['mean'] = self._shift[i] + self._mean[i, i]
+            if n > 1:
+                stats['std'] = np.sqrt(self._m2[i, i] / (n - 1))
+            stats['min'] = self._min[col]
+            for q in DESCRIBE_PERCENTILES:
+                stats[f'{q:.0%}'] = self._quantiles[col].quantile(q)
+            stats['max'] = self._max[col]
+            # describe trả về float cho mọi thống kê của cột số
+            return {name: float(value) for name, value in stats.items()}
+        counts = self._value_counts[col]
+        counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+        stats = {'count': self.n_rows - self.missing[col], 'unique': len(counts)}
+        if len(counts):
+            stats['top'] = counts.index[0]
+            stats['freq'] = int(counts.iloc[0])
+        return stats
+
+    def describe(self):
+        """Giống df.describe(include='all')"""
+        # Như describe: cột số có kiểu float64, cột phân loại có kiểu object
+        result = pd.concat([pd.Series(self._column_describe(col), name=col,
+                                      dtype='float64' if col in self._quantiles else 'object')
+                            .reindex(DESCRIBE_ROWS) for col in self.columns], axis=1)
+        # Bỏ các dòng không áp dụng cho cột nào (ví dụ dữ liệu chỉ có cột số)
+        return result.dropna(how='all')
+
+    def crosstab(self, a, b):
+        """Giống pd.crosstab(df[a], df[b])"""
+        counts = self._pair_counts[(a, b)]
+        counts = counts[counts > 0].astype('int64')
+        counts.index.names = [a, b]
+        table = counts.unstack(fill_value=0).sort_index().sort_index(axis=1)
+        return table
+
+    def _group_index(self, key, values):
+        if key in self._categories:
+            categories = sorted(self._categories[key])
+            return pd.CategoricalIndex(categories, categories=categories, name=key), categories
+        index = values.index.sort_values()
+        return index.rename(key), index
+
+    def group_mean(self, key, value):
+        """Giống df.groupby(key, observed=False)[value].mean()"""
+        sums = self._group_sums[(key, value)]
+        index, labels = self._group_index(key, sums)
+        sums = sums.reindex(labels)
+        return pd.Series((sums['sum'] / sums['count']).to_numpy(), index=index, name=value)
+
+    def group_count(self, key, value):
+        """Giống df.groupby(key, observed=False)[value].count()"""
+        sums = self._group_sums[(key, value)]
+        index, labels = self._group_index(key, sums)
+        counts = sums['count'].reindex(labels).fillna(0).astype('int64')
+        return pd.Series(counts.to_numpy(), index=index, name=value)
+
+    def cov(self, columns=None):
+        """Ma trận hiệp phương sai, bỏ NaN theo từng cặp như DataFrame.cov"""
+        return self._pairwise(columns, corr=False)
+
+    def corr(self, columns=None):
+        """Ma trận tương quan Pearson, bỏ NaN theo từng cặp như DataFrame.corr"""
+        return self._pairwise(columns, corr=True)
+
+    def _pairwise(self, columns, corr):
+        columns = self.numeric_cols if columns is None else list(columns)
+        idx = [self.numeric_cols.index(col) for col in columns]
+        n = self._n[np.ix_(idx, idx)]
+        c = self._c[np.ix_(idx, idx)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if corr:
+                # m2[i, j] và m2[j, i]: độ phân tán của x_i và x_j trên cùng các dòng
+                m2 = self._m2[np.ix_(idx, idx)]
+                divisor = np.sqrt(m2 * m2.T)
+                values = np.where(divisor > 0, c / divisor, np.nan)
+            else:
+                values = np.where(n > 1, c / (n - 1), np.nan)
+        values[n < 1] = np.nan
+        return pd.DataFrame(values, index=columns, columns=columns)
+
+
+#Hàm tính thống kê gộp cho DataFrame hoặc dãy các chunk
+def compute_fused_stats(data, chunksize=None, **kwargs):
+    """
+    data : DataFrame hoặc iterable các DataFrame (ví dụ iter_cleaned_chunks)
+    chunksize : int, optional
+        Với DataFrame, xử lý theo từng khối chunksize dòng
+    """
+    stats = FusedStatsAccumulator(**kwargs)
+    if isinstance(data, pd.DataFrame):
+        if chunksize is None:
+            return stats.update(data)
+        frame = data
+        data = (frame.iloc[start:start + chunksize] for start in range(0, len(frame), chunksize))
+    for chunk in data:
+        stats.update(chunk)
+    return stats
@@ -1,14 +1,44 @@
-import seaborn as sns
+import importlib
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use("Agg")
 import os
-import matplotlib.pyplot as plt
+from profiling.logger import get_logger
+from profiling.stage_profiler import profile_stage
+logger = get_logger(__name__)
+# Module chỉ được import ở lần truy cập thuộc tính đầu tiên: seaborn và
+# matplotlib.pyplot tốn gần 1 giây để import nên chỉ nạp khi thực sự vẽ
+class _LazyModule:
+    def __init__(self, name, setup=None):
+        self._name = name
+        self._setup = setup
+        self._module = None
+    def __getattr__(self, attr):
+        if self._module is None:
+            if self._setup is not None:
+                self._setup()
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+def _use_agg_backend():
+    import matplotlib
+    matplotlib.use("Agg")
+plt = _LazyModule("matplotlib.pyplot", setup=_use_agg_backend)
+sns = _LazyModule("seaborn", setup=_use_agg_backend)
+# Thư mục lưu biểu đồ
+CHART_DIR = "chart"
+# Trên ngưỡng số dòng này, biểu đồ phân tán chuyển sang chế độ dữ liệu lớn
+LARGE_DATA_THRESHOLD = 200_000
+# Số điểm giữ lại khi vẽ bằng lấy mẫu phân tầng
+LARGE_SAMPLE_SIZE = 50_000
 # Lưu biểu đồ hiện tại thành file ảnh
+# Trong khối async_output(), phần nén PNG và ghi file chạy ở luồng ghi nền
 def save_current_figure(name):
-    os.makedirs("chart", exist_ok=True)
-    plt.savefig(f"chart/{name}.png", dpi=300, bbox_inches="tight")
+    from storage.async_writer import get_writer
+    os.makedirs(CHART_DIR, exist_ok=True)
+    writer = get_writer()
+    if writer is None:
+        plt.savefig(f"{CHART_DIR}/{name}.png", dpi=300, bbox_inches="tight")
+    else:
+        writer.save_figure(plt.gcf(), f"{CHART_DIR}/{name}.png", dpi=300, bbox_inches="tight")
 def show_save_and_wait(name):
     save_current_figure(name)
     plt.close()  
@@ -31,12 +61,14 @@ def count_depression_by_profession(df):
     count_data = df.groupby('Profession', observed=False)['Depression'].count()
     return count_data
 # Vẽ biểu đồ countplot cho 'Depression' theo 'Gender'
+@profile_stage("visualization")
 def plot_depression_by_gender(df):
     plt.figure(figsize=(10, 6))
     sns.countplot(x='Depression', data=df, hue='Gender')
     plt.title('Depression levels by Gender')
     show_save_and_wait("depression_by_gender")
 # Biểu đồ tính lượng trầm cảm theo 'Gender'
+@profile_stage("visualization")
 def plot_gender_distribution(df):
     plt.figure(figsize=(8, 6))
     sns.countplot(x='Gender', data=df)
@@ -45,6 +77,7 @@ def plot_gender_distribution(df):
     plt.ylabel('Frequency')
     show_save_and_wait("gender_distribution")
 # Biểu đồ tần suất của các giá trị trong cột 'Age' và lấy top 
+@profile_stage("visualization")
 def plot_top_age_distribution(df):
     top_ages = df['Age'].value_counts().head(8)
     plt.figure(figsize=(10, 6))
@@ -55,6 +88,7 @@ def plot_top_age_distribution(df):
     plt.xticks(rotation=45, ha='right')
     show_save_and_wait("top_age_distribution")
 # Biểu đồ phân phối CGPA
+@profile_stage("visualization")
 def plot_cgpa_distribution(df, bins=20):
     x = pd.to_numeric(df['CGPA'], errors='coerce')
     plt.figure(figsize=(10, 6))
@@ -64,6 +98,7 @@ def plot_cgpa_distribution(df, bins=20):
     plt.ylabel('Frequency')
     show_save_and_wait("cgpa_distribution")
 # Biểu đồ xác định thời gian ngủ phổ biến của sinh viên
+@profile_stage("visualization")
 def plot_sleep_duration_distribution(df, bins=20):
     x = pd.to_numeric(df['Sleep Duration'], errors='coerce')
     plt.figure(figsize=(10, 6))
@@ -73,28 +108,31 @@ def plot_sleep_duration_distribution(df, bins=20):
     plt.ylabel('Frequency')
     show_save_and_wait("sleep_duration_distribution")
 # Ma trận tương quan
-def plot_correlation_matrix(df):
+# corr: ma trận tương quan đã tính sẵn (FusedStatsAccumulator.corr), None thì tính từ df
+@profile_stage("visualization")
+def plot_correlation_matrix(df, corr=None):
     numeric_features = df.select_dtypes(include=np.number).columns.tolist()
     exclude_columns = ['Work Pressure', 'Job Satisfaction']
     numeric_features = [c for c in numeric_features if c not in exclude_columns]
 
     if len(numeric_features) < 2:
-        print("Không đủ cột numeric để vẽ correlation.")
+        logger.warning("Không đủ cột numeric để vẽ correlation.")
         return
 
-    corr = df[numeric_features].corr()
+    if corr is None:
+        corr = df[numeric_features].corr()
     plt.figure(figsize=(12, 10))
     sns.heatmap(corr, annot=True, cmap='coolwarm', fmt=".2f")
     plt.title('Correlation Matrix of Numerical Features')
     show_save_and_wait("correlation_matrix")
 # Biểu đồ ảnh hưởng của CGPA và Despression
+@profile_stage("visualization")
 def plot_cgpa_vs_depression(df):
     x = pd.to_numeric(df['CGPA'], errors='coerce')
     d = pd.to_numeric(df['Depression'], errors='coerce')
 
-    data = df.copy()
-    data['CGPA'] = x
-    data['Depression'] = d
+    # Chỉ hai cột cần vẽ, không sao chép cả bảng (bảng có thể là memory-map dùng chung)
+    data = pd.DataFrame({'CGPA': x, 'Depression': d})
 
     plt.figure(figsize=(8, 6))
     sns.boxplot(x='Depression', y='CGPA', data=data)
@@ -102,8 +140,24 @@ def plot_cgpa_vs_depression(df):
     plt.xlabel("Depression (0 = No, 1 = Yes)")
     plt.ylabel("CGPA")
     show_save_and_wait("cgpa_vs_depression")
+# Vẽ phân tán cho dữ liệu lớn:
+# - "hexbin": gộp điểm theo lưới lục giác, màu là tỷ lệ trầm cảm trong mỗi ô
+# - "sample": lấy mẫu phân tầng theo Depression, giữ tỷ lệ giữa các nhóm
+def scatter_large(x, y, d, mode="hexbin", sample_size=LARGE_SAMPLE_SIZE, seed=0):
+    if mode == "hexbin":
+        plt.hexbin(x, y, C=d, reduce_C_function=np.mean, gridsize=60, mincnt=1)
+        return "Depression rate"
+    if mode == "sample":
+        frac = min(1.0, sample_size / len(d))
+        sample = (pd.DataFrame({"x": x, "y": y, "d": d})
+                  .groupby("d", group_keys=False)
+                  .sample(frac=frac, random_state=seed))
+        plt.scatter(sample["x"], sample["y"], c=sample["d"], s=4)
+        return "Depression (0 = No, 1 = Yes)"
+    raise ValueError(f"large_mode không hợp lệ: {mode}")
 # Biểu đồ phân tán đánh giá trầm cảm
-def plot_depression_assessment_scatter(df):
+@profile_stage("visualization")
+def plot_depression_assessment_scatter(df, large_threshold=LARGE_DATA_THRESHOLD, large_mode="hexbin"):
     x = pd.to_numeric(df['CGPA_std'], errors='coerce')
     y = pd.to_numeric(df['Work/Study Hours_std'], errors='coerce')
     d = pd.to_numeric(df['Depression'], errors='coerce')
@@ -112,7 +166,11 @@ def plot_depression_assessment_scatter(df):
     x, y, d = x[mask], y[mask], d[mask]
 
     plt.figure(figsize=(9, 7))
-    plt.scatter(x, y, c=d)
+    colorbar_label = "Depression (0 = No, 1 = Yes)"
+    if len(d) > large_threshold:
+        colorbar_label = scatter_large(x, y, d, large_mode)
+    else:
+        plt.scatter(x, y, c=d)
 
     x0 = x.mean()
     y0 = y.mean()
@@ -122,70 +180,168 @@ def plot_depression_assessment_scatter(df):
     plt.title("Depression Assessment: Standardized CGPA vs Work/Study Hours")
     plt.xlabel("CGPA_std")
     plt.ylabel("Work/Study Hours_std")
-    plt.colorbar(label="Depression (0 = No, 1 = Yes)")
+    plt.colorbar(label=colorbar_label)
 
     plt.tight_layout()
     show_save_and_wait("depression_assessment_scatter")
 # Biểu đồ phân tán tương tác giữa giấc ngủ - thời gian học/ làm và trạng thái trầm cảm
-def plot_sleep_work_depression(df):
+@profile_stage("visualization")
+def plot_sleep_work_depression(df, large_threshold=LARGE_DATA_THRESHOLD, large_mode="hexbin"):
     plt.figure(figsize=(9, 7))
-    plt.scatter(
-        df['Sleep Duration'],
-        df['Work/Study Hours'],
-        c=df['Depression']
-    )
+    colorbar_label = "Depression (0 = No, 1 = Yes)"
+    if len(df) > large_threshold:
+        x = pd.to_numeric(df['Sleep Duration'], errors='coerce')
+        y = pd.to_numeric(df['Work/Study Hours'], errors='coerce')
+        d = pd.to_numeric(df['Depression'], errors='coerce')
+        mask = x.notna() & y.notna() & d.notna()
+        colorbar_label = scatter_large(x[mask], y[mask], d[mask], large_mode)
+    else:
+        plt.scatter(
+            df['Sleep Duration'],
+            df['Work/Study Hours'],
+            c=df['Depression']
+        )
     plt.xlabel("Sleep Duration")
     plt.ylabel("Work/Study Hours")
     plt.title("Sleep - Work Interaction and Depression")
-    plt.colorbar(label="Depression (0 = No, 1 = Yes)")
+    plt.colorbar(label=colorbar_label)
     show_save_and_wait("sleep_work_depression") 
     
-# Hàm tổng hợp
-def run_all_analysis(df):
+# Danh sách biểu đồ theo thứ tự vẽ: (nhãn hiển thị, hàm vẽ)
+CHART_TASKS = [
+    ("1. Depression theo Gender", plot_depression_by_gender),
+    ("2. Phân phối Gender", plot_gender_distribution),
+    ("3. Phân phối Age (Top)", plot_top_age_distribution),
+    ("4. Phân phối CGPA", plot_cgpa_distribution),
+    ("5. Phân phối Sleep Duration", plot_sleep_duration_distribution),
+    ("6. Ma trận tương quan", plot_correlation_matrix),
+    ("7. Ảnh hưởng CGPA đến Depression", plot_cgpa_vs_depression),
+    ("8. Đánh giá trầm cảm (CGPA_std vs Work/Study Hours_std)", plot_depression_assessment_scatter),
+    ("9. Tương tác Giấc ngủ - Học/Làm - Trầm cảm", plot_sleep_work_depression),
+]
+
+# DataFrame dùng chung trong mỗi tiến trình con, gắn từ file memory-map
+_worker_df = None
+
+def _attach_worker_frame(shared_dir, chart_dir=None, strings_as_category=False):
+    global _worker_df, CHART_DIR
+    from storage.shared_frame import attach_shared_frame
+    _worker_df = attach_shared_frame(shared_dir, strings_as_category=strings_as_category)
+    if chart_dir is not None:
+        CHART_DIR = chart_dir
+
+def _render_chart(plot_name, kwargs=None):
+    globals()[plot_name](_worker_df, **(kwargs or {}))
+    return plot_name
+
+# Vẽ các biểu đồ song song bằng process pool (backend Agg).
+# Dữ liệu được ghi một lần ra file memory-map, các worker gắn vào thay vì
+# nhận bản sao pickle của DataFrame.
+# shared_dir: df đã có sẵn trên đĩa (attach_shared_frame), dùng lại thay vì ghi bản tạm
+def render_charts_parallel(df, n_jobs, tasks=None, chart_kwargs=None, shared_dir=None,
+                           strings_as_category=False):
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from contextlib import nullcontext
+    from storage.shared_frame import write_shared_frame
+
+    tasks = CHART_TASKS if tasks is None else tasks
+    chart_kwargs = chart_kwargs or {}
+    labels = {func.__name__: label for label, func in tasks}
+    if shared_dir is None:
+        context = tempfile.TemporaryDirectory(prefix="shared_frame_")
+    else:
+        context = nullcontext(shared_dir)
+    with context as frame_dir:
+        if shared_dir is None:
+            write_shared_frame(df, frame_dir)
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_attach_worker_frame,
+                                 initargs=(frame_dir, CHART_DIR, strings_as_category)) as pool:
+            futures = [pool.submit(_render_chart, func.__name__, chart_kwargs.get(func.__name__))
+                       for _, func in tasks]
+            for future in as_completed(futures):
+                logger.info(labels[future.result()])
+
+# Lọc các biểu đồ có dữ liệu đầu vào không đổi so với lần vẽ trước
+def filter_cached_charts(df, cache):
+    from data_visualization.chart_cache import chart_cache_key
+
+    pending = []
+    for label, func in CHART_TASKS:
+        key = chart_cache_key(func, df)
+        if cache.is_fresh(func.__name__, key):
+            cache.record(func.__name__, key, hit=True)
+            logger.info("%s (cache)", label)
+        else:
+            cache.record(func.__name__, key, hit=False)
+            pending.append((label, func))
+    return pending
+
+# In báo cáo thống kê từ kết quả của FusedStatsAccumulator
+# Báo cáo là đầu ra của lần phân tích nên ghi thẳng ra stdout (job phân tích
+# chuyển hướng vào report.txt), không qua logger
+def print_analysis_report(stats):
     print("===== THỐNG KÊ MÔ TẢ DỮ LIỆU =====")
-    desc = describe_data(df)
-    print(desc['description'])
+    print(stats.describe())
     print("\nGiá trị thiếu:")
-    print(desc['missing_values'])
+    print(stats.missing_values())
     print("\nKiểu dữ liệu:")
-    print(desc['data_types'])
+    print(stats.dtypes)
 
     print("\n===== BẢNG CHÉO: DEPRESSION vs ACADEMIC PRESSURE =====")
-    print(crosstab_depression_academic_pressure(df))
+    print(stats.crosstab('Depression', 'Academic Pressure'))
 
     print("\n===== TỶ LỆ TRẦM CẢM THEO GIỚI TÍNH =====")
-    print(group_by_gender_depression(df))
+    print(stats.group_mean('Gender', 'Depression'))
 
     print("\n===== SỐ LƯỢNG TRẦM CẢM THEO NGHỀ NGHIỆP =====")
-    print(count_depression_by_profession(df))
-
-    print("\n===== VẼ BIỂU ĐỒ =====")
-
-    print("1. Depression theo Gender")
-    plot_depression_by_gender(df)
+    print(stats.group_count('Profession', 'Depression'))
 
-    print("2. Phân phối Gender")
-    plot_gender_distribution(df)
-
-    print("3. Phân phối Age (Top)")
-    plot_top_age_distribution(df)
-
-    print("4. Phân phối CGPA")
-    plot_cgpa_distribution(df)
+# Hàm tổng hợp
+# Mọi thống kê của báo cáo được tính trong một lượt qua dữ liệu (FusedStatsAccumulator);
+# stats: kết quả đã tính sẵn, ví dụ cộng dồn trên các chunk của pipeline theo chunk
+# chart_dir: thư mục lưu biểu đồ của lần phân tích này (mặc định CHART_DIR)
+# shared_dir: df là bộ dữ liệu dùng chung gắn từ thư mục này (attach_shared_frame với
+# strings_as_category=True, không lọc), các worker vẽ gắn lại thay vì ghi bản tạm
+def run_all_analysis(df, n_jobs=1, use_cache=False, stats=None, chart_dir=None, shared_dir=None):
+    global CHART_DIR
+    if chart_dir is not None:
+        previous, CHART_DIR = CHART_DIR, chart_dir
+        try:
+            return run_all_analysis(df, n_jobs=n_jobs, use_cache=use_cache, stats=stats,
+                                    shared_dir=shared_dir)
+        finally:
+            CHART_DIR = previous
 
-    print("5. Phân phối Sleep Duration")
-    plot_sleep_duration_distribution(df)
+    from data_visualization.fused_stats import compute_fused_stats
+    if stats is None:
+        stats = compute_fused_stats(df)
+    print_analysis_report(stats)
 
-    print("6. Ma trận tương quan")
-    plot_correlation_matrix(df)
+    logger.info("\n===== VẼ BIỂU ĐỒ =====")
 
-    print("7. Ảnh hưởng CGPA đến Depression")
-    plot_cgpa_vs_depression(df)
+    tasks = CHART_TASKS
+    cache = None
+    if use_cache:
+        from data_visualization.chart_cache import ChartCache
+        cache = ChartCache(CHART_DIR)
+        tasks = filter_cached_charts(df, cache)
 
-    print("8. Đánh giá trầm cảm (CGPA_std vs Work/Study Hours_std)")
-    plot_depression_assessment_scatter(df)
+    # Biểu đồ dùng lại kết quả của bộ thống kê thay vì quét lại dữ liệu
+    from data_visualization.chart_cache import chart_columns
+    chart_kwargs = {
+        'plot_correlation_matrix': {'corr': stats.corr(chart_columns('plot_correlation_matrix', df))},
+    }
+    if n_jobs > 1 and tasks:
+        render_charts_parallel(df, n_jobs, tasks, chart_kwargs, shared_dir=shared_dir,
+                               strings_as_category=shared_dir is not None)
+    else:
+        for label, plot in tasks:
+            logger.info(label)
+            plot(df, **chart_kwargs.get(plot.__name__, {}))
 
-    print("9. Tương tác Giấc ngủ - Học/Làm - Trầm cảm")
-    plot_sleep_work_depression(df)
+    if cache is not None:
+        cache.save()
+        logger.info("Cache biểu đồ: %d dùng lại, %d vẽ mới", len(cache.hits), len(cache.misses))
 
-    print("\n✅ Hoàn thành quy trình phân tích!")
+    logger.info("\n✅ Hoàn thành quy trình phân tích!")
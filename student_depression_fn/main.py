@@ -1,13 +1,42 @@
-from data_cleaning.data_cleaner import run_full_cleaning
-from data_normalization.data_normalizer import normalize_dataset
-from data_visualization.visualization import run_all_analysis
-from storage.save_data import save_data
-def main():
+# Các module được import trong main() để `import main` (và cli.py) không phải
+# nạp pandas, seaborn, matplotlib khi chưa cần
+def main(incremental=False, profile_path=None, use_tracemalloc=False, use_cprofile=False, lazy=False,
+         log_level="INFO", overwrite=False):
+    # log_level="WARNING" bỏ qua cả log tiến trình lẫn các phép tính chỉ để chẩn đoán
+    from profiling.logger import configure_logging
+    configure_logging(log_level)
+    if profile_path is not None:
+        # Ghi thời gian/bộ nhớ từng bước ra JSON và in bảng tóm tắt cuối lần chạy
+        from profiling.stage_profiler import profiling
+        with profiling(profile_path, use_tracemalloc=use_tracemalloc, use_cprofile=use_cprofile):
+            return main(incremental=incremental, lazy=lazy, log_level=log_level, overwrite=overwrite)
+
     file_path = "data/student_depression_dataset.csv"
-    cleaned_data = run_full_cleaning(file_path)
-    normalized_cleaned_data = normalize_dataset(cleaned_data)
-    run_all_analysis(normalized_cleaned_data)
-    save_data(normalized_cleaned_data, "data/cleaned_student_depression_dataset.csv")
+    if incremental:
+        # Chỉ xử lý các id mới, dùng lại thống kê đã lưu trong data/state
+        from pipeline.incremental import run_incremental
+        # overwrite: ghi đè file đầu ra có sẵn khi chưa có trạng thái
+        state = run_incremental(file_path, "data/incremental_student_depression_dataset.csv",
+                                overwrite=overwrite)
+        print(state.crosstab_depression_academic_pressure())
+        print(state.group_by_gender_depression())
+        return
+    from data_visualization.visualization import run_all_analysis
+    from storage.async_writer import async_output
+    if lazy:
+        # Làm sạch + chuẩn hóa bằng một truy vấn lazy của polars (cần cài polars)
+        from pipeline.lazy_backend import run_lazy_pipeline
+        normalized_cleaned_data = run_lazy_pipeline(file_path)
+    else:
+        from data_cleaning.data_cleaner import run_full_cleaning
+        from data_normalization.data_normalizer import normalize_dataset
+        cleaned_data = run_full_cleaning(file_path)
+        normalized_cleaned_data = normalize_dataset(cleaned_data)
+    # Biểu đồ và file CSV được ghi ở luồng nền; ra khỏi khối with là điểm
+    # chờ mọi file ghi xong
+    with async_output() as writer:
+        writer.save_data(normalized_cleaned_data, "data/cleaned_student_depression_dataset.csv")
+        run_all_analysis(normalized_cleaned_data)
 
 if __name__ == "__main__":
     main()
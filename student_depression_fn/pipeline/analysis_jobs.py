@@ -0,0 +1,148 @@
+"""
+Chạy đồng thời nhiều job phân tích (run_all_analysis với các bộ lọc khác
+nhau) trên cùng một bộ dữ liệu đã làm sạch và chuẩn hóa.
+
+Bộ dữ liệu được ghi một lần ra thư mục các cột .npy kèm từ điển category
+(storage.shared_frame). Mỗi job là một tiến trình gắn vào thư mục đó bằng
+memory-map: các cột số và mã category dùng chung các trang của page cache,
+nên bộ nhớ gần như không tăng khi thêm job. Chỉ các dòng khớp bộ lọc của job
+được sao chép.
+
+Chạy từ thư mục student_depression_fn:
+    python -m pipeline.analysis_jobs --publish data/cleaned_student_depression_dataset.csv
+    python -m pipeline.analysis_jobs --job all --job "nu:Gender == 'Female'" \\
+        --job "tram_cam:Depression == 1 and `Sleep Duration` < 6" --jobs 3
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+from profiling.logger import get_logger
+from storage.shared_frame import attach_shared_frame, has_shared_frame, write_shared_frame
+
+DEFAULT_SHARED_DIR = "data/shared"
+DEFAULT_CHART_ROOT = "chart/jobs"
+REPORT_FILE = "report.txt"
+SUMMARY_FILE = "jobs_summary.csv"
+# Thống kê được cộng dồn theo khối để không tạo ma trận float64 của cả bảng
+STATS_CHUNKSIZE = 100_000
+
+logger = get_logger(__name__)
+
+
+#Hàm ghi bộ dữ liệu dùng chung một lần cho mọi job
+def publish_dataset(df, shared_dir=DEFAULT_SHARED_DIR):
+    write_shared_frame(df, shared_dir)
+    logger.info("✅ Đã ghi bộ dữ liệu dùng chung: %d bản ghi → %s", len(df), shared_dir)
+    return shared_dir
+
+
+#Hàm đọc mô tả job dạng "tên:biểu thức lọc" (không có ':' thì không lọc)
+def parse_job(spec):
+    name, _, query = spec.partition(":")
+    return {'name': name.strip(), 'query': query.strip() or None}
+
+
+#Hàm chạy một job phân tích trong worker
+def run_analysis_job(name, query=None, shared_dir=DEFAULT_SHARED_DIR, chart_root=DEFAULT_CHART_ROOT,
+                     n_jobs=1, use_cache=False):
+    """
+    Gắn vào bộ dữ liệu dùng chung, lọc theo query (cú pháp DataFrame.query,
+    tên cột có khoảng trắng đặt trong dấu `), rồi chạy run_all_analysis.
+    Báo cáo in ra được ghi vào {chart_root}/{name}/report.txt, biểu đồ vào
+    cùng thư mục.
+
+    Returns:
+    --------
+    dict gồm name, query, rows, chart_dir, seconds và error (None nếu thành công)
+    """
+    from data_visualization.fused_stats import compute_fused_stats
+    from data_visualization.visualization import run_all_analysis
+
+    start = time.perf_counter()
+    chart_dir = os.path.join(chart_root, name)
+    result = {'name': name, 'query': query, 'rows': 0, 'chart_dir': chart_dir,
+              'seconds': 0.0, 'error': None}
+    try:
+        df = attach_shared_frame(shared_dir, strings_as_category=True)
+        if query is not None:
+            df = df.query(query)
+        if len(df) == 0:
+            raise ValueError("không có bản ghi nào khớp bộ lọc")
+        result['rows'] = len(df)
+        stats = compute_fused_stats(df, chunksize=STATS_CHUNKSIZE)
+        os.makedirs(chart_dir, exist_ok=True)
+        with open(os.path.join(chart_dir, REPORT_FILE), 'w', encoding='utf-8') as f, redirect_stdout(f):
+            # Không lọc: worker vẽ gắn lại thẳng bộ dữ liệu dùng chung
+            run_all_analysis(df, n_jobs=n_jobs, use_cache=use_cache, stats=stats, chart_dir=chart_dir,
+                             shared_dir=shared_dir if query is None else None)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+#Hàm chạy đồng thời các job phân tích
+def run_analysis_jobs(jobs, shared_dir=DEFAULT_SHARED_DIR, chart_root=DEFAULT_CHART_ROOT,
+                      max_workers=None, use_cache=False):
+    """
+    jobs : list các dict {'name': ..., 'query': ...} (xem parse_job)
+    max_workers : số job chạy cùng lúc (mặc định: số CPU)
+
+    Returns:
+    --------
+    DataFrame tóm tắt theo job
+    """
+    if not has_shared_frame(shared_dir):
+        raise FileNotFoundError(f"❌ Chưa có bộ dữ liệu dùng chung trong {shared_dir}, "
+                                f"hãy chạy publish_dataset trước")
+    names = [job['name'] for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("❌ Tên các job phải khác nhau (mỗi job một thư mục biểu đồ)")
+    max_workers = max_workers or os.cpu_count() or 1
+    logger.info("Bắt đầu %d job phân tích trên %d tiến trình...", len(jobs), max_workers)
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(run_analysis_job, job['name'], job.get('query'), shared_dir,
+                               chart_root, 1, use_cache) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            if result['error'] is None:
+                logger.info("✅ %s: %d bản ghi → %s (%ss)", result['name'], result['rows'],
+                            result['chart_dir'], result['seconds'])
+            else:
+                logger.warning("❌ %s: %s", result['name'], result['error'])
+            rows.append(result)
+
+    summary = pd.DataFrame(rows).set_index('name').loc[names].reset_index()
+    os.makedirs(chart_root, exist_ok=True)
+    summary.to_csv(os.path.join(chart_root, SUMMARY_FILE), index=False)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chạy nhiều job phân tích trên bộ dữ liệu dùng chung")
+    parser.add_argument('--publish', default=None,
+                        help="Ghi file đã chuẩn hóa (.csv, .parquet, .feather) thành bộ dữ liệu dùng chung")
+    parser.add_argument('--job', action='append', default=[],
+                        help="'tên:biểu thức lọc' theo cú pháp DataFrame.query, có thể lặp lại")
+    parser.add_argument('--shared-dir', default=DEFAULT_SHARED_DIR)
+    parser.add_argument('--chart-root', default=DEFAULT_CHART_ROOT)
+    parser.add_argument('--jobs', type=int, default=None, help="Số job chạy cùng lúc")
+    parser.add_argument('--cache', action='store_true', help="Bỏ qua biểu đồ có dữ liệu không đổi")
+    parser.add_argument('--log-level', default="INFO")
+    args = parser.parse_args()
+
+    from profiling.logger import configure_logging
+    configure_logging(args.log_level)
+    if args.publish:
+        from storage.save_data import load_data
+        publish_dataset(load_data(args.publish), args.shared_dir)
+    if args.job:
+        run_analysis_jobs([parse_job(spec) for spec in args.job], shared_dir=args.shared_dir,
+                          chart_root=args.chart_root, max_workers=args.jobs, use_cache=args.cache)
@@ -0,0 +1,164 @@
+"""
+Xử lý theo lô nhiều file export (mỗi trường / mỗi học kỳ một file) trong
+một process pool, thay cho việc gọi main.py lần lượt cho từng file.
+
+Mỗi worker xử lý trọn một file với bộ nhớ giới hạn:
+1. Làm sạch theo chunk (iter_cleaned_chunks) và fit FittedNormalizer trong
+   một lượt qua các chunk (fit_batches)
+2. Làm sạch lại theo chunk, chuẩn hóa từng chunk, nối vào file đầu ra và
+   cộng dồn thống kê báo cáo (FusedStatsAccumulator)
+Tiến trình chính gộp thống kê của các file thành một báo cáo chung.
+
+Chạy từ thư mục student_depression_fn:
+    python -m pipeline.batch "data/exports/*.csv" --output-dir data/batch --jobs 4
+"""
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from data_cleaning.chunked_cleaner import (
+    DEFAULT_MEMORY_LIMIT_MB,
+    compute_global_medians,
+    empty_cleaned_frame,
+    estimate_chunksize,
+    iter_cleaned_chunks,
+)
+from data_normalization.fitted_normalizer import FittedNormalizer
+from data_visualization.fused_stats import FusedStatsAccumulator
+from profiling.logger import get_logger
+from storage.save_data import atomic_output
+
+DEFAULT_OUTPUT_DIR = "data/batch"
+SUMMARY_FILE = "batch_summary.csv"
+# Mỗi worker được thay mới sau số file này để trả lại bộ nhớ bị phân mảnh
+DEFAULT_MAX_TASKS_PER_CHILD = 20
+
+logger = get_logger(__name__)
+
+
+#Hàm liệt kê các file đầu vào từ thư mục hoặc mẫu glob
+def resolve_inputs(path_or_glob):
+    if os.path.isdir(path_or_glob):
+        pattern = os.path.join(path_or_glob, "*.csv")
+    else:
+        pattern = path_or_glob
+    return sorted(glob.glob(pattern))
+
+
+def _output_path(file_path, output_dir):
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(output_dir, f"{stem}_normalized.csv")
+
+
+#Hàm xử lý một file trong worker
+def process_file(file_path, output_dir=DEFAULT_OUTPUT_DIR, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB):
+    """
+    Làm sạch và chuẩn hóa một file theo chunk, ghi kết quả ra output_dir.
+    Median và số dòng mỗi chunk được tính một lần rồi dùng cho cả lượt fit
+    lẫn lượt ghi; file kết quả được ghi nguyên tử (atomic_output).
+
+    Returns:
+    --------
+    dict gồm file, output, rows, seconds, stats (FusedStatsAccumulator) và
+    error (None nếu thành công)
+    """
+    start = time.perf_counter()
+    result = {'file': file_path, 'output': None, 'rows': 0, 'seconds': 0.0,
+              'stats': None, 'error': None}
+    try:
+        chunksize = estimate_chunksize(file_path, memory_limit_mb)
+        medians, _ = compute_global_medians(file_path, chunksize)
+        normalizer = FittedNormalizer().fit_batches(
+            iter_cleaned_chunks(file_path, medians=medians, chunksize=chunksize))
+        empty = None
+        if normalizer.stats['n_rows'] == 0:
+            # Không có dòng nào: fit trên bảng rỗng để vẫn có đủ cột cho dòng tiêu đề
+            empty = empty_cleaned_frame(file_path, medians)
+            normalizer.fit_batches([empty])
+        stats = FusedStatsAccumulator()
+        output_path = _output_path(file_path, output_dir)
+        with atomic_output(output_path) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+                chunks = iter_cleaned_chunks(file_path, medians=medians, chunksize=chunksize)
+                for i, chunk in enumerate(normalizer.transform_batches(chunks)):
+                    chunk.to_csv(f, index=False, header=(i == 0))
+                    stats.update(chunk)
+                    result['rows'] += len(chunk)
+                if empty is not None:
+                    normalizer.transform(empty).to_csv(f, index=False)
+        result.update(output=output_path, stats=stats)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+#Hàm chạy pipeline cho toàn bộ các file
+def run_batch(path_or_glob, output_dir=DEFAULT_OUTPUT_DIR, n_jobs=None,
+              memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, max_tasks_per_child=DEFAULT_MAX_TASKS_PER_CHILD):
+    """
+    Xử lý mọi file khớp path_or_glob song song trên n_jobs tiến trình
+    (mặc định: số CPU), mỗi tiến trình dùng tối đa khoảng memory_limit_mb
+    cho mỗi chunk.
+
+    Returns:
+    --------
+    (DataFrame tóm tắt theo file, FusedStatsAccumulator đã gộp)
+    """
+    files = resolve_inputs(path_or_glob)
+    if not files:
+        raise FileNotFoundError(f"❌ Không tìm thấy file nào khớp: {path_or_glob}")
+    os.makedirs(output_dir, exist_ok=True)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    logger.info("Bắt đầu xử lý %d file trên %d tiến trình...", len(files), n_jobs)
+
+    combined = FusedStatsAccumulator()
+    rows = []
+    with ProcessPoolExecutor(max_workers=n_jobs, max_tasks_per_child=max_tasks_per_child) as pool:
+        futures = [pool.submit(process_file, path, output_dir, memory_limit_mb) for path in files]
+        for future in as_completed(futures):
+            result = future.result()
+            if result['error'] is None:
+                try:
+                    combined.merge(result['stats'])
+                except ValueError as e:
+                    # Ví dụ một file có std = 0 nên thiếu cột {col}_std
+                    result['error'] = str(e)
+            if result['error'] is None:
+                logger.info("✅ %s: %d bản ghi (%ss)", result['file'], result['rows'], result['seconds'])
+            else:
+                logger.warning("❌ %s: %s", result['file'], result['error'])
+            rows.append({key: value for key, value in result.items() if key != 'stats'})
+
+    summary = pd.DataFrame(rows).sort_values('file', ignore_index=True)
+    summary_path = os.path.join(output_dir, SUMMARY_FILE)
+    summary.to_csv(summary_path, index=False)
+    n_failed = int(summary['error'].notna().sum())
+    logger.info("\n✅ Hoàn thành: %d/%d file, %d bản ghi → %s (tóm tắt: %s)", len(files) - n_failed,
+                len(files), int(summary['rows'].sum()), output_dir, summary_path)
+    return summary, combined
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Làm sạch và chuẩn hóa nhiều file song song")
+    parser.add_argument('inputs', help="Thư mục chứa các file CSV hoặc mẫu glob")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--memory-limit-mb', type=int, default=DEFAULT_MEMORY_LIMIT_MB)
+    parser.add_argument('--max-tasks-per-child', type=int, default=DEFAULT_MAX_TASKS_PER_CHILD)
+    parser.add_argument('--log-level', default="INFO")
+    args = parser.parse_args()
+
+    from profiling.logger import configure_logging
+    configure_logging(args.log_level)
+    _, combined = run_batch(args.inputs, output_dir=args.output_dir, n_jobs=args.jobs,
+                            memory_limit_mb=args.memory_limit_mb,
+                            max_tasks_per_child=args.max_tasks_per_child)
+    if combined.n_rows:
+        from data_visualization.visualization import print_analysis_report
+        print("\n===== BÁO CÁO GỘP =====")
+        print_analysis_report(combined)
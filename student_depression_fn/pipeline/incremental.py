@@ -0,0 +1,270 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning.chunked_cleaner import (
+    DEFAULT_MEMORY_LIMIT_MB,
+    StreamingMedian,
+    clean_chunk,
+    estimate_chunksize,
+    iter_csv_chunks,
+)
+from data_cleaning.data_cleaner import filter_age_18_25, extract_hours_vectorized
+from data_normalization.fitted_normalizer import FittedNormalizer
+from profiling.logger import get_logger
+from storage.save_data import atomic_output
+
+DEFAULT_STATE_DIR = "data/state"
+# Trạng thái cũ (trước khi có generation) dùng processed_ids.npy
+PROCESSED_IDS_FILE = "processed_ids.npy"
+CLEANING_STATS_FILE = "cleaning_stats.json"
+NORMALIZER_FILE = "normalizer.json"
+AGGREGATES_FILE = "aggregates.json"
+
+logger = get_logger(__name__)
+
+
+class IncrementalState:
+    """
+    Trạng thái được lưu giữa các lần chạy tăng dần trong state_dir:
+    - processed_ids.<generation>.npy: các id đã xử lý (đã sắp xếp)
+    - cleaning_stats.json: median dùng để điền giá trị thiếu khi làm sạch
+    - normalizer.json: thống kê của FittedNormalizer
+    - aggregates.json: tổng tích lũy của bảng chéo Depression x Academic
+      Pressure và tổng/số lượng Depression theo Gender, kèm generation và
+      output_bytes (kích thước file đầu ra đã ghi nhận)
+
+    aggregates.json được ghi sau cùng và là điểm chốt của một lần lưu: nó
+    trỏ tới file id của đúng generation, nên dừng giữa chừng khi đang lưu
+    thì lần chạy sau vẫn đọc được trạng thái cũ trọn vẹn. Các dòng đã nối
+    vào file đầu ra sau output_bytes chưa được chốt và bị cắt bỏ ở lần chạy
+    sau (xem truncate_uncommitted), nên không dòng nào bị nối hai lần.
+    """
+
+    def __init__(self, state_dir=DEFAULT_STATE_DIR):
+        self.state_dir = state_dir
+        self.processed_ids = np.array([], dtype='int64')
+        self.medians = None
+        self.normalizer = None
+        self.crosstab_counts = {}
+        self.gender_totals = {}
+        self.generation = 0
+        # Kích thước file đầu ra đã chốt; None khi chưa có trạng thái đã lưu
+        # (hoặc trạng thái cũ không ghi output_bytes)
+        self.output_bytes = None
+
+    def _path(self, name):
+        return os.path.join(self.state_dir, name)
+
+    def _ids_file(self, generation):
+        return PROCESSED_IDS_FILE if generation == 0 else f"processed_ids.{generation}.npy"
+
+    @property
+    def is_initialized(self):
+        return self.normalizer is not None
+
+    @classmethod
+    def load(cls, state_dir=DEFAULT_STATE_DIR):
+        state = cls(state_dir)
+        if not os.path.exists(state._path(AGGREGATES_FILE)):
+            return state
+        with open(state._path(AGGREGATES_FILE), encoding='utf-8') as f:
+            aggregates = json.load(f)
+        state.generation = aggregates.get('generation', 0)
+        # Trạng thái cũ không ghi output_bytes: không cắt file đầu ra
+        state.output_bytes = aggregates.get('output_bytes')
+        state.processed_ids = np.load(state._path(state._ids_file(state.generation)))
+        with open(state._path(CLEANING_STATS_FILE), encoding='utf-8') as f:
+            state.medians = json.load(f)
+        state.normalizer = FittedNormalizer.load(state._path(NORMALIZER_FILE))
+        state.crosstab_counts = {(dep, pressure): count
+                                 for dep, pressure, count in aggregates['crosstab']}
+        state.gender_totals = {gender: (total, count)
+                               for gender, total, count in aggregates['gender']}
+        return state
+
+    def save(self, output_bytes=None):
+        """
+        Lưu trạng thái; output_bytes là kích thước file đầu ra (đã fsync)
+        tương ứng với trạng thái này
+        """
+        os.makedirs(self.state_dir, exist_ok=True)
+        previous_ids_file = self._ids_file(self.generation)
+        generation = self.generation + 1
+        with atomic_output(self._path(self._ids_file(generation))) as tmp_path:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, self.processed_ids)
+        with atomic_output(self._path(CLEANING_STATS_FILE)) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.medians, f)
+        with atomic_output(self._path(NORMALIZER_FILE)) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.normalizer.stats, f, ensure_ascii=False, indent=2)
+        aggregates = {
+            'generation': generation,
+            'output_bytes': output_bytes,
+            'crosstab': [[dep, pressure, count]
+                         for (dep, pressure), count in self.crosstab_counts.items()],
+            'gender': [[gender, total, count]
+                       for gender, (total, count) in self.gender_totals.items()],
+        }
+        # Điểm chốt: từ đây lần chạy sau đọc generation mới
+        with atomic_output(self._path(AGGREGATES_FILE)) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(aggregates, f, ensure_ascii=False)
+        self.generation = generation
+        self.output_bytes = output_bytes
+        if os.path.exists(self._path(previous_ids_file)):
+            os.remove(self._path(previous_ids_file))
+
+    def update_aggregates(self, df):
+        """Cộng dồn bảng chéo và tỷ lệ trầm cảm theo giới tính của các dòng mới"""
+        pairs = df.groupby(['Depression', 'Academic Pressure'], observed=True).size()
+        for (dep, pressure), count in pairs.items():
+            key = (int(dep), float(pressure))
+            self.crosstab_counts[key] = self.crosstab_counts.get(key, 0) + int(count)
+
+        by_gender = df.groupby('Gender', observed=True)['Depression'].agg(['sum', 'count'])
+        for gender, row in by_gender.iterrows():
+            total, count = self.gender_totals.get(str(gender), (0, 0))
+            self.gender_totals[str(gender)] = (total + int(row['sum']), count + int(row['count']))
+
+    def crosstab_depression_academic_pressure(self):
+        """Kết quả giống crosstab_depression_academic_pressure trên toàn bộ dữ liệu"""
+        if not self.crosstab_counts:
+            return pd.DataFrame()
+        counts = pd.Series(self.crosstab_counts)
+        counts.index.names = ['Depression', 'Academic Pressure']
+        return counts.unstack(fill_value=0).sort_index().sort_index(axis=1)
+
+    def group_by_gender_depression(self):
+        """Kết quả giống group_by_gender_depression trên toàn bộ dữ liệu"""
+        means = {gender: total / count for gender, (total, count) in self.gender_totals.items()}
+        result = pd.Series(means, name='Depression', dtype='float64').sort_index()
+        result.index.name = 'Gender'
+        return result
+
+
+#Hàm đọc các dòng chưa được xử lý
+def iter_new_rows(file_path, processed_ids, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB):
+    """Đọc file gốc theo chunk và sinh ra phần các dòng có id chưa xử lý của từng chunk"""
+    chunksize = estimate_chunksize(file_path, memory_limit_mb)
+    for chunk in iter_csv_chunks(file_path, chunksize):
+        is_new = ~np.isin(chunk['id'].to_numpy(), processed_ids, assume_unique=False)
+        if is_new.any():
+            yield chunk[is_new]
+
+
+#Hàm cắt bỏ phần file đầu ra chưa được chốt trong trạng thái
+def truncate_uncommitted(output_path, committed_bytes):
+    """
+    Các dòng nối vào sau committed_bytes thuộc một lần chạy bị dừng trước
+    khi lưu trạng thái; các id đó chưa được ghi nhận nên sẽ được xử lý lại
+    """
+    if committed_bytes is None or not os.path.exists(output_path):
+        return
+    size = os.path.getsize(output_path)
+    if size > committed_bytes:
+        with open(output_path, 'r+b') as f:
+            f.truncate(committed_bytes)
+            os.fsync(f.fileno())
+        logger.warning("⚠️  Đã cắt %d byte chưa được chốt ở cuối %s", size - committed_bytes, output_path)
+
+
+#Lần chạy đầu: tính median và fit FittedNormalizer trên các dòng mới
+def fit_first_run(file_path, state, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, age_column='Age'):
+    """
+    Hai lượt theo chunk: median Sleep Duration (StreamingMedian) rồi
+    FittedNormalizer.fit_batches trên các chunk đã làm sạch.
+    Trả về False nếu không có dòng nào trong độ tuổi 18-25.
+    """
+    accumulator = StreamingMedian()
+    n_filtered = 0
+    for chunk in iter_new_rows(file_path, state.processed_ids, memory_limit_mb):
+        filtered = filter_age_18_25(chunk, age_column=age_column, verbose=False)
+        n_filtered += len(filtered)
+        accumulator.update(extract_hours_vectorized(filtered['Sleep Duration']))
+    if n_filtered == 0:
+        return False
+    state.medians = {'Sleep Duration': float(accumulator.median())}
+    cleaned = (clean_chunk(chunk, state.medians, age_column=age_column)
+               for chunk in iter_new_rows(file_path, state.processed_ids, memory_limit_mb))
+    state.normalizer = FittedNormalizer().fit_batches(chunk for chunk in cleaned if chunk is not None)
+    return True
+
+
+#Hàm chạy pipeline tăng dần
+def run_incremental(file_path, output_path, state_dir=DEFAULT_STATE_DIR,
+                    memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, age_column='Age', overwrite=False):
+    """
+    Chỉ làm sạch và chuẩn hóa các dòng có id mới, nối vào file đầu ra và
+    cập nhật các tổng tích lũy. Các dòng mới được xử lý theo từng chunk.
+
+    Lần chạy đầu (chưa có trạng thái) xử lý toàn bộ file, tính median và
+    fit FittedNormalizer; các lần sau dùng lại các thống kê đã lưu.
+
+    File đầu ra được fsync trước khi lưu trạng thái; nếu bị dừng giữa hai
+    bước, lần chạy sau cắt các dòng chưa chốt rồi xử lý lại chúng.
+
+    overwrite : bool
+        Lần chạy đầu mà output_path đã có nội dung (không thuộc trạng thái
+        nào, ví dụ file xuất của pipeline đầy đủ): mặc định báo lỗi
+        FileExistsError, True thì ghi đè
+
+    Returns:
+    --------
+    IncrementalState sau khi cập nhật
+    """
+    state = IncrementalState.load(state_dir)
+    first_run = not state.is_initialized
+    logger.info("Bắt đầu xử lý tăng dần (%s)...",
+                'lần đầu' if first_run else f'{len(state.processed_ids)} id đã xử lý')
+    has_output = os.path.exists(output_path) and os.path.getsize(output_path) > 0
+    if first_run and has_output and not overwrite:
+        raise FileExistsError(f"❌ {output_path} đã tồn tại nhưng chưa có trạng thái trong {state_dir}; "
+                              f"dùng overwrite=True (--overwrite) để ghi đè")
+    if not first_run:
+        truncate_uncommitted(output_path, state.output_bytes)
+
+    if first_run and not fit_first_run(file_path, state, memory_limit_mb, age_column=age_column):
+        logger.warning("✗ Không có dòng nào trong độ tuổi 18-25 để fit thống kê chuẩn hóa")
+        return state
+    if first_run and has_output:
+        logger.warning("⚠️  Ghi đè %s", output_path)
+        open(output_path, 'wb').close()
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    n_new = 0
+    n_written = 0
+    new_ids = []
+    with open(output_path, 'ab') as f:
+        for chunk in iter_new_rows(file_path, state.processed_ids, memory_limit_mb):
+            n_new += len(chunk)
+            new_ids.append(chunk['id'].to_numpy())
+            cleaned = clean_chunk(chunk, state.medians, age_column=age_column)
+            if cleaned is None:
+                continue
+            normalized = state.normalizer.transform(cleaned)
+            # BOM utf-8 chỉ ở đầu file mới, như to_csv(encoding='utf-8-sig')
+            encoding = 'utf-8-sig' if f.tell() == 0 else 'utf-8'
+            f.write(normalized.to_csv(index=False, header=f.tell() == 0).encode(encoding))
+            state.update_aggregates(normalized)
+            n_written += len(normalized)
+        f.flush()
+        os.fsync(f.fileno())
+        output_bytes = f.tell()
+
+    if n_new == 0:
+        logger.info("✅ Không có dòng mới")
+        return state
+    logger.info("   - Số dòng mới: %d", n_new)
+    logger.info("   - Đã nối %d dòng vào: %s", n_written, output_path)
+
+    state.processed_ids = np.union1d(state.processed_ids, np.concatenate(new_ids))
+    state.save(output_bytes=output_bytes)
+    logger.info("✅ Hoàn thành xử lý tăng dần")
+    return state
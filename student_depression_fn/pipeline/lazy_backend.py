@@ -0,0 +1,302 @@
+"""
+Backend thực thi lazy (polars) cho toàn bộ pipeline làm sạch → chuẩn hóa →
+tổng hợp.
+
+Thay vì chạy từng hàm trên DataFrame pandas đã nằm trong bộ nhớ, các bước
+được dựng thành một truy vấn lazy trên file CSV. polars tối ưu truy vấn
+trước khi chạy:
+- predicate pushdown: bộ lọc tuổi 18-25 được đẩy xuống lúc đọc file
+- projection pushdown: chỉ đọc các cột mà kết quả thực sự cần
+rồi thực thi trên engine streaming đa luồng, không giữ toàn bộ file trong RAM.
+
+Kết quả giống run_full_cleaning + normalize_dataset (các cột category có
+cùng thứ tự category khi chuyển về pandas).
+
+polars là phụ thuộc tùy chọn: pip install polars
+"""
+import numpy as np
+import pandas as pd
+
+from data_loading.schema import STUDENT_DEPRESSION_SCHEMA
+from data_normalization.data_normalizer import (
+    SLEEP_MAP,
+    DIET_MAP,
+    PRESSURE_MAP,
+    STRESS_MAP,
+    YESNO_MAP,
+)
+from data_normalization.fitted_normalizer import STATS_VERSION
+from data_normalization.normalization_plan import NUMERIC_COLS, YESNO_COLS
+from profiling.logger import get_logger
+
+# Cùng biểu thức với extract_hours
+HOURS_PATTERN = r"(\d+(\.\d+)?)"
+
+logger = get_logger(__name__)
+
+
+def _require_polars():
+    try:
+        import polars as pl
+    except ImportError:
+        raise ImportError("❌ Backend lazy cần cài polars: pip install polars")
+    return pl
+
+
+def _polars_schema(pl):
+    """STUDENT_DEPRESSION_SCHEMA theo kiểu của polars (chuỗi đọc dạng String)"""
+    dtypes = {
+        'int32': pl.Int32,
+        'float32': pl.Float32,
+        'category': pl.String,
+        # Depression được ghi 0/1 trong file
+        'bool': pl.Int8,
+    }
+    return {col: dtypes[dtype] for col, dtype in STUDENT_DEPRESSION_SCHEMA.items()}
+
+
+#Hàm mở file CSV dưới dạng LazyFrame
+def scan_dataset(file_path):
+    pl = _require_polars()
+    return pl.scan_csv(file_path, schema_overrides=_polars_schema(pl))
+
+
+def _extract_hours(pl):
+    # Sleep Duration gốc: "'5-6 hours'" → 5.0, 'Others' / thiếu → null
+    return (pl.col('Sleep Duration').str.extract(HOURS_PATTERN, 1)
+            .cast(pl.Float64))
+
+
+def _map_values(expr, mapping, pl, default=None, dtype=None):
+    """Giống Series.map(mapping), giá trị không có trong mapping → default"""
+    dtype = pl.Float64 if dtype is None else dtype
+    new = pl.Series(list(mapping.values()), dtype=dtype, strict=False)
+    return expr.replace_strict(list(mapping), new, default=default, return_dtype=dtype)
+
+
+def _map_string(expr, mapping, default, pl):
+    """Giống Series.astype(str).str.strip().map(mapping).fillna(default)"""
+    return _map_values(expr.cast(pl.String).str.strip_chars(), mapping, pl,
+                       default=default).fill_null(default)
+
+
+def _encoded_numeric(col, pl):
+    """Cột số sau bước mã hóa 0 của normalize_dataset"""
+    if col == 'Academic Pressure':
+        return _map_string(pl.col(col), PRESSURE_MAP, 2, pl)
+    if col == 'Financial Stress':
+        return _map_string(pl.col(col), STRESS_MAP, 0, pl)
+    return pl.col(col)
+
+
+#Hàm dựng các bước làm sạch
+def lazy_cleaning(lf, sleep_median, age_column='Age'):
+    """
+    Các bước của run_full_cleaning dưới dạng biểu thức lazy (bỏ qua các bước
+    chỉ để hiển thị).
+
+    sleep_median : float
+        Median của Sleep Duration (số giờ) trên dữ liệu đã lọc tuổi, dùng để
+        điền giá trị thiếu (xem fit_lazy_stats)
+    """
+    pl = _require_polars()
+    schema = lf.collect_schema()
+    text_cols = [col for col, dtype in schema.items() if dtype == pl.String]
+    lf = lf.filter(pl.col(age_column).is_between(18, 25))
+    # Như clean_apostrophe: mọi cột chuỗi được xóa dấu ' và chuyển sang category
+    return lf.with_columns(
+        [pl.col(col).str.replace_all("'", "", literal=True).cast(pl.Categorical)
+         for col in text_cols if col != 'Sleep Duration']
+        + [pl.col('Depression').cast(pl.Int8),
+           _extract_hours(pl).fill_null(sleep_median).alias('Sleep Duration')]
+    )
+
+
+#Hàm tính thống kê cần cho làm sạch và chuẩn hóa trong một lượt đọc
+def fit_lazy_stats(lf, age_column='Age', minmax_cols=()):
+    """
+    Một truy vấn tổng hợp duy nhất (chỉ đọc các cột cần thiết) trả về:
+    - medians: {'Sleep Duration': median} cho bước điền giá trị thiếu
+    - stats: thống kê chuẩn hóa cùng định dạng với FittedNormalizer.stats
+    """
+    pl = _require_polars()
+    schema = lf.collect_schema()
+    numeric_cols = [col for col in NUMERIC_COLS if col in schema]
+    filtered = lf.filter(pl.col(age_column).is_between(18, 25))
+
+    hours = _extract_hours(pl)
+    filled_hours = hours.fill_null(hours.median())
+    sleep_hours = _map_values(filled_hours.cast(pl.String), SLEEP_MAP, pl)
+
+    aggregations = [pl.len().alias('n_rows'),
+                    hours.median().alias('sleep_median'),
+                    sleep_hours.mean().alias('sleep_hours_mean')]
+    for col in numeric_cols:
+        encoded = _encoded_numeric(col, pl)
+        # median trước, sau đó mean/std/min/max trên dữ liệu đã điền median
+        filled = encoded.fill_null(encoded.median())
+        aggregations += [encoded.median().alias(f'{col}|median'),
+                         filled.mean().alias(f'{col}|mean'),
+                         filled.std().alias(f'{col}|std'),
+                         filled.min().alias(f'{col}|min'),
+                         filled.max().alias(f'{col}|max')]
+    row = filtered.select(aggregations).collect(engine='streaming').row(0, named=True)
+
+    def _float(value):
+        return float('nan') if value is None else float(value)
+
+    stats = {
+        'version': STATS_VERSION,
+        'n_rows': int(row['n_rows']),
+        'columns': {col: {name: _float(row[f'{col}|{name}'])
+                          for name in ('median', 'mean', 'std', 'min', 'max')}
+                    for col in numeric_cols},
+        'sleep_hours_mean': _float(row['sleep_hours_mean']),
+        'minmax_cols': list(minmax_cols),
+    }
+    return {'Sleep Duration': _float(row['sleep_median'])}, stats
+
+
+#Hàm dựng các bước chuẩn hóa
+def lazy_normalization(lf, stats):
+    """
+    Các bước của normalize_dataset với thống kê đã tính trước (stats theo
+    định dạng FittedNormalizer). Như normalize_dataset, cột {col}_std chỉ
+    được tạo khi std > 0.
+    """
+    pl = _require_polars()
+    schema = lf.collect_schema()
+    columns = stats['columns']
+    exprs = []
+    for col in NUMERIC_COLS:
+        if col not in columns:
+            continue
+        col_stats = columns[col]
+        filled = _encoded_numeric(col, pl).fill_null(col_stats['median'])
+        # Cột số giữ kiểu gốc (float32) như khi fillna trên pandas
+        if col not in ('Academic Pressure', 'Financial Stress'):
+            filled = filled.cast(schema[col])
+        exprs.append(filled.alias(col))
+        if col_stats['std'] > 0:
+            exprs.append(((filled - col_stats['mean']) / col_stats['std'])
+                         .cast(_output_dtype(col, schema, pl)).alias(f'{col}_std'))
+        if col in stats.get('minmax_cols', ()) and col_stats['max'] > col_stats['min']:
+            exprs.append(((filled - col_stats['min']) / (col_stats['max'] - col_stats['min']))
+                         .cast(_output_dtype(col, schema, pl)).alias(f'{col}_norm'))
+
+    for col in YESNO_COLS:
+        if col in schema:
+            # thiếu → 'Nan' → 'No' → 0, giá trị không hợp lệ → 0
+            yesno = pl.col(col).cast(pl.String).str.strip_chars().str.to_titlecase()
+            exprs.append(_map_values(yesno, YESNO_MAP, pl, default=0, dtype=pl.Int64)
+                         .fill_null(0).alias(col))
+
+    if 'Sleep Duration' in schema:
+        sleep = pl.col('Sleep Duration').cast(pl.String).str.strip_chars()
+        exprs += [sleep.alias('Sleep Duration'),
+                  _map_values(sleep, SLEEP_MAP, pl).fill_null(stats['sleep_hours_mean'])
+                  .alias('sleep_hours')]
+    if 'Dietary Habits' in schema:
+        exprs.append(_map_values(pl.col('Dietary Habits').cast(pl.String), DIET_MAP, pl)
+                     .alias('diet_score'))
+    return lf.with_columns(exprs)
+
+
+def _output_dtype(col, schema, pl):
+    """Kiểu của cột _std/_norm: float32 cho cột số gốc, float64 cho cột đã mã hóa"""
+    if col in ('Academic Pressure', 'Financial Stress'):
+        return pl.Float64
+    return schema[col]
+
+
+#Hàm dựng toàn bộ truy vấn lazy
+def build_lazy_pipeline(file_path, columns=None, stats=None, medians=None, age_column='Age'):
+    """
+    Dựng truy vấn làm sạch → chuẩn hóa trên file CSV, chưa đọc dữ liệu
+    (trừ một lượt tổng hợp để tính thống kê nếu chưa được truyền vào).
+
+    columns : list, optional
+        Chỉ giữ các cột này ở kết quả; nhờ projection pushdown các cột
+        khác không được đọc từ file
+
+    Returns:
+    --------
+    (LazyFrame, medians, stats)
+    """
+    lf = scan_dataset(file_path)
+    if stats is None or medians is None:
+        medians, stats = fit_lazy_stats(lf, age_column=age_column)
+    plan = lazy_normalization(lazy_cleaning(lf, medians['Sleep Duration'], age_column=age_column),
+                              stats)
+    if columns is not None:
+        plan = plan.select(columns)
+    return plan, medians, stats
+
+
+def _to_pandas(frame):
+    """Chuyển kết quả polars về pandas, category được sắp xếp như astype('category')"""
+    pl = _require_polars()
+    data = {}
+    for name, series in zip(frame.columns, frame.get_columns()):
+        if series.dtype == pl.Categorical:
+            values = series.cast(pl.String).to_numpy()
+            data[name] = pd.Categorical(values)
+        elif series.dtype == pl.String:
+            data[name] = pd.Series(series.to_numpy(), dtype='str')
+        else:
+            data[name] = series.to_numpy()
+    return pd.DataFrame(data)
+
+
+#Hàm chạy pipeline bằng backend lazy
+def run_lazy_pipeline(file_path, columns=None, output_path=None, age_column='Age'):
+    """
+    Chạy truy vấn lazy trên engine streaming của polars.
+
+    output_path : str, optional
+        Nếu có, kết quả được ghi thẳng ra file (.parquet hoặc .csv) theo từng
+        lô mà không giữ trong bộ nhớ; trả về đường dẫn file.
+        Nếu không, trả về DataFrame pandas.
+    """
+    _require_polars()
+    logger.info("Bắt đầu pipeline lazy (polars)...")
+    plan, medians, stats = build_lazy_pipeline(file_path, columns=columns, age_column=age_column)
+    logger.info("   - Số bản ghi sau lọc tuổi: %d", stats['n_rows'])
+    logger.info("   - Median Sleep Duration: %s", medians['Sleep Duration'])
+    if output_path is not None:
+        if output_path.endswith('.parquet'):
+            plan.sink_parquet(output_path)
+        else:
+            plan.sink_csv(output_path)
+        logger.info("✅ Hoàn thành pipeline lazy → %s", output_path)
+        return output_path
+    result = _to_pandas(plan.collect(engine='streaming'))
+    logger.info("✅ Hoàn thành pipeline lazy (%d bản ghi)", len(result))
+    return result
+
+
+#Hàm tính các bảng tổng hợp của run_all_analysis bằng backend lazy
+def lazy_aggregations(file_path, stats=None, medians=None, age_column='Age'):
+    """
+    Bảng chéo Depression x Academic Pressure và tỷ lệ trầm cảm theo giới
+    tính trên dữ liệu đã chuẩn hóa. Chỉ các cột Age, Gender, Academic
+    Pressure và Depression được đọc từ file.
+
+    Returns:
+    --------
+    dict với 'crosstab' (giống crosstab_depression_academic_pressure) và
+    'gender' (giống group_by_gender_depression)
+    """
+    pl = _require_polars()
+    plan, _, _ = build_lazy_pipeline(file_path, columns=['Gender', 'Academic Pressure', 'Depression'],
+                                     stats=stats, medians=medians, age_column=age_column)
+    pairs = (plan.group_by('Depression', 'Academic Pressure').agg(pl.len().alias('count'))
+             .collect(engine='streaming').to_pandas())
+    crosstab = (pairs.set_index(['Depression', 'Academic Pressure'])['count']
+                .unstack(fill_value=0).sort_index().sort_index(axis=1))
+    crosstab.columns.name = 'Academic Pressure'
+    gender = (plan.group_by(pl.col('Gender').cast(pl.String))
+              .agg(pl.col('Depression').mean())
+              .collect(engine='streaming').to_pandas())
+    gender = gender.set_index('Gender')['Depression'].astype(np.float64).sort_index()
+    return {'crosstab': crosstab, 'gender': gender}
@@ -0,0 +1,49 @@
+"""
+Logging có cấp độ cho các giai đoạn của pipeline.
+
+Quy ước cấp độ:
+- INFO: tiến trình của từng bước (thay cho các lệnh print trước đây)
+- DEBUG: thông tin chẩn đoán cần tính thêm trên toàn cột (unique, head,
+  min/max/mean, đếm giá trị thiếu, ...). Các phép tính này chỉ chạy khi
+  `logger.isEnabledFor(logging.DEBUG)`, nên chạy ở WARNING không tốn thêm
+  lượt quét nào.
+- WARNING: dữ liệu bất thường cần chú ý
+
+Ví dụ:
+    configure_logging("WARNING")   # production
+    configure_logging("DEBUG")     # in cả các bảng chẩn đoán
+"""
+import logging
+import sys
+
+LOGGER_NAME = "student_depression"
+DEFAULT_LEVEL = "INFO"
+# Giữ nguyên dạng đầu ra của các lệnh print cũ
+DEFAULT_FORMAT = "%(message)s"
+
+
+#Hàm lấy logger con của pipeline
+def get_logger(name):
+    """name: thường là __name__ của module gọi"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+#Hàm cấu hình logging cho toàn pipeline
+def configure_logging(level=DEFAULT_LEVEL, stream=None, fmt=DEFAULT_FORMAT):
+    """
+    Gắn một handler ghi ra stream (mặc định stdout) cho logger gốc của
+    pipeline. Gọi lại nhiều lần chỉ thay handler cũ, không nhân đôi dòng log.
+
+    level : str hoặc int, ví dụ "WARNING" hoặc logging.DEBUG
+    """
+    if isinstance(level, str):
+        level = level.upper()
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(logging.Formatter(fmt))
+    logger.addHandler(handler)
+    logger.propagate = False
+    return logger
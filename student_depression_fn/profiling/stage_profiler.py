@@ -0,0 +1,235 @@
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Profiler đang hoạt động; None nghĩa là các hàm được đánh dấu chạy bình thường
+_active_profiler = None
+
+
+def _peak_rss_mb():
+    # ru_maxrss (đỉnh của cả tiến trình): KB trên Linux, byte trên macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / 1024 ** 2
+    return peak / 1024
+
+
+def _rss_mb():
+    # RSS hiện tại; ngoài Linux không có /proc nên dùng tạm RSS đỉnh
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return _peak_rss_mb()
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+
+def _n_rows(obj):
+    return len(obj) if hasattr(obj, "shape") and hasattr(obj, "__len__") else None
+
+
+class StageProfiler:
+    """
+    Ghi lại thời gian thực, thời gian CPU, bộ nhớ và số dòng vào/ra của
+    từng bước trong pipeline.
+
+    Bộ nhớ được đo so với lúc bước bắt đầu: rss_delta_mb là RSS tăng thêm
+    khi bước kết thúc, peak_rss_growth_mb là phần bước đẩy RSS đỉnh của
+    tiến trình lên cao hơn. Bước lồng trong bước khác có depth > 0.
+
+    Độ sâu và đỉnh tracemalloc được giữ riêng cho từng luồng. Bước chạy ở
+    luồng phụ (luồng ghi nền, thread pool) được ghi kèm tên luồng, không đo
+    tracemalloc (bộ đếm đỉnh dùng chung cả tiến trình) và không cộng vào
+    tổng vì chạy chồng lên bước của luồng chính. RSS và thời gian CPU là của
+    cả tiến trình nên có thể gồm cả phần của các luồng khác đang chạy.
+
+    use_tracemalloc: đo thêm bộ nhớ Python cấp phát đỉnh trong từng bước
+    use_cprofile: chạy thêm cProfile cho toàn bộ lần chạy
+    """
+
+    def __init__(self, use_tracemalloc=False, use_cprofile=False):
+        self.use_tracemalloc = use_tracemalloc
+        self.use_cprofile = use_cprofile
+        self.records = []
+        self._cprofile = None
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+        # depth và py_peaks (đỉnh tracemalloc của các bước đang chạy, bước
+        # lồng sẽ reset_peak) theo từng luồng
+        self._local = threading.local()
+
+    def _thread_state(self):
+        local = self._local
+        if not hasattr(local, "depth"):
+            local.depth = 0
+            local.py_peaks = []
+        return local
+
+    def start(self):
+        if self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.use_cprofile:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        return self
+
+    def stop(self):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return self
+
+    def measure(self, stage, name, func, args, kwargs):
+        rows_in = _n_rows(args[0]) if args else None
+        local = self._thread_state()
+        thread = threading.current_thread()
+        main_thread = thread is threading.main_thread()
+        trace = main_thread and self.use_tracemalloc and tracemalloc.is_tracing()
+        if trace:
+            self._save_py_peak(local)
+            tracemalloc.reset_peak()
+            py_start = tracemalloc.get_traced_memory()[0]
+            local.py_peaks.append(py_start)
+        depth = local.depth
+        local.depth += 1
+        rss_start = _rss_mb()
+        peak_start = _peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            local.depth -= 1
+        record = {
+            "stage": stage,
+            "step": name,
+            "depth": depth,
+            "thread": None if main_thread else thread.name,
+            "wall_s": round(time.perf_counter() - wall_start, 6),
+            "cpu_s": round(time.process_time() - cpu_start, 6),
+            "rss_delta_mb": round(_rss_mb() - rss_start, 1),
+            "peak_rss_growth_mb": round(_peak_rss_mb() - peak_start, 1),
+            "rows_in": rows_in,
+            "rows_out": _n_rows(result),
+        }
+        if trace:
+            self._save_py_peak(local)
+            py_peak = local.py_peaks.pop()
+            record["py_peak_mb"] = round((py_peak - py_start) / 1024 ** 2, 1)
+            # Bước ngoài vẫn giữ đỉnh đã đạt trong bước này
+            self._save_py_peak(local, py_peak)
+        with self._lock:
+            self.records.append(record)
+        return result
+
+    @staticmethod
+    def _save_py_peak(local, peak=None):
+        if local.py_peaks:
+            if peak is None:
+                peak = tracemalloc.get_traced_memory()[1]
+            local.py_peaks[-1] = max(local.py_peaks[-1], peak)
+
+    def to_json(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"records": self.records}, f, ensure_ascii=False, indent=2)
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(os.path.splitext(path)[0] + ".prof")
+        return path
+
+    def summary_table(self):
+        """
+        Bảng tóm tắt theo từng bước, sắp xếp theo thời gian thực giảm dần.
+        Bước lồng được đánh dấu ↳, bước ở luồng phụ ghi kèm [tên luồng]; cả
+        hai không cộng vào tổng (đã nằm trong hoặc chạy chồng lên bước khác)
+        """
+        if not self.records:
+            return "(không có bước nào được ghi nhận)"
+        header = f"{'stage':<15}{'step':<38}{'wall_s':>9}{'cpu_s':>9}{'Δrss_mb':>9}{'Δpeak_mb':>10}{'rows_in':>10}{'rows_out':>10}"
+        lines = [header, "-" * len(header)]
+        for r in sorted(self.records, key=lambda r: r["wall_s"], reverse=True):
+            step = ("↳ " if r["depth"] else "") + (f"[{r['thread']}] " if r["thread"] else "") + r["step"]
+            lines.append(
+                f"{r['stage']:<15}{step[:37]:<38}{r['wall_s']:>9.3f}{r['cpu_s']:>9.3f}"
+                f"{r['rss_delta_mb']:>9.1f}{r['peak_rss_growth_mb']:>10.1f}{str(r['rows_in'] or '-'):>10}{str(r['rows_out'] or '-'):>10}"
+            )
+        total = sum(r["wall_s"] for r in self.records if r["depth"] == 0 and r["thread"] is None)
+        lines.append("-" * len(header))
+        lines.append(f"{'TỔNG':<53}{total:>9.3f}")
+        return "\n".join(lines)
+
+
+def _label_getter(func, label_arg):
+    """Hàm lấy giá trị tham số label_arg (theo tên) từ args/kwargs của một lần gọi func"""
+    code = func.__code__
+    position = code.co_varnames[:code.co_argcount].index(label_arg)
+    defaults = func.__defaults__ or ()
+    n_required = code.co_argcount - len(defaults)
+    default = defaults[position - n_required] if position >= n_required else None
+
+    def get(args, kwargs):
+        if label_arg in kwargs:
+            return kwargs[label_arg]
+        return args[position] if position < len(args) else default
+    return get
+
+
+def profile_stage(stage, label_arg=None):
+    """
+    Đánh dấu một bước của pipeline. Khi không có profiler hoạt động, hàm
+    được gọi trực tiếp (chỉ tốn một phép kiểm tra).
+
+    label_arg: tên tham số được ghi kèm vào tên bước, ví dụ
+    profile_stage("normalization", label_arg="col") ghi standardize_zscore[CGPA]
+    """
+    def decorator(func):
+        get_label = _label_getter(func, label_arg) if label_arg is not None else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active_profiler is None:
+                return func(*args, **kwargs)
+            name = func.__name__
+            if get_label is not None:
+                name = f"{name}[{get_label(args, kwargs)}]"
+            return _active_profiler.measure(stage, name, func, args, kwargs)
+        return wrapper
+    return decorator
+
+
+def get_profiler():
+    return _active_profiler
+
+
+@contextmanager
+def profiling(output_path=None, use_tracemalloc=False, use_cprofile=False, print_summary=True):
+    """
+    Bật profiler trong phạm vi khối with; khi kết thúc ghi JSON ra
+    output_path (và file .prof nếu dùng cProfile) rồi in bảng tóm tắt.
+    """
+    global _active_profiler
+    previous = _active_profiler
+    profiler = StageProfiler(use_tracemalloc=use_tracemalloc, use_cprofile=use_cprofile).start()
+    _active_profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous
+        profiler.stop()
+        if output_path is not None:
+            profiler.to_json(output_path)
+        if print_summary:
+            print("\n===== PROFILE =====")
+            print(profiler.summary_table())
@@ -1,9 +1,151 @@
+import functools
+import hashlib
+import logging
+import os
+import sys
+import warnings
 import pandas as pd
 import numpy as np
 import re
+
+# Thư mục student_depression_fn (report/src/data_cleaning → ../../..), để dùng
+# chung schema với pipeline
+_PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if _PROJECT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_DIR)
+
+from data_loading.data_loader import DataLoader  # noqa: E402
+from data_loading.schema import STUDENT_DEPRESSION_SCHEMA  # noqa: E402
+from profiling.logger import get_logger  # noqa: E402
+
+# Các bước tính thêm thống kê chỉ để hiển thị (unique, min/max/mean, head,
+# đếm giá trị thiếu) chỉ chạy khi logger bật mức DEBUG
+logger = get_logger(__name__)
+
+# Số chuỗi Sleep Duration phân biệt tối đa được giữ trong cache
+HOURS_CACHE_SIZE = 4096
+
+
+def copy_on_write_enabled():
+    """pandas >= 3 luôn bật Copy-on-Write; pandas 2.x bật qua mode.copy_on_write"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return pd.get_option('mode.copy_on_write') is True
+
+
+@functools.lru_cache(maxsize=HOURS_CACHE_SIZE)
+def _extract_hours_cached(value):
+    """extract_hours có cache giới hạn theo từng chuỗi phân biệt"""
+    return StudentDepressionDataCleaner.extract_hours(value)
+
+
+def snapshot(df):
+    """
+    Bản sao độc lập với df. Khi có Copy-on-Write, bản sao nông không tốn bộ
+    nhớ: dữ liệu chỉ bị sao chép khi một trong hai bên sửa tại chỗ
+    """
+    return df.copy(deep=not copy_on_write_enabled())
+
+
+def column_digest(series):
+    """Mã băm SHA-1 của nội dung một cột (không tính index)"""
+    hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+
+def changed_rows(before, after):
+    """
+    Mảng bool: dòng nào có giá trị khác nhau giữa hai phiên bản của một cột.
+    Cột số được so sánh sau khi đưa về float64 với sai số tương đối 1e-6
+    (ép float64 → float32 không bị tính là thay đổi), hai giá trị thiếu
+    được coi là bằng nhau
+    """
+    if before.dtype == after.dtype and before.equals(after):
+        return np.zeros(len(after), dtype=bool)
+    categorical = [s for s in (before, after) if isinstance(s.dtype, pd.CategoricalDtype)]
+    if categorical:
+        # So sánh theo mã trên cùng một bộ category thay vì so từng chuỗi
+        categories = categorical[-1].cat.categories
+        b = pd.Categorical(before, categories=categories).codes
+        a = pd.Categorical(after, categories=categories).codes
+        # Mã -1: giá trị thiếu, hoặc giá trị không thuộc categories (chỉ ở bên không phải category)
+        ambiguous = (b == -1) & (a == -1)
+        return (b != a) | (ambiguous & (before.isna().to_numpy() != after.isna().to_numpy()))
+    numeric = [pd.api.types.is_numeric_dtype(s.dtype) and not isinstance(s.dtype, pd.CategoricalDtype)
+               for s in (before, after)]
+    if all(numeric):
+        b = before.to_numpy(dtype='float64', na_value=np.nan)
+        a = after.to_numpy(dtype='float64', na_value=np.nan)
+        return ~np.isclose(b, a, rtol=1e-6, atol=0, equal_nan=True)
+    b = before.to_numpy(dtype=object)
+    a = after.to_numpy(dtype=object)
+    both_missing = pd.isna(b) & pd.isna(a)
+    return ~(both_missing | (b == a))
+
+
+class CleaningAuditLog:
+    """
+    Nhật ký thay đổi gọn nhẹ thay cho bản sao original_data.
+
+    Với mỗi bước làm sạch và mỗi cột bị bước đó thay đổi, chỉ lưu kiểu dữ
+    liệu trước/sau, số dòng thay đổi, bitmap các dòng thay đổi (np.packbits,
+    1 bit/dòng) và mã băm nội dung cột sau bước đó. Mã băm của các cột gốc
+    được lưu khi khởi tạo để đối chiếu với file nguồn.
+    """
+
+    def __init__(self, data):
+        self.n_rows = len(data)
+        self.original_dtypes = {col: str(dtype) for col, dtype in data.dtypes.items()}
+        self.original_digests = {col: column_digest(data[col]) for col in data.columns}
+        self.entries = []
+
+    def record(self, step, before, after):
+        """Ghi các cột mà bước step đã thay đổi (before/after: DataFrame trước và sau bước)"""
+        for col in after.columns:
+            if col in before.columns:
+                changed = changed_rows(before[col], after[col])
+                dtype_before = str(before[col].dtype)
+            else:
+                changed = np.ones(len(after), dtype=bool)
+                dtype_before = None
+            n_changed = int(changed.sum())
+            if n_changed == 0 and dtype_before == str(after[col].dtype):
+                continue
+            self.entries.append({
+                'step': step,
+                'column': col,
+                'dtype_before': dtype_before,
+                'dtype_after': str(after[col].dtype),
+                'n_changed': n_changed,
+                'changed_bitmap': np.packbits(changed),
+                'digest': column_digest(after[col]),
+            })
+        return self
+
+    def changed_positions(self, step, column):
+        """Vị trí (0..n-1) các dòng mà bước step đã thay đổi trong cột column"""
+        for entry in self.entries:
+            if entry['step'] == step and entry['column'] == column:
+                bits = np.unpackbits(entry['changed_bitmap'], count=self.n_rows)
+                return np.flatnonzero(bits)
+        return np.array([], dtype=np.intp)
+
+    def summary(self):
+        """Bảng tóm tắt nhật ký (không gồm bitmap)"""
+        columns = ['step', 'column', 'dtype_before', 'dtype_after', 'n_changed', 'digest']
+        return pd.DataFrame([{key: entry[key] for key in columns} for entry in self.entries],
+                            columns=columns)
+
+    @property
+    def nbytes(self):
+        return sum(entry['changed_bitmap'].nbytes for entry in self.entries)
+
+
 class StudentDepressionDataCleaner:
   
-    def __init__(self, data):
+    def __init__(self, data, low_memory=False, audit=False):
         """
         Khởi tạo class với dữ liệu
         
@@ -11,41 +153,81 @@ class StudentDepressionDataCleaner:
         -----------
         data : pandas.DataFrame
             Dữ liệu gốc cần làm sạch
+        low_memory : bool
+            Không giữ bản sao original_data; cleaned_data là bản sao nông
+            (Copy-on-Write) nên không sao chép dữ liệu của data. Bộ nhớ đỉnh
+            gần bằng một bản dữ liệu nếu người gọi không còn giữ data
+        audit : bool
+            Ghi CleaningAuditLog (self.audit_log) cho từng bước thay vì cần
+            bản sao gốc để đối chiếu
         """
-        self.original_data = data.copy()
-        self.cleaned_data = data.copy()
+        self.low_memory = low_memory
+        self.original_shape = data.shape
+        if low_memory:
+            self.original_data = None
+            self.cleaned_data = snapshot(data)
+        else:
+            self.original_data = data.copy()
+            self.cleaned_data = data.copy()
+        self.audit_log = CleaningAuditLog(data) if audit else None
         self.categorical_columns = [
             'Gender', 'City', 'Profession', 'Degree',
             'Have you ever had suicidal thoughts ?', 
             'Family History of Mental Illness'
         ]
         
+    # Schema dùng chung của pipeline (data_loading/schema.py). Depression dùng
+    # kiểu bool có giá trị thiếu ('boolean'): ép 'bool' sẽ biến NaN thành True
+    schema = {**STUDENT_DEPRESSION_SCHEMA, 'Depression': 'boolean'}
+    
+    def enforce_schema(self):
+        #Ép kiểu các cột theo schema và báo cáo bộ nhớ trước/sau
+        
+        logger.info("0. Áp dụng schema kiểu dữ liệu...")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        rows = max(len(self.cleaned_data), 1)
+        if debug:
+            before = self.cleaned_data.memory_usage(deep=True, index=False).sum() / rows
+        casts = {col: dtype for col, dtype in self.schema.items()
+                 if col in self.cleaned_data.columns and str(self.cleaned_data[col].dtype) != dtype}
+        if casts:
+            self.cleaned_data = self.cleaned_data.astype(casts)
+        if debug:
+            after = self.cleaned_data.memory_usage(deep=True, index=False).sum() / rows
+            logger.debug("   ✓ Bộ nhớ: %.1f → %.1f byte/dòng", before, after)
+        return self
+        
     def convert_depression_to_int(self):
-        print("1. Chuyển đổi cột 'Depression' sang integer...")
-        self.cleaned_data['Depression'] = self.cleaned_data['Depression'].astype(int)
-        print("   ✓ Hoàn thành")
+        logger.info("1. Chuyển đổi cột 'Depression' sang integer...")
+        self.cleaned_data['Depression'] = self.cleaned_data['Depression'].astype('int8')
+        logger.info("   ✓ Hoàn thành")
         return self
     
     def convert_to_categorical(self):
         #Chuyển đổi các cột phân loại sang kiểu category
         
-        print("\n2. Chuyển đổi các cột phân loại sang category...")
+        logger.info("\n2. Chuyển đổi các cột phân loại sang category...")
         for col in self.categorical_columns:
             if col in self.cleaned_data.columns:
                 self.cleaned_data[col] = self.cleaned_data[col].astype('category')
-                print(f"   ✓ {col}: {self.cleaned_data[col].dtype}")
+                logger.info("   ✓ %s: %s", col, self.cleaned_data[col].dtype)
         return self
     
     def check_unique_values(self):
         #Kiểm tra giá trị duy nhất trong các cột quan trọng
 
-        print("\n3. Kiểm tra giá trị duy nhất:")
-        print("-" * 40)
+        if not logger.isEnabledFor(logging.DEBUG):
+            return self
+        logger.debug("\n3. Kiểm tra giá trị duy nhất:")
+        logger.debug("-" * 40)
         
-        print("   'Sleep Duration':", self.original_data['Sleep Duration'].unique()[:10], 
-              "..." if len(self.original_data['Sleep Duration'].unique()) > 10 else "")
-        print("   'Financial Stress':", self.original_data['Financial Stress'].unique()[:10], 
-              "..." if len(self.original_data['Financial Stress'].unique()) > 10 else "")
+        # Chế độ low_memory không giữ bản gốc: hai cột này chưa bị làm sạch ở
+        # bước này nên cleaned_data có cùng các giá trị phân biệt
+        source = self.original_data if self.original_data is not None else self.cleaned_data
+        for col in ['Sleep Duration', 'Financial Stress']:
+            # unique() một lần cho mỗi cột
+            uniques = source[col].unique()
+            logger.debug("   '%s': %s %s", col, uniques[:10], "..." if len(uniques) > 10 else "")
         
         return self
     
@@ -67,23 +249,59 @@ class StudentDepressionDataCleaner:
         # Tìm một số (bao gồm các số thập phân)
         match = re.search(r"(\d+(\.\d+)?)", str(s))
         return float(match.group(1)) if match else np.nan
+
+    @staticmethod
+    def extract_hours_vectorized(series):
+        """
+        Trích xuất số giờ cho cả cột Sleep Duration
+        
+        Mỗi giá trị phân biệt chỉ được parse một lần (kết quả được cache
+        trong _extract_hours_cached, tối đa HOURS_CACHE_SIZE chuỗi),
+        sau đó ánh xạ lại cho từng dòng theo mã category.
+        Kết quả giống hệt series.apply(extract_hours).
+        
+        Parameters:
+        -----------
+        series : pandas.Series
+            Cột Sleep Duration (object hoặc category)
+            
+        Returns:
+        --------
+        pandas.Series
+            Số giờ dạng float
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            uniques = series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        
+        # Mã -1 (giá trị thiếu) trỏ vào phần tử cuối cùng: extract_hours(NaN) = NaN
+        parsed = np.empty(len(uniques) + 1, dtype='float64')
+        for i, value in enumerate(uniques):
+            parsed[i] = _extract_hours_cached(value)
+        parsed[-1] = np.nan
+        
+        return pd.Series(parsed[codes], index=series.index, name=series.name)
     
     def clean_sleep_duration(self):
         """
         Làm sạch cột Sleep Duration
         """
-        print("\n4. Làm sạch cột 'Sleep Duration'...")
+        logger.info("\n4. Làm sạch cột 'Sleep Duration'...")
         
-        # Áp dụng hàm extract_hours
-        self.cleaned_data['Sleep Duration'] = self.cleaned_data['Sleep Duration'].apply(
-            self.extract_hours
+        # Áp dụng extract_hours trên từng giá trị phân biệt
+        self.cleaned_data['Sleep Duration'] = self.extract_hours_vectorized(
+            self.cleaned_data['Sleep Duration']
         )
         
         # Hiển thị kết quả
-        print(f"   ✓ Đã chuyển đổi sang numeric")
-        print(f"   ✓ Giá trị min: {self.cleaned_data['Sleep Duration'].min():.1f} giờ")
-        print(f"   ✓ Giá trị max: {self.cleaned_data['Sleep Duration'].max():.1f} giờ")
-        print(f"   ✓ Giá trị trung bình: {self.cleaned_data['Sleep Duration'].mean():.1f} giờ")
+        logger.info("   ✓ Đã chuyển đổi sang numeric")
+        if logger.isEnabledFor(logging.DEBUG):
+            hours = self.cleaned_data['Sleep Duration']
+            logger.debug("   ✓ Giá trị min: %.1f giờ", hours.min())
+            logger.debug("   ✓ Giá trị max: %.1f giờ", hours.max())
+            logger.debug("   ✓ Giá trị trung bình: %.1f giờ", hours.mean())
         
         return self
     
@@ -91,33 +309,35 @@ class StudentDepressionDataCleaner:
         """
         Chuyển đổi Financial Stress sang categorical
         """
-        print("\n5. Chuyển đổi 'Financial Stress' sang category...")
+        logger.info("\n5. Chuyển đổi 'Financial Stress' sang category...")
         
         if 'Financial Stress' in self.cleaned_data.columns:
             self.cleaned_data['Financial Stress'] = self.cleaned_data['Financial Stress'].astype('category')
-            print(f"   ✓ Hoàn thành")
-            print(f"   ✓ Số lượng category: {len(self.cleaned_data['Financial Stress'].cat.categories)}")
+            logger.info("   ✓ Hoàn thành")
+            logger.info("   ✓ Số lượng category: %d", len(self.cleaned_data['Financial Stress'].cat.categories))
         else:
-            print("   ✗ Không tìm thấy cột 'Financial Stress'")
+            logger.warning("   ✗ Không tìm thấy cột 'Financial Stress'")
             
         return self
     
     def check_missing_values(self):
         #Kiểm tra và hiển thị giá trị thiếu
         
-        print("\n6. Kiểm tra giá trị thiếu:")
-        print("-" * 40)
+        if not logger.isEnabledFor(logging.DEBUG):
+            return self
+        logger.debug("\n6. Kiểm tra giá trị thiếu:")
+        logger.debug("-" * 40)
         
         missing_values = self.cleaned_data.isnull().sum()
         missing_columns = missing_values[missing_values > 0]
         
         if len(missing_columns) > 0:
-            print("   Các cột có giá trị thiếu:")
+            logger.debug("   Các cột có giá trị thiếu:")
             for col, count in missing_columns.items():
                 percentage = (count / len(self.cleaned_data)) * 100
-                print(f"   • {col}: {count} giá trị ({percentage:.1f}%)")
+                logger.debug("   • %s: %d giá trị (%.1f%%)", col, count, percentage)
         else:
-            print("   ✓ Không có giá trị thiếu")
+            logger.debug("   ✓ Không có giá trị thiếu")
             
         return self
     
@@ -125,7 +345,7 @@ class StudentDepressionDataCleaner:
         """
         Thay thế giá trị thiếu bằng median cho các cột numeric
         """
-        print("\n7. Xử lý giá trị thiếu...")
+        logger.info("\n7. Xử lý giá trị thiếu...")
         
         numeric_columns = self.cleaned_data.select_dtypes(include=[np.number]).columns
         imputed_columns = []
@@ -134,31 +354,35 @@ class StudentDepressionDataCleaner:
             missing_count = self.cleaned_data[col].isnull().sum()
             if missing_count > 0:
                 median_value = self.cleaned_data[col].median()
-                self.cleaned_data[col].fillna(median_value, inplace=True)
+                # Gán lại cột: fillna(inplace=True) trên self.cleaned_data[col] không
+                # có tác dụng khi bật Copy-on-Write
+                self.cleaned_data[col] = self.cleaned_data[col].fillna(median_value)
                 imputed_columns.append((col, missing_count, median_value))
                 
         if imputed_columns:
-            print("   Đã thay thế giá trị thiếu:")
+            logger.info("   Đã thay thế giá trị thiếu:")
             for col, count, median in imputed_columns:
-                print(f"   • {col}: {count} giá trị → median = {median:.2f}")
+                logger.info("   • %s: %d giá trị → median = %.2f", col, count, median)
         else:
-            print("   ✓ Không có giá trị thiếu cần xử lý")
+            logger.info("   ✓ Không có giá trị thiếu cần xử lý")
             
         return self
     
     def verify_changes(self):
         #Kiểm tra kết quả sau khi làm sạch
         
-        print("\n8. Kiểm tra kết quả làm sạch:")
-        print("-" * 40)
+        if not logger.isEnabledFor(logging.DEBUG):
+            return self
+        logger.debug("\n8. Kiểm tra kết quả làm sạch:")
+        logger.debug("-" * 40)
         
         # Hiển thị 5 dòng đầu tiên của các cột quan trọng
-        print("   Sleep Duration và Financial Stress:")
-        print(self.cleaned_data[['Sleep Duration', 'Financial Stress']].head().to_string())
+        logger.debug("   Sleep Duration và Financial Stress:")
+        logger.debug("%s", self.cleaned_data[['Sleep Duration', 'Financial Stress']].head().to_string())
         
         # Thông tin tổng quan
-        print(f"\n   Tổng số dòng: {self.cleaned_data.shape[0]}")
-        print(f"   Tổng số cột: {self.cleaned_data.shape[1]}")
+        logger.debug("\n   Tổng số dòng: %d", self.cleaned_data.shape[0])
+        logger.debug("   Tổng số cột: %d", self.cleaned_data.shape[1])
         
         return self
     
@@ -167,7 +391,7 @@ class StudentDepressionDataCleaner:
         Tạo báo cáo tổng quan về dữ liệu đã làm sạch
         """
         summary = {
-            'original_shape': self.original_data.shape,
+            'original_shape': self.original_shape,
             'cleaned_shape': self.cleaned_data.shape,
             'dtypes': self.cleaned_data.dtypes.to_dict(),
             'categorical_columns': list(self.cleaned_data.select_dtypes(include=['category']).columns),
@@ -180,23 +404,33 @@ class StudentDepressionDataCleaner:
         """
         Chạy toàn bộ quy trình làm sạch
         """
-        print("=" * 60)
-        print("BẮT ĐẦU QUY TRÌNH LÀM SẠCH DỮ LIỆU")
-        print("=" * 60)
+        logger.info("=" * 60)
+        logger.info("BẮT ĐẦU QUY TRÌNH LÀM SẠCH DỮ LIỆU")
+        logger.info("=" * 60)
         
         # Thực hiện tuần tự các bước làm sạch
-        (self.convert_depression_to_int()
-         .convert_to_categorical()
-         .check_unique_values()
-         .clean_sleep_duration()
-         .clean_financial_stress()
-         .check_missing_values()
-         .impute_missing_values()
-         .verify_changes())
-        
-        print("\n" + "=" * 60)
-        print("HOÀN THÀNH QUY TRÌNH LÀM SẠCH")
-        print("=" * 60)
+        steps = [self.enforce_schema,
+                 self.convert_depression_to_int,
+                 self.convert_to_categorical,
+                 self.check_unique_values,
+                 self.clean_sleep_duration,
+                 self.clean_financial_stress,
+                 self.check_missing_values,
+                 self.impute_missing_values,
+                 self.verify_changes]
+        for step in steps:
+            if self.audit_log is None:
+                step()
+                continue
+            # Bản sao nông: chỉ giữ các cột cũ cho tới khi so sánh xong
+            before = snapshot(self.cleaned_data)
+            step()
+            self.audit_log.record(step.__name__, before, self.cleaned_data)
+            del before
+        
+        logger.info("\n" + "=" * 60)
+        logger.info("HOÀN THÀNH QUY TRÌNH LÀM SẠCH")
+        logger.info("=" * 60)
         
         return self.cleaned_data
     
@@ -210,7 +444,7 @@ class StudentDepressionDataCleaner:
             Tên file để lưu dữ liệu đã làm sạch
         """
         self.cleaned_data.to_csv(filename, index=False)
-        print(f"\n✓ Dữ liệu đã làm sạch được lưu vào: {filename}")
+        logger.info("\n✓ Dữ liệu đã làm sạch được lưu vào: %s", filename)
 
 
 # Class để quản lý việc đọc và xử lý file
@@ -219,7 +453,7 @@ class DepressionDataProcessor:
     Class để xử lý toàn bộ pipeline đọc và làm sạch dữ liệu
     """
     
-    def __init__(self, filepath='student_depression_.csv'):
+    def __init__(self, filepath='student_depression_.csv', low_memory=False, audit=False):
         """
         Khởi tạo processor với đường dẫn file
         
@@ -227,26 +461,34 @@ class DepressionDataProcessor:
         -----------
         filepath : str
             Đường dẫn đến file CSV
+        low_memory : bool
+            Chuyển dữ liệu cho cleaner ở chế độ low_memory và bỏ self.data,
+            để chỉ còn một bản dữ liệu trong bộ nhớ
+        audit : bool
+            Ghi nhật ký thay đổi (cleaner.audit_log)
         """
         self.filepath = filepath
+        self.low_memory = low_memory
+        self.audit = audit
         self.data = None
         self.cleaner = None
         
     def load_data(self):
         """
-        Đọc dữ liệu từ file CSV
+        Đọc dữ liệu từ file CSV qua DataLoader dùng chung (đoán encoding,
+        đọc thẳng theo schema của cleaner)
         """
-        print(f"Đang đọc dữ liệu từ: {self.filepath}")
+        logger.info("Đang đọc dữ liệu từ: %s", self.filepath)
         
         try:
-            self.data = pd.read_csv(self.filepath)
-            print(f"✓ Đã đọc dữ liệu: {self.data.shape[0]} dòng, {self.data.shape[1]} cột")
+            self.data = DataLoader(dtype=StudentDepressionDataCleaner.schema).load_csv(self.filepath)
+            logger.info("✓ Đã đọc dữ liệu: %d dòng, %d cột", self.data.shape[0], self.data.shape[1])
             return True
         except FileNotFoundError:
-            print(f"✗ Lỗi: Không tìm thấy file {self.filepath}")
+            logger.error("✗ Lỗi: Không tìm thấy file %s", self.filepath)
             return False
         except Exception as e:
-            print(f"✗ Lỗi khi đọc file: {str(e)}")
+            logger.error("✗ Lỗi khi đọc file: %s", e)
             return False
     
     def process_data(self):
@@ -255,7 +497,12 @@ class DepressionDataProcessor:
         """
         if self.data is not None:
             # Tạo instance của cleaner
-            self.cleaner = StudentDepressionDataCleaner(self.data)
+            self.cleaner = StudentDepressionDataCleaner(self.data, low_memory=self.low_memory,
+                                                        audit=self.audit)
+            if self.low_memory:
+                # cleaner giữ bản sao nông duy nhất: các cột gốc được giải phóng
+                # ngay khi bước làm sạch thay thế chúng
+                self.data = None
             
             # Chạy quy trình làm sạch
             cleaned_data = self.cleaner.run_full_cleaning()
@@ -265,7 +512,7 @@ class DepressionDataProcessor:
             
             return cleaned_data
         else:
-            print("✗ Chưa có dữ liệu để xử lý. Vui lòng load_data() trước.")
+            logger.error("✗ Chưa có dữ liệu để xử lý. Vui lòng load_data() trước.")
             return None
     
     def get_cleaner_summary(self):
@@ -275,7 +522,7 @@ class DepressionDataProcessor:
         if self.cleaner:
             return self.cleaner.get_summary()
         else:
-            print("✗ Chưa có cleaner. Vui lòng chạy process_data() trước.")
+            logger.error("✗ Chưa có cleaner. Vui lòng chạy process_data() trước.")
             return None
 
 
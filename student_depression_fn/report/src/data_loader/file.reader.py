@@ -1,29 +1,15 @@
-import pandas as pd
-import numpy as np
-import json
-import csv
-from pathlib import Path
+# Lớp đọc dữ liệu dùng chung của pipeline (data_loading/data_loader.py).
+# File này chỉ xuất lại DataLoader cho thư mục report, không giữ bản sao riêng.
+import os
+import sys
 
-class DataLoader:
-    def __init__(self):
-        self.data = None
-    
-    def load_csv(self, filepath, encoding='utf-8'):
-        """Đọc file CSV với nhiều tùy chọn encoding"""
-        pass
-    
-    def load_excel(self, filepath, sheet_name=None):
-        """Đọc file Excel"""
-        pass
-    
-    def load_json(self, filepath):
-        """Đọc file JSON"""
-        pass
-    
-    def detect_encoding(self, filepath):
-        """Phát hiện encoding tự động"""
-        pass
-    
-    def validate_data_structure(self, df):
-        """Kiểm tra cấu trúc dữ liệu"""
-        pass
\ No newline at end of file
+# Thư mục student_depression_fn (report/src/data_loader → ../../..)
+_PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if _PROJECT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_DIR)
+
+from data_loading.data_loader import (  # noqa: E402,F401
+    DataLoader,
+    REQUIRED_COLUMNS,
+    STUDENT_DEPRESSION_DTYPES,
+)
@@ -0,0 +1,147 @@
+"""
+Ghi file ở luồng nền để luồng chính không phải chờ nén PNG và ghi đĩa.
+
+Biểu đồ được vẽ (Agg) ngay trong luồng gọi thành một PNG chưa nén trong bộ
+nhớ; luồng ghi nén lại (Pillow, nhả GIL khi nén) và ghi ra file. Ảnh cuối
+cùng giống hệt plt.savefig trực tiếp. DataFrame được ghi bằng save_data
+trong luồng ghi (Copy-on-Write: luồng chính sửa df sau đó không ảnh hưởng
+bản đang ghi).
+
+Hàng đợi có giới hạn: khi đã có max_pending việc chưa ghi, luồng gọi chờ
+đến khi có chỗ, nên bộ nhớ giữ các buffer (~25MB mỗi biểu đồ 300 dpi) không
+tăng vô hạn.
+
+Ví dụ:
+    with async_output() as writer:
+        run_all_analysis(df)            # save_current_figure dùng writer
+        writer.save_data(df, "data/out.csv")
+    # ra khỏi khối with: mọi file đã được ghi xong (lỗi được raise ở đây)
+"""
+import io
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from profiling.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_PENDING = 4
+
+# Writer đang hoạt động; None nghĩa là save_current_figure ghi trực tiếp
+_active_writer = None
+
+
+#Hàm nén PNG chưa nén và ghi ra file (đổi tên sau khi ghi xong)
+def _write_png(buffer, path):
+    from PIL import Image, PngImagePlugin
+
+    tmp_path = f"{path}.tmp"
+    with Image.open(buffer) as image:
+        pnginfo = PngImagePlugin.PngInfo()
+        for key, value in image.text.items():
+            pnginfo.add_text(key, value)
+        image.save(tmp_path, format="PNG", pnginfo=pnginfo, dpi=image.info.get("dpi"))
+    os.replace(tmp_path, path)
+
+
+class AsyncWriter:
+    """
+    Luồng ghi nền với hàng đợi có giới hạn.
+
+    max_pending : số việc ghi tối đa đang chờ trong hàng đợi
+    """
+
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self.pid = os.getpid()
+        self.errors = []
+        self.completed = 0
+        # Tổng thời gian luồng gọi phải chờ vì hàng đợi đầy
+        self.blocked_s = 0.0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                label, func, args, kwargs = item
+                try:
+                    func(*args, **kwargs)
+                    self.completed += 1
+                except Exception as e:
+                    self.errors.append((label, e))
+                    logger.error("❌ Ghi nền thất bại (%s): %s", label, e)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, func, *args, label=None, **kwargs):
+        """Đưa func(*args, **kwargs) vào hàng đợi, chờ nếu hàng đợi đầy"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="async-writer", daemon=True)
+            self._thread.start()
+        start = time.perf_counter()
+        self._queue.put((label or func.__name__, func, args, kwargs))
+        self.blocked_s += time.perf_counter() - start
+
+    def save_figure(self, fig, path, **savefig_kwargs):
+        """Vẽ fig thành PNG chưa nén trong bộ nhớ, nén và ghi ra path ở luồng nền"""
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", pil_kwargs={"compress_level": 0}, **savefig_kwargs)
+        buffer.seek(0)
+        self.submit(_write_png, buffer, path, label=path)
+
+    def save_data(self, df, output_path, **kwargs):
+        """Ghi df bằng storage.save_data ở luồng nền"""
+        from storage.save_data import save_data
+        self.submit(save_data, df, output_path, label=output_path, **kwargs)
+
+    def flush(self):
+        """Chờ mọi việc đã đưa vào hàng đợi ghi xong; raise nếu có việc thất bại"""
+        if self._thread is not None:
+            self._queue.join()
+        if self.errors:
+            errors, self.errors = self.errors, []
+            label, error = errors[0]
+            raise RuntimeError(f"❌ {len(errors)} file ghi nền thất bại, đầu tiên: {label}") from error
+
+    def close(self):
+        """Ghi nốt hàng đợi rồi dừng luồng ghi"""
+        try:
+            self.flush()
+        finally:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+
+def get_writer():
+    # Tiến trình con (fork) không dùng writer của tiến trình cha
+    if _active_writer is not None and _active_writer.pid == os.getpid():
+        return _active_writer
+    return None
+
+
+@contextmanager
+def async_output(max_pending=DEFAULT_MAX_PENDING):
+    """
+    Bật ghi nền trong phạm vi khối with; khi kết thúc chờ mọi file được ghi
+    xong (điểm flush) rồi dừng luồng ghi.
+    """
+    global _active_writer
+    previous = _active_writer
+    writer = AsyncWriter(max_pending=max_pending)
+    _active_writer = writer
+    try:
+        yield writer
+    finally:
+        _active_writer = previous
+        writer.close()
+        logger.info("✅ Đã ghi nền %d file (luồng chính chờ hàng đợi %.2fs)",
+                    writer.completed, writer.blocked_s)
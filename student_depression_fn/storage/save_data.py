@@ -1,10 +1,193 @@
 import os
+import time
+from contextlib import contextmanager
 
-def save_data(df, output_path):
+from profiling.logger import get_logger
+from profiling.stage_profiler import profile_stage
+
+# Định dạng lưu theo đuôi file
+FORMAT_BY_EXTENSION = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+}
+# Nén CSV theo đuôi file cuối cùng, ví dụ data.csv.gz
+COMPRESSION_BY_EXTENSION = {
+    ".gz": "gzip",
+    ".zst": "zstd",
+}
+# Số dòng mỗi lần ghi CSV theo chunk
+CSV_CHUNK_ROWS = 100_000
+# Encoding của CSV do save_data ghi (có BOM để Excel nhận UTF-8)
+CSV_ENCODING = "utf-8-sig"
+
+logger = get_logger(__name__)
+
+def detect_compression(path, compression=None):
+    if compression is not None:
+        return compression
+    ext = os.path.splitext(path)[1].lower()
+    return COMPRESSION_BY_EXTENSION.get(ext)
+
+def detect_format(path, format=None):
+    if format is not None:
+        return format
+    root, ext = os.path.splitext(path)
+    if ext.lower() in COMPRESSION_BY_EXTENSION:
+        ext = os.path.splitext(root)[1]
+    return FORMAT_BY_EXTENSION.get(ext.lower(), "csv")
+
+def _require_pyarrow(format):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(f"❌ Lưu/đọc định dạng {format} cần cài pyarrow: pip install pyarrow")
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("❌ Nén zstd cần cài zstandard: pip install zstandard")
+    return zstandard
+
+def _fsync_directory(directory):
+    # Ghi nhận việc đổi tên file vào thư mục (không hỗ trợ trên Windows)
+    if os.name != "posix":
+        return
+    fd = os.open(directory or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+#Hàm ghi file nguyên tử: ghi vào file tạm, fsync rồi đổi tên đè file đích
+@contextmanager
+def atomic_output(output_path):
+    """
+    Khối with nhận đường dẫn file tạm để ghi. Chỉ khi khối kết thúc không lỗi
+    file tạm mới được fsync và đổi tên thành output_path, nên file đích
+    không bao giờ bị ghi dở (lỗi giữa chừng thì file cũ vẫn còn nguyên).
+    """
+    tmp_path = f"{output_path}.tmp"
+    try:
+        yield tmp_path
+        with open(tmp_path, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(os.path.dirname(output_path))
+
+@contextmanager
+def _compressed_writer(f, compression, level=None):
+    """Bọc file nhị phân f bằng bộ nén (None: ghi thẳng)"""
+    if compression is None:
+        yield f
+    elif compression == "gzip":
+        import gzip
+        # mtime=0: cùng dữ liệu cho cùng file nén
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6 if level is None else level,
+                           mtime=0) as stream:
+            yield stream
+    elif compression == "zstd":
+        zstandard = _require_zstandard()
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        with compressor.stream_writer(f, closefd=False) as stream:
+            yield stream
+    else:
+        raise ValueError(f"❌ Kiểu nén không hỗ trợ: {compression}")
+
+#Hàm ghi CSV theo chunk dòng, có nén, ghi nguyên tử
+def write_csv_stream(df, output_path, compression=None, chunksize=CSV_CHUNK_ROWS, level=None):
+    """
+    Ghi df ra CSV từng chunksize dòng qua bộ nén (gzip/zstd) vào file tạm,
+    fsync rồi đổi tên thành output_path. Bộ nhớ tăng thêm chỉ bằng chuỗi CSV
+    của một chunk, không phải của cả bảng.
+
+    Returns:
+    --------
+    dict gồm rows, csv_bytes (chưa nén), file_bytes, seconds, mb_per_s
+    (tính theo số byte CSV chưa nén)
+    """
+    import codecs
+
+    start = time.perf_counter()
+    csv_bytes = 0
+    with atomic_output(output_path) as tmp_path:
+        with open(tmp_path, "wb") as f, _compressed_writer(f, compression, level) as stream:
+            # BOM một lần ở đầu file, như df.to_csv(encoding="utf-8-sig")
+            stream.write(codecs.BOM_UTF8)
+            csv_bytes += len(codecs.BOM_UTF8)
+            for offset in range(0, max(len(df), 1), chunksize):
+                chunk = df.iloc[offset:offset + chunksize].to_csv(index=False, header=offset == 0)
+                data = chunk.encode("utf-8")
+                stream.write(data)
+                csv_bytes += len(data)
+    seconds = time.perf_counter() - start
+    return {
+        'rows': len(df),
+        'csv_bytes': csv_bytes,
+        'file_bytes': os.path.getsize(output_path),
+        'seconds': seconds,
+        'mb_per_s': csv_bytes / 1024 ** 2 / seconds if seconds > 0 else float("inf"),
+    }
+
+@profile_stage("storage")
+def save_data(df, output_path, format=None, compression=None):
+    """
+    Lưu DataFrame, định dạng chọn theo đuôi file hoặc tham số format:
+    - csv: như trước (utf-8-sig), ghi theo chunk; nén gzip/zstd theo đuôi
+      .gz/.zst (ví dụ data.csv.gz) hoặc tham số compression
+    - parquet: dạng cột, mã hóa dictionary, giữ nguyên category/float32
+    - feather: Arrow IPC, đọc lại nhanh nhất
+    File được ghi nguyên tử (file tạm + fsync + đổi tên).
+    """
     if df is None:
         raise ValueError("❌ Không thể lưu file: df = None")
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    format = detect_format(output_path, format)
+    if format == "csv":
+        result = write_csv_stream(df, output_path, compression=detect_compression(output_path, compression))
+        logger.info("✅ Đã lưu dữ liệu tại: %s (%.1f MB, %.1f MB/s)",
+                    output_path, result['file_bytes'] / 1024 ** 2, result['mb_per_s'])
+        return
+    if format not in ("parquet", "feather"):
+        raise ValueError(f"❌ Định dạng không hỗ trợ: {format}")
+    _require_pyarrow(format)
+    with atomic_output(output_path) as tmp_path:
+        if format == "parquet":
+            df.to_parquet(tmp_path, index=False, engine="pyarrow", use_dictionary=True)
+        else:
+            df.reset_index(drop=True).to_feather(tmp_path)
+    logger.info("✅ Đã lưu dữ liệu tại: %s", output_path)
 
-    df.to_csv(output_path, index=False, encoding="utf-8-sig")
-    print(f"✅ Đã lưu dữ liệu tại: {output_path}")
+@profile_stage("storage")
+def load_data(input_path, columns=None, format=None):
+    """Đọc lại dữ liệu đã lưu bằng save_data, chỉ đọc các cột trong columns"""
+    format = detect_format(input_path, format)
+    if format == "parquet":
+        _require_pyarrow(format)
+        import pandas as pd
+        return pd.read_parquet(input_path, columns=columns, engine="pyarrow")
+    if format == "feather":
+        _require_pyarrow(format)
+        import pandas as pd
+        return pd.read_feather(input_path, columns=columns)
+    if format == "csv":
+        if detect_compression(input_path) is not None:
+            # File nén do save_data ghi: encoding đã biết, pandas tự giải nén theo đuôi file
+            import pandas as pd
+            return pd.read_csv(input_path, usecols=columns, encoding=CSV_ENCODING)
+        from data_loading.data_loader import DataLoader
+        # File đã qua chuẩn hóa không còn theo schema gốc nên để pandas tự suy luận
+        return DataLoader(dtype={}).load_csv(input_path, usecols=columns)
+    raise ValueError(f"❌ Định dạng không hỗ trợ: {format}")
@@ -0,0 +1,91 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = "manifest.json"
+
+
+# Ghi DataFrame ra thư mục gồm các file .npy (mỗi cột một file) để các
+# tiến trình khác có thể ánh xạ bộ nhớ (memory-map) thay vì nhận bản sao pickle
+def write_shared_frame(df, directory):
+    os.makedirs(directory, exist_ok=True)
+    columns = []
+    for i, col in enumerate(df.columns):
+        s = df[col]
+        entry = {"name": col, "dtype": str(s.dtype)}
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            entry["kind"] = "category"
+            entry["categories"] = s.cat.categories.tolist()
+            entry["ordered"] = bool(s.cat.ordered)
+            values = s.cat.codes.to_numpy()
+        elif pd.api.types.is_numeric_dtype(s.dtype) or pd.api.types.is_bool_dtype(s.dtype):
+            entry["kind"] = "numeric"
+            values = s.to_numpy()
+        else:
+            # Cột chuỗi: lưu mã + từ điển giá trị, mã -1 là giá trị thiếu
+            entry["kind"] = "string"
+            codes, uniques = pd.factorize(s)
+            entry["categories"] = [str(u) for u in uniques]
+            # Mã có kiểu hẹp như cat.codes (int8 khi < 128 giá trị) để gắn
+            # thành category mà không phải ép kiểu (sao chép) mảng mã
+            values = pd.Categorical.from_codes(codes, categories=entry["categories"]).codes
+        entry["file"] = f"col_{i}.npy"
+        np.save(os.path.join(directory, entry["file"]), np.ascontiguousarray(values))
+        columns.append(entry)
+
+    index = None
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        index = "index.npy"
+        np.save(os.path.join(directory, index), df.index.to_numpy())
+
+    manifest = {"n_rows": len(df), "columns": columns, "index": index}
+    # Manifest được ghi cuối cùng và thay thế nguyên tử: tiến trình khác chỉ
+    # thấy bộ dữ liệu khi mọi file cột đã ghi xong
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return directory
+
+
+def has_shared_frame(directory):
+    return os.path.exists(os.path.join(directory, MANIFEST_NAME))
+
+
+def _load_mapped(path):
+    # view ndarray trên np.memmap: vẫn dùng chung bộ nhớ, bỏ lớp con memmap
+    return np.load(path, mmap_mode="r").view(np.ndarray)
+
+
+# Gắn vào thư mục đã ghi bởi write_shared_frame, các cột số và mã category
+# được đọc bằng np.load(mmap_mode='r') nên không sao chép dữ liệu.
+# columns: chỉ gắn các cột này (mặc định: mọi cột)
+# strings_as_category: gắn cột chuỗi thành category trên mã memory-map thay vì
+# dựng lại mảng chuỗi trong từng tiến trình (mỗi tiến trình tốn thêm một bản sao)
+def attach_shared_frame(directory, columns=None, strings_as_category=False):
+    with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    entries = manifest["columns"]
+    if columns is not None:
+        by_name = {entry["name"]: entry for entry in entries}
+        entries = [by_name[col] for col in columns]
+
+    if manifest["index"] is not None:
+        index = pd.Index(_load_mapped(os.path.join(directory, manifest["index"])))
+    else:
+        index = pd.RangeIndex(manifest["n_rows"])
+
+    data = {}
+    for entry in entries:
+        values = _load_mapped(os.path.join(directory, entry["file"]))
+        if entry["kind"] == "category" or (entry["kind"] == "string" and strings_as_category):
+            data[entry["name"]] = pd.Categorical.from_codes(
+                values, categories=entry["categories"], ordered=entry.get("ordered", False))
+        elif entry["kind"] == "string":
+            lookup = np.array(entry["categories"] + [np.nan], dtype=object)
+            data[entry["name"]] = pd.Series(lookup[values], index=index, dtype=entry["dtype"])
+        else:
+            data[entry["name"]] = values
+    return pd.DataFrame(data, index=index, copy=False)
@@ -0,0 +1,20 @@
+"""Fixture dùng chung: đường dẫn bộ dữ liệu gốc đi kèm repo"""
+import os
+
+import pytest
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@pytest.fixture(scope="session")
+def raw_csv():
+    return os.path.join(DATA_DIR, "student_depression_dataset.csv")
+
+
+@pytest.fixture
+def empty_csv(raw_csv, tmp_path):
+    """File CSV chỉ có dòng tiêu đề"""
+    path = tmp_path / "empty.csv"
+    with open(raw_csv, encoding="utf-8") as f:
+        path.write_text(f.readline(), encoding="utf-8")
+    return str(path)
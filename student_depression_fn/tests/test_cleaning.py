@@ -0,0 +1,60 @@
+"""
+Làm sạch theo chunk (chunked_cleaner) và pipeline biên dịch
+(cleaning_pipeline) phải cho cùng kết quả với run_full_cleaning.
+"""
+import pandas as pd
+import pandas.testing as tm
+
+from data_cleaning.chunked_cleaner import run_chunked_cleaning
+from data_cleaning.cleaning_pipeline import DEFAULT_CLEANING_STEPS, StepSpec, compile_pipeline
+from data_cleaning.data_cleaner import run_full_cleaning
+from data_loading.data_loader import DataLoader
+
+
+def test_chunked_matches_full(raw_csv):
+    expected = run_full_cleaning(raw_csv)
+    # 1 MB: file được đọc thành nhiều chunk
+    result = run_chunked_cleaning(raw_csv, memory_limit_mb=1)
+    tm.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_chunked_to_file(raw_csv, tmp_path):
+    output_path = str(tmp_path / "cleaned.csv")
+    n_rows = run_chunked_cleaning(raw_csv, memory_limit_mb=1, output_path=output_path)
+    expected = run_full_cleaning(raw_csv)
+    assert n_rows == len(expected)
+    assert len(pd.read_csv(output_path)) == n_rows
+
+
+def test_chunked_empty_input(empty_csv, tmp_path):
+    result = run_chunked_cleaning(empty_csv, memory_limit_mb=1)
+    assert len(result) == 0
+
+    output_path = tmp_path / "cleaned.csv"
+    assert run_chunked_cleaning(empty_csv, memory_limit_mb=1, output_path=str(output_path)) == 0
+    # Vẫn ghi dòng tiêu đề
+    assert list(pd.read_csv(output_path).columns) == list(result.columns)
+
+
+def test_compiled_pipeline_matches_full(raw_csv):
+    expected = run_full_cleaning(raw_csv)
+    df = DataLoader().load_csv(raw_csv)
+    result = compile_pipeline(DEFAULT_CLEANING_STEPS, df.dtypes).run(df, n_jobs=4)
+    tm.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_dtype_selector_sees_earlier_cast(raw_csv):
+    # Bước chọn cột theo dtype phải thấy CGPA đã được astype(str) ở bước trước
+    steps = [
+        StepSpec('to_str', 'column', lambda s: s.astype(str), columns=['CGPA']),
+        StepSpec('upper_text', 'column', lambda s: s.str.upper(),
+                 columns=lambda dtypes: [col for col, dtype in dtypes.items() if str(dtype) == 'str']),
+    ]
+    df = DataLoader().load_csv(raw_csv).head(500)
+    expected = df.copy()
+    expected['CGPA'] = expected['CGPA'].astype(str)
+    for col in [col for col, dtype in expected.dtypes.items() if str(dtype) == 'str']:
+        expected[col] = expected[col].str.upper()
+
+    result = compile_pipeline(steps, df.dtypes).run(df, n_jobs=4)
+    tm.assert_frame_equal(result, expected)
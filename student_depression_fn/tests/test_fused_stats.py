@@ -0,0 +1,81 @@
+"""
+FusedStatsAccumulator (data_visualization/fused_stats.py), cộng dồn theo
+chunk rồi gộp bằng merge, phải khớp các phép tính pandas trên cả bảng.
+"""
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from data_cleaning.chunked_cleaner import iter_cleaned_chunks
+from data_visualization.fused_stats import FusedStatsAccumulator
+
+NUMERIC_ROWS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+@pytest.fixture(scope="module")
+def chunks(raw_csv):
+    return list(iter_cleaned_chunks(raw_csv, memory_limit_mb=1))
+
+
+@pytest.fixture(scope="module")
+def merged(chunks):
+    # Chia các chunk cho hai accumulator rồi gộp, như xử lý theo lô
+    a, b = FusedStatsAccumulator(), FusedStatsAccumulator()
+    for i, chunk in enumerate(chunks):
+        (a if i % 2 else b).update(chunk)
+    return b.merge(a)
+
+
+@pytest.fixture(scope="module")
+def df(chunks):
+    df = pd.concat(chunks)
+    # concat các category khác nhau thành object: đưa lại về category
+    categorical = [col for col in chunks[0].columns if isinstance(chunks[0][col].dtype, pd.CategoricalDtype)]
+    df[categorical] = df[categorical].astype('category')
+    return df
+
+
+def test_describe_matches_pandas(merged, df):
+    # describe của pandas cộng cột float32 bằng float32 nên chỉ so đến 1e-6
+    assert len(merged.numeric_cols) > 1
+    expected = df.describe(include='all')
+    result = merged.describe()
+    tm.assert_frame_equal(result.loc[NUMERIC_ROWS, merged.numeric_cols].astype('float64'),
+                          expected.loc[NUMERIC_ROWS, merged.numeric_cols].astype('float64'),
+                          rtol=1e-6)
+    categorical = [col for col in merged.columns if col not in merged.numeric_cols]
+    for row in ['count', 'unique', 'freq']:
+        assert list(result.loc[row, categorical]) == list(expected.loc[row, categorical]), row
+    tm.assert_series_equal(merged.missing_values(), df.isnull().sum())
+
+
+def test_pairwise_matches_pandas(merged, df):
+    numeric = df[merged.numeric_cols]
+    tm.assert_frame_equal(merged.corr(), numeric.corr(), rtol=1e-9, atol=1e-12)
+    tm.assert_frame_equal(merged.cov(), numeric.cov(), rtol=1e-9, atol=1e-12)
+
+
+def test_crosstab_and_groups_match_pandas(merged, df):
+    tm.assert_frame_equal(merged.crosstab('Depression', 'Academic Pressure'),
+                          pd.crosstab(df['Depression'], df['Academic Pressure']),
+                          check_names=False, check_dtype=False)
+    for key, value in merged.groups:
+        grouped = df.groupby(key, observed=False)[value]
+        tm.assert_series_equal(merged.group_mean(key, value), grouped.mean(), check_index_type=False)
+        tm.assert_series_equal(merged.group_count(key, value), grouped.count(), check_index_type=False)
+
+
+def test_moments_stable_with_large_offset():
+    # Độ lệch nhỏ quanh 1e8: tổng bình phương sẽ mất hết chữ số có nghĩa
+    rng = np.random.default_rng(1)
+    x = pd.DataFrame({'a': rng.normal(0, 1e-3, 20_000) + 1e8, 'b': rng.normal(0, 1, 20_000)})
+    x.loc[::7, 'a'] = np.nan
+    stats = FusedStatsAccumulator(crosstabs=[], groups=[])
+    for start in range(0, len(x), 1000):
+        stats.update(x.iloc[start:start + 1000])
+
+    # Giá trị đúng: tính trên dữ liệu đã trừ 1e8
+    centered = x.assign(a=x['a'] - 1e8)
+    assert stats.describe().loc['std', 'a'] == pytest.approx(centered['a'].std(), rel=1e-9)
+    assert stats.corr().loc['a', 'b'] == pytest.approx(centered.corr().loc['a', 'b'], rel=1e-9)
@@ -0,0 +1,26 @@
+"""
+Kiểm tra các thư viện nặng không bị nạp sớm (benchmarks/import_budget.py):
+mỗi module được import trong một tiến trình mới rồi kiểm tra sys.modules.
+
+Ngân sách thời gian import phụ thuộc tải của máy nên là benchmark, không
+chạy mặc định:
+    python -m pytest -m benchmark tests/test_import_budget.py
+"""
+import pytest
+
+from benchmarks.import_budget import IMPORT_BUDGETS, check_budgets, heavy_imports
+
+# Nới ngân sách thời gian khi chạy trên máy dùng chung
+BENCHMARK_MARGIN = 3.0
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS))
+def test_no_heavy_imports(module):
+    _, forbidden = IMPORT_BUDGETS[module]
+    assert heavy_imports(module, forbidden) == []
+
+
+@pytest.mark.benchmark
+def test_import_time_budgets():
+    failures = check_budgets(IMPORT_BUDGETS, margin=BENCHMARK_MARGIN)
+    assert not failures, f"❌ Vượt ngân sách import: {', '.join(failures)}"
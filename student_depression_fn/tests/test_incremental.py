@@ -0,0 +1,77 @@
+"""
+Pipeline tăng dần (pipeline/incremental.py): chạy lại không nối thêm dòng,
+dừng giữa lúc lưu trạng thái thì lần chạy sau cho cùng kết quả, và lần chạy
+đầu không ghi đè file đầu ra có sẵn nếu không được yêu cầu.
+"""
+import pandas.testing as tm
+import pytest
+
+from pipeline.incremental import IncrementalState, run_incremental
+
+
+@pytest.fixture
+def half_csv(raw_csv, tmp_path):
+    """Nửa đầu bộ dữ liệu gốc, giả lập file export trước khi có dòng mới"""
+    with open(raw_csv, encoding="utf-8") as f:
+        lines = f.readlines()
+    path = tmp_path / "half.csv"
+    path.write_text("".join(lines[:len(lines) // 2]), encoding="utf-8")
+    return str(path)
+
+
+def _run(file_path, tmp_path, name, **kwargs):
+    output_path = str(tmp_path / f"{name}.csv")
+    state = run_incremental(file_path, output_path, state_dir=str(tmp_path / f"{name}_state"),
+                            memory_limit_mb=1, **kwargs)
+    return output_path, state
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_rerun_adds_nothing(raw_csv, half_csv, tmp_path):
+    _run(half_csv, tmp_path, "out")
+    output_path, state = _run(raw_csv, tmp_path, "out")
+    content = _read_bytes(output_path)
+    n_ids = len(state.processed_ids)
+
+    output_path, state = _run(raw_csv, tmp_path, "out")
+    assert _read_bytes(output_path) == content
+    assert len(state.processed_ids) == n_ids
+
+
+def test_crash_before_state_save_is_recovered(raw_csv, half_csv, tmp_path, monkeypatch):
+    _run(half_csv, tmp_path, "expected")
+    expected_path, expected_state = _run(raw_csv, tmp_path, "expected")
+
+    _run(half_csv, tmp_path, "out")
+
+    # Dừng sau khi đã nối các dòng mới nhưng trước khi chốt trạng thái
+    def crash(self, output_bytes=None):
+        raise OSError("dừng giữa chừng")
+
+    with monkeypatch.context() as m:
+        m.setattr(IncrementalState, "save", crash)
+        with pytest.raises(OSError):
+            _run(raw_csv, tmp_path, "out")
+
+    output_path, state = _run(raw_csv, tmp_path, "out")
+    assert _read_bytes(output_path) == _read_bytes(expected_path)
+    assert (state.processed_ids == expected_state.processed_ids).all()
+    tm.assert_frame_equal(state.crosstab_depression_academic_pressure(),
+                          expected_state.crosstab_depression_academic_pressure())
+
+
+def test_first_run_refuses_existing_output(raw_csv, tmp_path):
+    output_path = tmp_path / "out.csv"
+    output_path.write_text("du lieu cua pipeline day du\n", encoding="utf-8")
+
+    with pytest.raises(FileExistsError):
+        _run(raw_csv, tmp_path, "out")
+    assert output_path.read_text(encoding="utf-8") == "du lieu cua pipeline day du\n"
+
+    expected_path, _ = _run(raw_csv, tmp_path, "expected")
+    _run(raw_csv, tmp_path, "out", overwrite=True)
+    assert _read_bytes(str(output_path)) == _read_bytes(expected_path)
@@ -0,0 +1,59 @@
+"""
+Chuẩn hóa theo kế hoạch (normalization_plan) phải giống normalize_dataset;
+FittedNormalizer fit theo batch phải cho cùng thống kê với fit một lần và
+lưu/đọc lại không làm đổi kết quả.
+"""
+import json
+
+import pandas.testing as tm
+import pytest
+
+from data_cleaning.chunked_cleaner import iter_cleaned_chunks
+from data_cleaning.data_cleaner import run_full_cleaning
+from data_normalization.data_normalizer import normalize_dataset
+from data_normalization.fitted_normalizer import FittedNormalizer
+from data_normalization.normalization_plan import normalize_dataset_planned
+
+
+@pytest.fixture(scope="module")
+def cleaned(raw_csv):
+    return run_full_cleaning(raw_csv)
+
+
+def test_planned_matches_normalize_dataset(cleaned):
+    expected = normalize_dataset(cleaned.copy())
+    result = normalize_dataset_planned(cleaned.copy())
+    tm.assert_frame_equal(result, expected)
+
+
+def test_fit_batches_matches_fit(raw_csv, cleaned):
+    fitted = FittedNormalizer().fit(cleaned)
+    batched = FittedNormalizer().fit_batches(iter_cleaned_chunks(raw_csv, memory_limit_mb=1))
+
+    assert batched.stats['n_rows'] == fitted.stats['n_rows']
+    assert batched.stats['columns'].keys() == fitted.stats['columns'].keys()
+    for col, col_stats in fitted.stats['columns'].items():
+        for name, value in col_stats.items():
+            # fit tính trên float32 nên chỉ so đến sai số tương đối 1e-6
+            assert batched.stats['columns'][col][name] == pytest.approx(value, rel=1e-6, nan_ok=True), \
+                (col, name)
+    assert batched.stats['sleep_hours_mean'] == pytest.approx(
+        fitted.stats['sleep_hours_mean'], rel=1e-6, nan_ok=True)
+
+
+def test_save_load_round_trip(cleaned, tmp_path):
+    normalizer = FittedNormalizer().fit(cleaned)
+    path = str(tmp_path / "normalizer_stats.json")
+    normalizer.save(path)
+    loaded = FittedNormalizer.load(path)
+
+    # So qua JSON để NaN (ví dụ sleep_hours_mean) được coi là bằng nhau
+    assert json.dumps(loaded.stats, sort_keys=True) == json.dumps(normalizer.stats, sort_keys=True)
+    tm.assert_frame_equal(loaded.transform(cleaned), normalizer.transform(cleaned))
+
+
+def test_transform_rejects_unfitted_columns(cleaned):
+    normalizer = FittedNormalizer().fit(cleaned.drop(columns=['CGPA']))
+    with pytest.raises(ValueError):
+        normalizer.transform(cleaned)
+
@@ -0,0 +1,46 @@
+"""Ghi file nguyên tử (atomic_output) và đọc/ghi CSV nén gzip (save_data/load_data)."""
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from storage.save_data import atomic_output, load_data, save_data
+
+
+def test_atomic_output_keeps_old_file_on_failure(tmp_path):
+    output_path = tmp_path / "data.csv"
+    output_path.write_text("cu\n", encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with atomic_output(str(output_path)) as tmp:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("moi, ghi dở")
+            raise RuntimeError("lỗi giữa chừng")
+
+    assert output_path.read_text(encoding="utf-8") == "cu\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.csv"]
+
+
+def test_atomic_output_replaces_on_success(tmp_path):
+    output_path = tmp_path / "data.csv"
+    output_path.write_text("cu\n", encoding="utf-8")
+
+    with atomic_output(str(output_path)) as tmp:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("moi\n")
+
+    assert output_path.read_text(encoding="utf-8") == "moi\n"
+
+
+def test_gzip_csv_round_trip(tmp_path):
+    df = pd.DataFrame({
+        'id': range(5000),
+        'Gender': ['Nữ', 'Nam'] * 2500,
+        'CGPA': [i / 7 for i in range(5000)],
+    })
+    output_path = str(tmp_path / "data.csv.gz")
+    save_data(df, output_path)
+
+    with open(output_path, "rb") as f:
+        assert f.read(2) == b"\x1f\x8b"
+    tm.assert_frame_equal(load_data(output_path), df)
+    tm.assert_frame_equal(load_data(output_path, columns=['id', 'CGPA']), df[['id', 'CGPA']])